@@ -58,12 +58,15 @@ if not is_data_installed():
     )
 
 from .flagmap import Map
-from .territory import Territory
+from .paxmax import set_paxmax_threads
+from .territory import Territory, set_territory_threads
 from .loaders import gadm, naturalearth, overpass, polygon
 from .icon import Icon, ShapeType
 from . import debug_utils
 from .geometry_cache import clear_geometry_cache, get_geometry_cache_stats
+from .loaders import get_file_cache_stats
 from .hub import xatrahub, XATRAHUB_URL
+from .batch import render_many
 from .settings import CACHING_ENABLED
 
 # Import timing debugging functions
@@ -181,10 +184,12 @@ def clear_cache(memory_only: bool = False, disk_only: bool = False):
 
 
 def cache_stats():
-    """Get statistics for the global geometry cache.
+    """Get statistics for the global geometry cache and the data file cache.
     
     Returns:
-        Dictionary with cache statistics including hit rates and sizes
+        Dictionary with cache statistics including hit rates and sizes. The
+        "file_cache" entry holds the parsed data file cache statistics
+        (estimated bytes, budget, hits, misses and evictions).
         
     Example:
         >>> import xatra
@@ -192,8 +197,11 @@ def cache_stats():
         >>> print(f"Hit rate: {stats['hit_rate']:.2%}")
         >>> print(f"Memory cache size: {stats['memory_cache_size']} items")
         >>> print(f"Disk cache size: {stats['disk_cache_size']} files")
+        >>> print(f"File cache evictions: {stats['file_cache']['evictions']}")
     """
-    return get_geometry_cache_stats()
+    stats = get_geometry_cache_stats()
+    stats["file_cache"] = get_file_cache_stats()
+    return stats
 
 __version__ = "0.1.0"
 __all__ = [
@@ -236,6 +244,7 @@ __all__ = [
     "XATRAHUB_URL",
     "to_html_string",
     "show",
+    "render_many",
     # Debug utilities
     "DEBUG_TIME",
     "CACHING_ENABLED",
@@ -243,4 +252,6 @@ __all__ = [
     # Cache management
     "clear_cache",
     "cache_stats",
+    "set_territory_threads",
+    "set_paxmax_threads",
 ]
@@ -0,0 +1,169 @@
+"""
+Xatra Batch Rendering Module
+
+Renders many maps in one job using a pool of forked worker processes. Workers
+inherit the parent's warm geometry cache, parsed data files and memory-mapped
+GADM stores copy-on-write, so shared territories are loaded once per job
+rather than once per map.
+"""
+
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+from collections import defaultdict
+import runpy
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .debug_utils import time_debug
+from .flagmap import Map
+from .loaders import simplification_tolerance
+from .territory import Territory
+
+try:
+    import resource
+except ImportError:  # not available on Windows: peak RSS is not reported
+    resource = None
+
+MapOrScript = Union[Map, str, "os.PathLike[str]"]
+
+# Jobs for the current render_many() call; forked workers inherit them, so
+# Map objects (whose territories hold closures) never need to be pickled.
+_jobs: List[Tuple[str, MapOrScript]] = []
+_out_dir: str = "."
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unavailable)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _render_job(index: int, own_process: bool = False) -> Dict[str, Any]:
+    """Render one job and report its outputs, timing and peak RSS.
+
+    Peak RSS is only reported when the job ran in a process of its own; in
+    this process it would be the high-water mark of everything run so far.
+    """
+    name, job = _jobs[index]
+    result: Dict[str, Any] = {"index": index, "name": name, "html": None, "json": None, "error": None}
+    start = time.perf_counter()
+    try:
+        if isinstance(job, Map):
+            result["json"] = os.path.join(_out_dir, f"{name}.json")
+            result["html"] = os.path.join(_out_dir, f"{name}.html")
+            job.show(out_json=result["json"], out_html=result["html"])
+        else:
+            # Scripts build on a fresh pyplot current map and write their own
+            # outputs; the caller's current map is put back afterwards.
+            from . import pyplot
+            previous_map = pyplot._current_map
+            pyplot.new_map()
+            try:
+                result["script"] = os.fspath(job)
+                runpy.run_path(os.fspath(job), run_name="__main__")
+            finally:
+                pyplot.set_current_map(previous_map)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss_mb"] = _peak_rss_mb() if own_process else None
+    result["pid"] = os.getpid()
+    return result
+
+
+def _job_name(index: int, job: MapOrScript) -> str:
+    if isinstance(job, Map):
+        return f"map_{index:03d}"
+    return os.path.splitext(os.path.basename(os.fspath(job)))[0]
+
+
+def _warm(jobs: List[Tuple[str, MapOrScript]]) -> None:
+    """Load every GADM leaf used by the Map jobs once, in the parent.
+
+    Each map's leaves are loaded under that map's simplification tolerance,
+    which is the one its render uses.
+    """
+    by_tolerance: Dict[Optional[float], List[Territory]] = defaultdict(list)
+    for _, job in jobs:
+        if isinstance(job, Map):
+            by_tolerance[job._simplify_tolerance].extend(flag.territory for flag in job._flags)
+    for tolerance, territories in by_tolerance.items():
+        with simplification_tolerance(tolerance):
+            Territory.materialize_many(territories)
+
+
+@time_debug("Render many maps")
+def render_many(
+    maps_or_scripts: Union[Sequence[MapOrScript], Mapping[str, MapOrScript]],
+    workers: Optional[int] = None,
+    out_dir: str = ".",
+    warm: bool = True,
+) -> List[Dict[str, Any]]:
+    """Render many maps in parallel worker processes.
+
+    Map objects are written to ``<out_dir>/<name>.json`` and ``<name>.html``
+    as soon as each finishes. Scripts are executed as ``__main__`` with a
+    fresh pyplot current map and write wherever their own show() call says.
+    Workers are forked from this process (one per job) so they share its warm
+    geometry cache and memory-mapped data. On platforms without fork, or when
+    this process already runs other threads (e.g. Territory evaluation or
+    async workers), which a forked child could deadlock on, the jobs run
+    serially in this process.
+
+    Args:
+        maps_or_scripts: Map objects and/or paths to map scripts, or a mapping
+            from output name to either. Unnamed maps are named ``map_000``,
+            ``map_001``, ...; unnamed scripts after their file name.
+        workers: Number of worker processes (defaults to the CPU count)
+        out_dir: Directory for Map outputs (created if missing)
+        warm: Load the Map jobs' GADM territories in this process before
+            forking so workers do not each load them
+
+    Returns:
+        One report dict per job, in input order, with keys "name", "html",
+        "json" (Map jobs), "script" (script jobs), "seconds", "peak_rss_mb"
+        (None when the job ran in this process or the platform cannot report
+        it), "pid" and "error" (a traceback string, or None on success).
+
+    Example:
+        >>> reports = xatra.render_many({"maurya": m1, "gupta": m2}, workers=4, out_dir="out")
+        >>> for r in reports:
+        ...     print(r["name"], f"{r['seconds']:.1f}s", f"{r['peak_rss_mb']:.0f}MB")
+    """
+    global _jobs, _out_dir
+    if isinstance(maps_or_scripts, Mapping):
+        jobs = [(str(name), job) for name, job in maps_or_scripts.items()]
+    else:
+        jobs = [(_job_name(i, job), job) for i, job in enumerate(maps_or_scripts)]
+    os.makedirs(out_dir, exist_ok=True)
+    if warm:
+        _warm(jobs)
+
+    _jobs, _out_dir = jobs, out_dir
+    try:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        # Forking while other threads run can leave their locks held in the child.
+        if (
+            workers <= 1
+            or "fork" not in multiprocessing.get_all_start_methods()
+            or threading.active_count() > 1
+        ):
+            reports = [_render_job(i) for i in range(len(jobs))]
+        else:
+            ctx = multiprocessing.get_context("fork")
+            # One process per job keeps peak RSS figures per map.
+            with ctx.Pool(processes=workers, maxtasksperchild=1) as pool:
+                render = functools.partial(_render_job, own_process=True)
+                reports = list(pool.imap_unordered(render, range(len(jobs))))
+    finally:
+        _jobs, _out_dir = [], "."
+    return sorted(reports, key=lambda r: r["index"])
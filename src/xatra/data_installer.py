@@ -184,6 +184,7 @@ Examples:
   xatra-install-data --check      # Check if data is installed
   xatra-install-data --force      # Force re-download
   xatra-install-data --info       # Show data location info
+  xatra-install-data --build-store  # Also build memory-mapped GADM stores
         """
     )
     parser.add_argument(
@@ -206,6 +207,11 @@ Examples:
         action="store_true",
         help="Show data location and status information",
     )
+    parser.add_argument(
+        "--build-store",
+        action="store_true",
+        help="Build memory-mapped columnar GADM stores after installing (see xatra-build-store)",
+    )
     
     args = parser.parse_args()
     
@@ -225,6 +231,10 @@ Examples:
     
     try:
         install_data(force=args.force, skip_verify=args.skip_verify)
+        if args.build_store:
+            from .gadm_store import build_stores
+            data_dir = get_data_dir()
+            build_stores([data_dir / "gadm", data_dir / "gadm_simplified"], force=args.force)
     except KeyboardInterrupt:
         print("\n\nInstallation cancelled by user.")
         sys.exit(1)
@@ -19,7 +19,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .territory import Territory
 from .render import export_html, export_html_string
-from .paxmax import paxmax_aggregate
+from .paxmax import delta_encode_snapshots, geometry_id, paxmax_aggregate
 from .colorseq import ColorSequence, LinearColorSequence
 from .debug_utils import time_debug
 
@@ -1184,6 +1184,7 @@ class Map:
 
     def _collect_coordinates_from_flags(self, all_lats: List[float], all_lngs: List[float]) -> None:
         """Collect coordinates from flag territories."""
+        Territory.materialize_many(flag.territory for flag in self._flags)
         for flag in self._flags:
             if flag.territory:
                 # Get the Shapely geometry from the territory
@@ -1305,9 +1306,9 @@ class Map:
 
         # 1. Primary elements: Flags, Admins, Data
         if pax.get("mode") == "dynamic":
-            for snapshot in pax.get("snapshots", []):
-                for flag in snapshot.get("flags", []):
-                    extract_from_id(flag.get("geom_id"), primary_lats, primary_lngs)
+            # Every flag shown at some breakpoint is one of the distinct states.
+            for flag in pax.get("flag_states", []):
+                extract_from_id(flag.get("geom_id"), primary_lats, primary_lngs)
         else:
             for flag in pax.get("flags", []):
                 # Static pax payloads store inline geometry ("geometry") rather than geom_id.
@@ -1586,54 +1587,6 @@ class Map:
             "sample_values": sample_values_for_frontend if self._data_colormap.norm is not None else None
         }
 
-    def _feature_matches_gid(self, feature: Dict[str, Any], gid: str) -> bool:
-        """Check if a GADM feature matches a given GID.
-        
-        Args:
-            feature: GeoJSON feature with GADM properties
-            gid: GID string to match (e.g., "IND.31", "Z01.14")
-            
-        Returns:
-            True if feature matches the GID
-        """
-        props = feature.get("properties", {}) or {}
-        
-        # Handle disputed territories (Z prefix)
-        if gid.startswith("Z"):
-            # For disputed territories, use the same prefix matching logic as load_gadm_like
-            parts = gid.split('.')
-            level = 0 if len(parts) == 1 else len(parts) - 1
-            
-            if level == 0:
-                # Country level - check GID_0
-                feature_gid = props.get("GID_0", "")
-                return str(feature_gid) == gid
-            else:
-                # Subdivision level - check appropriate GID field
-                gid_key = f"GID_{level}"
-                feature_gid = props.get(gid_key, "")
-                
-                # Use exact prefix matching with boundary check (same as load_gadm_like)
-                return (str(feature_gid).startswith(gid) and 
-                       (len(str(feature_gid)) == len(gid) or str(feature_gid)[len(gid)] in ['.', '_']))
-        
-        # Handle regular GADM codes
-        parts = gid.split('.')
-        level = len(parts) - 1
-        
-        if level == 0:
-            # Country level - check GID_0
-            return props.get("GID_0") == gid
-        else:
-            # Subdivision level - check appropriate GID field
-            gid_key = f"GID_{level}"
-            feature_gid = props.get(gid_key, "")
-            
-            # Use exact prefix matching with boundary check
-            return (str(feature_gid).startswith(gid) and 
-                   (len(str(feature_gid)) == len(gid) or str(feature_gid)[len(gid)] in ['.', '_']))
-
-
     @time_debug("Export to JSON")
     def _export_json(self) -> Dict[str, Any]:
         """Export map data to JSON format for rendering.
@@ -1646,7 +1599,10 @@ class Map:
         """
         from .loaders import set_active_simplification_tolerance
         set_active_simplification_tolerance(self._simplify_tolerance)
+        return self._export_payload()
 
+    def _export_payload(self) -> Dict[str, Any]:
+        """Body of _export_json() under the already active simplification tolerance."""
         # Prepare flags for paxmax aggregation (keep territories for efficient union)
         flags_serialized: List[Dict[str, Any]] = []
         for fl in self._flags:
@@ -1735,10 +1691,11 @@ class Map:
         # Override mode if any non-flag objects have periods
         if has_periods and pax.get("mode") == "static":
             # Convert static flags to dynamic format
+            snapshots = [{"year": earliest_start, "flags": pax.get("flags", [])}] if earliest_start is not None else []
             pax = {
                 "mode": "dynamic",
                 "breakpoints": [earliest_start] if earliest_start is not None else [],
-                "snapshots": [{"year": earliest_start, "flags": pax.get("flags", [])}] if earliest_start is not None else [],
+                **delta_encode_snapshots(snapshots),
                 "geometry_library": pax.get("geometry_library", {})
             }
 
@@ -1767,17 +1724,10 @@ class Map:
                 obj_id_to_geom_id[obj_id] = gid
                 return gid
 
-            # Slow path (only once per unique dict object): generate hash
-            import hashlib
-            try:
-                import orjson
-                # orjson is MUCH faster than standard json for hashing
-                geom_str = orjson.dumps(geom_dict, option=orjson.OPT_SORT_KEYS)
-            except ImportError:
-                import json
-                geom_str = json.dumps(geom_dict, sort_keys=True).encode('utf-8')
-                
-            geom_id = hashlib.md5(geom_str).hexdigest()
+            # Slow path (only once per unique dict object): hash the content
+            # the same way paxmax names its geometries, so shapes shared with
+            # flags are stored once.
+            geom_id = geometry_id(geom_dict)
             
             if geom_id not in geometry_registry:
                 geometry_registry[geom_id] = geom_dict
@@ -1875,11 +1825,11 @@ class Map:
             if a.period is None or restricted_period is not None:
                 try:
                     from .loaders import (
-                        _read_json,
                         _compute_find_in_gadm_default,
+                        _gadm_source_exists,
                         _get_gadm_file_path,
+                        _load_gadm_features,
                     )
-                    import os
                     
                     # Load the appropriate level file directly
                     parts = a.gadm_key.split('.')
@@ -1891,9 +1841,9 @@ class Map:
                     )
                     
                     # Try to load the level file, with fallback to find_in_gadm (explicit or computed) if needed
-                    level_file = None
-                    if os.path.exists(level_file_path):
-                        level_file = _read_json(level_file_path)
+                    loaded_path = None
+                    if _gadm_source_exists(level_file_path):
+                        loaded_path = level_file_path
                     else:
                         # Determine candidate countries: explicit list or computed from disputed mapping
                         candidate_countries = a.find_in_gadm or _compute_find_in_gadm_default(a.gadm_key)
@@ -1904,33 +1854,24 @@ class Map:
                                     a.level,
                                     simplify_tolerance=self._simplify_tolerance,
                                 )
-                                if os.path.exists(search_path):
-                                    level_file = _read_json(search_path)
+                                if _gadm_source_exists(search_path):
+                                    loaded_path = search_path
                                     break
                     
-                    if not level_file:
+                    if loaded_path is None:
                         print(f"Warning: GADM file not found for level {a.level}: {level_file_path}")
                         if a.find_in_gadm:
                             print(f"Also tried find_in_gadm countries: {a.find_in_gadm}")
                         continue
                     
-                    # Filter features that match the gadm_key prefix
-                    filtered_features = []
-                    for feature in level_file.get("features", []):
-                        props = feature.get("properties", {}) or {}
-                        gid_key = f"GID_{a.level}"
-                        gid = str(props.get(gid_key, ""))
-                        
-                        # For level 0, include all features from the country file (including disputed territories)
-                        # For higher levels, include all features from the country file if gadm_key is just the country code
-                        # Otherwise use exact prefix matching with boundary check
-                        if a.level == 0 or (a.level > 0 and len(a.gadm_key.split('.')) == 1):
-                            # Include all features from the country file (including disputed territories)
-                            filtered_features.append(feature)
-                        else:
-                            # Use exact prefix matching with boundary check for specific regions
-                            if gid.startswith(a.gadm_key) and (len(gid) == len(a.gadm_key) or gid[len(a.gadm_key)] in ['.', '_']):
-                                filtered_features.append(feature)
+                    # Filter features that match the gadm_key prefix.
+                    # For level 0, or when gadm_key is just the country code, include all features
+                    # from the country file (including disputed territories). Otherwise use the
+                    # per-file GID index for exact prefix matching with boundary check.
+                    if a.level == 0 or len(a.gadm_key.split('.')) == 1:
+                        filtered_features = list(_load_gadm_features(loaded_path, a.level))
+                    else:
+                        filtered_features = _load_gadm_features(loaded_path, a.level, a.gadm_key)
                     
                     # Assign colors based on color_by_level (clamped to level)
                     effective_color_by_level = min(a.color_by_level, a.level)
@@ -2118,15 +2059,16 @@ class Map:
                                         feature_copy["properties"]["_dataframe_note"] = dataframe_notes[gid]
                                     matching_features.append(feature_copy)
                                 else:
+                                    # load_gadm_like already selected exactly the features matching
+                                    # gadm_key via the GID index, and every gid in this group is gadm_key.
                                     for gid in gids:
-                                        if self._feature_matches_gid(feature, gid):
-                                            feature_copy = feature.copy()
-                                            feature_copy["properties"] = props.copy()
-                                            feature_copy["properties"]["_dataframe_value"] = dataframe_data[gid]
-                                            feature_copy["properties"]["_dataframe_gid"] = gid
-                                            if gid in dataframe_notes:
-                                                feature_copy["properties"]["_dataframe_note"] = dataframe_notes[gid]
-                                            matching_features.append(feature_copy)
+                                        feature_copy = feature.copy()
+                                        feature_copy["properties"] = props.copy()
+                                        feature_copy["properties"]["_dataframe_value"] = dataframe_data[gid]
+                                        feature_copy["properties"]["_dataframe_gid"] = gid
+                                        if gid in dataframe_notes:
+                                            feature_copy["properties"]["_dataframe_note"] = dataframe_notes[gid]
+                                        matching_features.append(feature_copy)
                             
                             if matching_features:
                                 df_geojson = {"type": "FeatureCollection", "features": matching_features}
@@ -2221,15 +2163,16 @@ class Map:
                                         feature_copy["properties"]["_dataframe_notes"] = dataframe_notes[gid]
                                     matching_features.append(feature_copy)
                                 else:
+                                    # load_gadm_like already selected exactly the features matching
+                                    # gadm_key via the GID index, and every gid in this group is gadm_key.
                                     for gid in gids:
-                                        if self._feature_matches_gid(feature, gid):
-                                            feature_copy = feature.copy()
-                                            feature_copy["properties"] = props.copy()
-                                            feature_copy["properties"]["_dataframe_data"] = dataframe_data[gid]
-                                            feature_copy["properties"]["_dataframe_gid"] = gid
-                                            if gid in dataframe_notes:
-                                                feature_copy["properties"]["_dataframe_notes"] = dataframe_notes[gid]
-                                            matching_features.append(feature_copy)
+                                        feature_copy = feature.copy()
+                                        feature_copy["properties"] = props.copy()
+                                        feature_copy["properties"]["_dataframe_data"] = dataframe_data[gid]
+                                        feature_copy["properties"]["_dataframe_gid"] = gid
+                                        if gid in dataframe_notes:
+                                            feature_copy["properties"]["_dataframe_notes"] = dataframe_notes[gid]
+                                        matching_features.append(feature_copy)
                             
                             if matching_features:
                                 df_geojson = {"type": "FeatureCollection", "features": matching_features}
@@ -2430,6 +2373,33 @@ class Map:
             "geometry_registry": geometry_registry
         }
 
+    async def aexport_json(self) -> Dict[str, Any]:
+        """Awaitable export of the map data (the payload show() writes).
+
+        Territory evaluation, file loading and aggregation run on a background
+        thread, so the event loop is never blocked. The map's simplification
+        tolerance applies to that thread only; the process-wide tolerance is
+        left untouched. Territories shared with other maps being exported
+        concurrently are evaluated once. Exports are not coalesced, since the
+        map may change between calls.
+
+        Returns:
+            Dictionary containing all map data including flags, rivers, paths, etc.
+
+        Example:
+            >>> payload = await map.aexport_json()
+        """
+        import asyncio
+
+        from .geometry_cache import _async_executor
+        from .loaders import simplification_tolerance
+
+        def export() -> Dict[str, Any]:
+            with simplification_tolerance(self._simplify_tolerance):
+                return self._export_payload()
+
+        return await asyncio.get_running_loop().run_in_executor(_async_executor, export)
+
     def to_html_string(self) -> str:
         """Export the map to an HTML string for embedding.
 
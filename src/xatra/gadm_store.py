@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Columnar, memory-mapped stores for GADM files.
+
+A store is a directory written next to a GADM GeoJSON file:
+  ~/.xatra/data/gadm/gadm41_<ISO>_<level>.json.store/
+
+It holds every feature geometry as contiguous float64 coordinates plus ring,
+part and geometry offset tables (the layout of ``shapely.to_ragged_array``),
+the feature properties in a separate table, and the sorted GID index for every
+``GID_<level>`` column. Arrays are memory-mapped, so loaders only touch the
+pages of the features they actually materialize instead of parsing the whole
+multi-hundred-MB GeoJSON file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import MultiPolygon, Polygon, mapping, shape
+
+STORE_SUFFIX = ".store"
+STORE_FORMAT = "xatra-gadm-store"
+STORE_VERSION = 1
+
+# Per-feature source geometry type codes.
+_TYPE_NULL = 0
+_TYPE_POLYGON = 1
+_TYPE_MULTIPOLYGON = 2
+
+_ARRAYS = ("coords", "ring_offsets", "part_offsets", "geom_offsets", "geom_types")
+
+
+def get_store_path(json_path: str) -> str:
+    """Return the store directory path for a GADM GeoJSON file."""
+    return json_path + STORE_SUFFIX
+
+
+def _dumps(obj: Any) -> bytes:
+    try:
+        import orjson
+        return orjson.dumps(obj)
+    except ImportError:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    try:
+        import orjson
+        return orjson.loads(data)
+    except ImportError:
+        return json.loads(data.decode("utf-8"))
+
+
+def _source_signature(json_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(json_path)
+    except OSError:
+        return None
+    return (st.st_size, st.st_mtime_ns)
+
+
+class GadmStore:
+    """Read-only view of one GADM store directory."""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, "meta.json"), "rb") as f:
+            self.meta: Dict[str, Any] = _loads(f.read())
+        if self.meta.get("format") != STORE_FORMAT or self.meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported GADM store format in {store_dir}")
+
+        arrays = {
+            name: np.load(os.path.join(store_dir, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAYS
+        }
+        self.coords = arrays["coords"]
+        self.ring_offsets = arrays["ring_offsets"]
+        self.part_offsets = arrays["part_offsets"]
+        self.geom_offsets = arrays["geom_offsets"]
+        self.geom_types = arrays["geom_types"]
+
+        with open(os.path.join(store_dir, "properties.json"), "rb") as f:
+            self.properties: List[Dict[str, Any]] = _loads(f.read())
+        with open(os.path.join(store_dir, "gid_index.json"), "rb") as f:
+            self._gid_index: Dict[str, Dict[str, List[Any]]] = _loads(f.read())
+
+    def __len__(self) -> int:
+        return len(self.properties)
+
+    def is_fresh(self, json_path: str) -> bool:
+        """Whether the store still matches its source GeoJSON file.
+
+        A store without its source file (e.g. the JSON was deleted to save disk)
+        is considered authoritative.
+        """
+        signature = _source_signature(json_path)
+        if signature is None:
+            return True
+        return signature == (self.meta.get("source_size"), self.meta.get("source_mtime_ns"))
+
+    def gid_index(self, gid_key: str) -> Optional[Tuple[List[str], List[int]]]:
+        """Return the stored (sorted keys, positions) index for a GID column."""
+        entry = self._gid_index.get(gid_key)
+        if entry is None:
+            return None
+        return entry["keys"], entry["positions"]
+
+    def geometries(self, positions: Sequence[int]) -> np.ndarray:
+        """Materialize Shapely geometries for the given feature positions.
+
+        Only the coordinate pages of the requested features are read. Null
+        geometries come back as None.
+        """
+        positions = [int(i) for i in positions]
+        out = np.empty(len(positions), dtype=object)
+        if not positions:
+            return out
+
+        g, p, r = self.geom_offsets, self.part_offsets, self.ring_offsets
+        coord_chunks = []
+        ring_chunks = [np.zeros(1, dtype=np.int64)]
+        part_chunks = [np.zeros(1, dtype=np.int64)]
+        geom_counts = np.empty(len(positions), dtype=np.int64)
+        coord_base = ring_base = 0
+        for n, i in enumerate(positions):
+            p0, p1 = int(g[i]), int(g[i + 1])
+            r0, r1 = int(p[p0]), int(p[p1])
+            c0, c1 = int(r[r0]), int(r[r1])
+            coord_chunks.append(self.coords[c0:c1])
+            ring_chunks.append(np.asarray(r[r0 + 1:r1 + 1], dtype=np.int64) - c0 + coord_base)
+            part_chunks.append(np.asarray(p[p0 + 1:p1 + 1], dtype=np.int64) - r0 + ring_base)
+            geom_counts[n] = p1 - p0
+            coord_base += c1 - c0
+            ring_base += r1 - r0
+
+        geom_offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(geom_counts, out=geom_offsets[1:])
+        coords = np.concatenate(coord_chunks) if coord_chunks else np.empty((0, 2))
+        geoms = shapely.from_ragged_array(
+            shapely.GeometryType.MULTIPOLYGON,
+            np.ascontiguousarray(coords, dtype=np.float64),
+            (np.concatenate(ring_chunks), np.concatenate(part_chunks), geom_offsets),
+        )
+
+        types = np.asarray(self.geom_types[positions])
+        out[:] = geoms
+        polygon_mask = types == _TYPE_POLYGON
+        if polygon_mask.any():
+            out[polygon_mask] = shapely.get_geometry(geoms[polygon_mask], 0)
+        out[types == _TYPE_NULL] = None
+        return out
+
+    def features(self, positions: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """Materialize GeoJSON features for the given positions (all if None)."""
+        if positions is None:
+            positions = range(len(self))
+        positions = list(positions)
+        geoms = self.geometries(positions)
+        return [
+            {
+                "type": "Feature",
+                "properties": dict(self.properties[i]),
+                "geometry": mapping(geom) if geom is not None else None,
+            }
+            for i, geom in zip(positions, geoms)
+        ]
+
+
+def open_store(json_path: str) -> Optional[GadmStore]:
+    """Open the store for a GADM file if one exists and is fresh, else None."""
+    store_dir = get_store_path(json_path)
+    if not os.path.isdir(store_dir):
+        return None
+    try:
+        store = GadmStore(store_dir)
+    except (OSError, ValueError, KeyError):
+        return None
+    return store if store.is_fresh(json_path) else None
+
+
+def build_store(json_path: str, force: bool = False) -> Optional[str]:
+    """Build the columnar store for one GADM GeoJSON file.
+
+    Args:
+        json_path: Path to a gadm41_<ISO>_<level>.json FeatureCollection
+        force: Rebuild even if a fresh store already exists
+
+    Returns:
+        Store directory path, or None if an up-to-date store already existed
+    """
+    if not force and open_store(json_path) is not None:
+        return None
+
+    with open(json_path, "rb") as f:
+        fc = _loads(f.read())
+    if fc.get("type") != "FeatureCollection":
+        raise ValueError(f"Expected FeatureCollection in {json_path}")
+    features = fc.get("features", [])
+
+    geoms = []
+    geom_types = np.empty(len(features), dtype=np.uint8)
+    properties: List[Dict[str, Any]] = []
+    for n, feat in enumerate(features):
+        properties.append(feat.get("properties", {}) or {})
+        geometry = feat.get("geometry")
+        geom = shape(geometry) if geometry else None
+        if geom is None or geom.is_empty:
+            geom_types[n] = _TYPE_NULL if geom is None else _TYPE_MULTIPOLYGON
+            geoms.append(MultiPolygon())
+        elif isinstance(geom, Polygon):
+            geom_types[n] = _TYPE_POLYGON
+            geoms.append(MultiPolygon([geom]))
+        elif isinstance(geom, MultiPolygon):
+            geom_types[n] = _TYPE_MULTIPOLYGON
+            geoms.append(geom)
+        else:
+            raise ValueError(f"{json_path}: unsupported geometry type {geom.geom_type}")
+
+    if geoms:
+        _, coords, (ring_offsets, part_offsets, geom_offsets) = shapely.to_ragged_array(geoms)
+    else:
+        coords = np.empty((0, 2))
+        ring_offsets = part_offsets = geom_offsets = np.zeros(1)
+
+    gid_index: Dict[str, Dict[str, List[Any]]] = {}
+    gid_keys = sorted({k for props in properties for k in props if k.startswith("GID_")})
+    for gid_key in gid_keys:
+        pairs = sorted((str(props.get(gid_key, "")), i) for i, props in enumerate(properties))
+        gid_index[gid_key] = {"keys": [k for k, _ in pairs], "positions": [i for _, i in pairs]}
+
+    size, mtime_ns = _source_signature(json_path)
+    meta = {
+        "format": STORE_FORMAT,
+        "version": STORE_VERSION,
+        "count": len(features),
+        "source": os.path.basename(json_path),
+        "source_size": size,
+        "source_mtime_ns": mtime_ns,
+    }
+
+    store_dir = get_store_path(json_path)
+    tmp_dir = f"{store_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        arrays = {
+            "coords": np.ascontiguousarray(coords, dtype=np.float64),
+            "ring_offsets": np.asarray(ring_offsets, dtype=np.int64),
+            "part_offsets": np.asarray(part_offsets, dtype=np.int64),
+            "geom_offsets": np.asarray(geom_offsets, dtype=np.int64),
+            "geom_types": geom_types,
+        }
+        for name, arr in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), arr)
+        with open(os.path.join(tmp_dir, "properties.json"), "wb") as f:
+            f.write(_dumps(properties))
+        with open(os.path.join(tmp_dir, "gid_index.json"), "wb") as f:
+            f.write(_dumps(gid_index))
+        # meta.json last: a store without it is never opened.
+        with open(os.path.join(tmp_dir, "meta.json"), "wb") as f:
+            f.write(_dumps(meta))
+        shutil.rmtree(store_dir, ignore_errors=True)
+        os.replace(tmp_dir, store_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return store_dir
+
+
+def build_stores(
+    gadm_dirs: Sequence[Path],
+    countries: Optional[List[str]] = None,
+    force: bool = False,
+) -> None:
+    """Build stores for every GADM file under the given directories."""
+    wanted = {c.upper() for c in countries} if countries else None
+    for gadm_dir in gadm_dirs:
+        gadm_dir = Path(gadm_dir)
+        if not gadm_dir.is_dir():
+            continue
+        print(f"[xatra-build-store] {gadm_dir}")
+        for path in sorted(gadm_dir.rglob("gadm41_*_*.json")):
+            iso3 = path.name.split("_")[1]
+            if wanted is not None and iso3 not in wanted:
+                continue
+            try:
+                if build_store(str(path), force=force) is not None:
+                    print(f"  - {path.relative_to(gadm_dir)}")
+            except Exception as exc:
+                print(f"    ! failed {path.name}: {exc}")
+
+
+def main() -> None:
+    from .loaders import GADM_DIR, GADM_SIMPLIFIED_DIR
+
+    parser = argparse.ArgumentParser(
+        description="Build memory-mapped columnar stores for xatra's GADM files.",
+    )
+    parser.add_argument(
+        "--country",
+        action="append",
+        dest="countries",
+        help="ISO3 country code filter (repeatable), e.g. --country IND --country PAK",
+    )
+    parser.add_argument(
+        "--gadm-dir",
+        type=Path,
+        action="append",
+        dest="gadm_dirs",
+        help=f"GADM directory to scan recursively (repeatable). Default: {GADM_DIR} and {GADM_SIMPLIFIED_DIR}",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild stores even if they are up to date",
+    )
+    args = parser.parse_args()
+
+    gadm_dirs = args.gadm_dirs or [Path(GADM_DIR), Path(GADM_SIMPLIFIED_DIR)]
+    build_stores(gadm_dirs, countries=args.countries, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,49 +5,677 @@ This module provides a global caching system for Territory geometries with both
 in-memory and on-disk caching layers. This significantly improves performance
 for repeated geometry calculations.
 
-The cache uses a hash of the Territory's string representation as the key,
-avoiding redundant computations for identical territory expressions.
+The cache uses a hash of the Territory's canonical key (see
+Territory.canonical_key) as the key, so territory expressions that differ only
+in operand order or grouping share a single entry.
+
+Two on-disk backends are available (XATRA_CACHE_BACKEND or the `backend`
+argument): "files" keeps one file per entry, and "segments" appends entries
+to a few large segment files indexed by SQLite. Either way an entry is a
+small fixed header (format version, codec, bounding box, vertex count)
+followed by the geometry's WKB, optionally compressed; no pickles are read
+back from disk.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import hashlib
 import json
 import os
-import pickle
+import sqlite3
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import shapely
 from shapely.geometry import mapping
 from shapely.geometry.base import BaseGeometry
 
 from .debug_utils import time_debug
-from .settings import CACHING_ENABLED
+from .settings import (
+    CACHE_BACKEND,
+    CACHE_COMPRESSION,
+    CACHE_SHARED,
+    CACHING_ENABLED,
+    DISK_CACHE_MAX_AGE_DAYS,
+    DISK_CACHE_MAX_MB,
+    GEOMETRY_CACHE_MAX_MB,
+)
+
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows: locking becomes a no-op
+    fcntl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+# Disk entry header: magic, format version, codec, reserved, bbox, vertex count.
+_ENTRY_HEADER = struct.Struct("<4sBBH4dQ")
+_ENTRY_MAGIC = b"XGWK"
+_ENTRY_VERSION = 1
+_CODECS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+_CODEC_NAMES = {v: k for k, v in _CODECS.items()}
+
+
+class _CacheEntryError(ValueError):
+    """Raised when a disk cache entry cannot be decoded."""
+
+
+def _compress(codec: str, payload: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.compress(payload, 6)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor().compress(payload)
+    if codec == "lz4":
+        return lz4_frame.compress(payload)
+    return payload
+
+
+def _decompress(codec: str, payload: bytes) -> bytes:
+    try:
+        if codec == "zlib":
+            return zlib.decompress(payload)
+        if codec == "zstd":
+            if zstandard is None:
+                raise _CacheEntryError("zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if codec == "lz4":
+            if lz4_frame is None:
+                raise _CacheEntryError("lz4 is not installed")
+            return lz4_frame.decompress(payload)
+    except _CacheEntryError:
+        raise
+    except Exception as e:
+        raise _CacheEntryError(f"cannot decompress {codec} entry: {e}") from e
+    return payload
+
+
+def _available_codec(codec: str) -> str:
+    """The codec to write with: `codec` if its module is importable, else "none"."""
+    if (codec == "zstd" and zstandard is None) or (codec == "lz4" and lz4_frame is None):
+        return "none"
+    return codec if codec in _CODECS else "none"
+
+
+def _encode_entry(geometry: BaseGeometry, codec: str = "none") -> bytes:
+    """Serialize a geometry as header + (compressed) WKB."""
+    if geometry.is_empty:
+        bounds = (float("nan"),) * 4
+    else:
+        bounds = tuple(geometry.bounds)
+    header = _ENTRY_HEADER.pack(
+        _ENTRY_MAGIC, _ENTRY_VERSION, _CODECS[codec], 0, *bounds, int(shapely.get_num_coordinates(geometry))
+    )
+    return header + _compress(codec, shapely.to_wkb(geometry))
+
+
+def _decode_entry_header(data: bytes) -> Dict[str, Any]:
+    """Parse the header of a disk cache entry (only its first bytes are needed)."""
+    try:
+        magic, version, codec, _, minx, miny, maxx, maxy, vertices = _ENTRY_HEADER.unpack_from(data)
+    except struct.error as e:
+        raise _CacheEntryError("truncated cache entry") from e
+    if magic != _ENTRY_MAGIC or version != _ENTRY_VERSION or codec not in _CODEC_NAMES:
+        raise _CacheEntryError("not a geometry cache entry of a supported version")
+    return {
+        "version": version,
+        "codec": _CODEC_NAMES[codec],
+        "bounds": (minx, miny, maxx, maxy),
+        "vertex_count": vertices,
+    }
+
+
+def _decode_entry(data: bytes) -> BaseGeometry:
+    """Deserialize a disk cache entry written by _encode_entry."""
+    header = _decode_entry_header(data)
+    payload = _decompress(header["codec"], data[_ENTRY_HEADER.size:])
+    try:
+        return shapely.from_wkb(payload)
+    except (shapely.errors.GEOSException, TypeError, ValueError) as e:
+        raise _CacheEntryError(f"invalid WKB: {e}") from e
+
+
+# Blocking cache, file and GEOS work behind the async API runs here, off the
+# event loop. The caches are thread-safe and async evaluation passes its
+# simplification tolerance per thread, so several workers keep quick calls
+# (aread_json, cached ato_geometry) from queueing behind a long export.
+_async_executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) + 4), thread_name_prefix="xatra-async"
+)
+# (event loop id, key) -> in-flight future, for coalescing concurrent requests
+_async_inflight: Dict[Tuple[int, Any], "asyncio.Future[Any]"] = {}
+
+
+async def _run_coalesced(key: Any, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run fn(*args) on the async executor, sharing one run among concurrent callers.
+
+    Callers awaiting the same key while a run is in flight get its result (or
+    exception) instead of starting another. Cancelling one caller does not
+    cancel the shared run.
+    """
+    loop = asyncio.get_running_loop()
+    inflight_key = (id(loop), key)
+    future = _async_inflight.get(inflight_key)
+    if future is None:
+        future = loop.run_in_executor(_async_executor, fn, *args)
+        _async_inflight[inflight_key] = future
+        future.add_done_callback(lambda _: _async_inflight.pop(inflight_key, None))
+    return await asyncio.shield(future)
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory (flock) lock on `path` across processes."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a+b") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Per-thread set of key lock files held, so a nested call on a key this thread
+# already holds does not flock it again (flock is not reentrant across opens).
+_held_key_locks = threading.local()
+
+
+@contextlib.contextmanager
+def _key_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive flock on a per-key lock file, removing the file on release.
+
+    A waiter that wakes up holding the lock on a file that was already
+    removed (its inode is no longer at `path`) retries on the new file, so
+    lock files do not pile up and two holders never coexist.
+    """
+    held_paths = getattr(_held_key_locks, "paths", None)
+    if held_paths is None:
+        held_paths = _held_key_locks.paths = set()
+    if fcntl is None or path in held_paths:
+        yield
+        return
+    while True:
+        f = open(path, "a+b")
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            held = os.fstat(f.fileno())
+            try:
+                current = os.stat(path)
+            except FileNotFoundError:
+                current = None
+        except BaseException:
+            f.close()
+            raise
+        if current is not None and (current.st_dev, current.st_ino) == (held.st_dev, held.st_ino):
+            break
+        f.close()
+    held_paths.add(path)
+    try:
+        yield
+    finally:
+        held_paths.discard(path)
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        # Closing the descriptor releases the lock.
+        f.close()
+
+
+def _estimate_geometry_size(geometry: Any) -> int:
+    """Estimated memory footprint of a geometry: 16 bytes per vertex."""
+    try:
+        return max(int(shapely.get_num_coordinates(geometry)), 1) * 16
+    except (TypeError, shapely.errors.GEOSException):
+        return 16
+
+
+class _MemoryLRU:
+    """Byte-budgeted LRU of geometries keyed by cache hash.
+
+    Sizes are estimated as vertex count x 16 bytes. When the total exceeds
+    ``max_bytes``, least recently used geometries are evicted; the most
+    recently stored one is always kept. All operations are thread-safe.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def __contains__(self, cache_key: str) -> bool:
+        return cache_key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, cache_key: str) -> Any:
+        with self._lock:
+            geometry, _ = self._entries[cache_key]
+            self._entries.move_to_end(cache_key)
+            return geometry
+
+    def get(self, cache_key: str, default: Any = None) -> Any:
+        with self._lock:
+            if cache_key not in self._entries:
+                return default
+            return self[cache_key]
+
+    def __setitem__(self, cache_key: str, geometry: Any) -> None:
+        size = _estimate_geometry_size(geometry)
+        with self._lock:
+            self.pop(cache_key, None)
+            self._entries[cache_key] = (geometry, size)
+            self.current_bytes += size
+            self._evict()
+
+    def pop(self, cache_key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(cache_key, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def set_max_bytes(self, max_bytes: Optional[int]) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+
+
+class _FileBackend:
+    """One `<key>.geom` file per entry in the cache directory."""
+
+    name = "files"
+    SUFFIX = ".geom"
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def _path(self, cache_key: str) -> Path:
+        return self.cache_dir / f"{cache_key}{self.SUFFIX}"
+
+    def read(self, cache_key: str, max_bytes: Optional[int] = None) -> Optional[bytes]:
+        try:
+            with open(self._path(cache_key), "rb") as f:
+                return f.read() if max_bytes is None else f.read(max_bytes)
+        except FileNotFoundError:
+            return None
+
+    def write(self, cache_key: str, data: bytes) -> None:
+        # Write then rename, so readers never see a partial file.
+        path = self._path(cache_key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def delete(self, cache_key: str) -> None:
+        self._path(cache_key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        # *.pkl: entries from before the WKB format
+        for pattern in (f"*{self.SUFFIX}", "*.pkl"):
+            for cache_file in self.cache_dir.glob(pattern):
+                cache_file.unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        # Directory scan: O(number of entries).
+        files = list(self.cache_dir.glob(f"*{self.SUFFIX}"))
+        return {"entries": len(files), "bytes": sum(f.stat().st_size for f in files)}
+
+    def entries_by_age(self) -> List[Tuple[str, int, float]]:
+        """(key, size, written_at) for every entry, oldest first."""
+        entries = []
+        for cache_file in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                st = cache_file.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((cache_file.stem, st.st_size, st.st_mtime))
+        return sorted(entries, key=lambda e: e[2])
+
+    def delete_many(self, cache_keys: List[str]) -> None:
+        for cache_key in cache_keys:
+            self.delete(cache_key)
+
+    def compact(self) -> None:
+        pass
+
+
+class _SegmentBackend:
+    """Append-only segment files with a SQLite index.
+
+    Each record is appended to the current segment file as a small header
+    (magic, payload length, CRC32) followed by the payload. The index maps
+    cache keys to (segment, offset, length) and is only updated after the
+    record is fully written, so a crash can leave unreferenced bytes but never
+    a torn entry. Overwritten and deleted records become dead bytes that
+    compact() reclaims. Entry/byte totals are kept in a one-row table by
+    triggers, so stats are O(1).
+
+    Several processes may share one directory: appends, deletes and
+    compaction hold an flock on `segments/lock`, SQLite (WAL) serializes the
+    index, and readers that hit a segment replaced by another process reopen
+    it and retry. The SQLite connection and descriptors are reopened after
+    fork. Within a process, a lock serializes use of the shared connection.
+    """
+
+    name = "segments"
+    _MAGIC = b"XGC1"
+    _HEADER = struct.Struct("<4sQI")
+    SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, cache_dir: Path):
+        self.dir = cache_dir / "segments"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._pid = None
+        self._thread_lock = threading.RLock()
+        with self._locked():
+            self._init_schema()
+
+    def _connect(self) -> None:
+        self._conn = sqlite3.connect(
+            str(self.dir / "index.sqlite"), isolation_level=None, check_same_thread=False, timeout=30
+        )
+        self._readers: Dict[int, int] = {}
+        self._pid = os.getpid()
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Connections and descriptors must not be shared with a forked child.
+        if self._pid != os.getpid():
+            self._connect()
+        return self._conn
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock, _file_lock(self.dir / "lock"):
+            yield
+
+    def _init_schema(self) -> None:
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, segment INTEGER NOT NULL,
+                offset INTEGER NOT NULL, length INTEGER NOT NULL,
+                created REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS totals (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                entries INTEGER NOT NULL, bytes INTEGER NOT NULL, dead_bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO totals VALUES (0, 0, 0, 0);
+            CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.length WHERE id = 0;
+            END;
+            CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.length,
+                    dead_bytes = dead_bytes + OLD.length WHERE id = 0;
+            END;
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if "created" not in columns:
+            self._db.execute("ALTER TABLE entries ADD COLUMN created REAL NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created)")
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.dir / f"seg-{segment:06d}.bin"
+
+    def _segments(self) -> List[int]:
+        return sorted(int(p.stem.split("-")[1]) for p in self.dir.glob("seg-*.bin"))
+
+    def _reader(self, segment: int) -> int:
+        # Raw descriptors read with os.pread, which needs no shared seek position.
+        fd = self._readers.get(segment)
+        if fd is None:
+            fd = self._readers[segment] = os.open(self._segment_path(segment), os.O_RDONLY)
+        return fd
+
+    def _close_readers(self) -> None:
+        if self._pid != os.getpid():
+            return
+        for fd in self._readers.values():
+            os.close(fd)
+        self._readers.clear()
+
+    def _append(self, records: List[Tuple[str, bytes]], segment: Optional[int] = None) -> List[Tuple[str, int, int, int, float]]:
+        """Append payloads to the newest segment (rolling over when full); return index rows."""
+        segments = self._segments()
+        if segment is None:
+            segment = segments[-1] if segments else 1
+        rows = []
+        f = open(self._segment_path(segment), "ab")
+        try:
+            now = time.time()
+            for cache_key, data, *created in records:
+                offset = f.tell()
+                if offset and offset + len(data) > self.SEGMENT_MAX_BYTES:
+                    f.close()
+                    segment += 1
+                    f = open(self._segment_path(segment), "ab")
+                    offset = f.tell()
+                f.write(self._HEADER.pack(self._MAGIC, len(data), zlib.crc32(data)))
+                f.write(data)
+                rows.append((cache_key, segment, offset, len(data), created[0] if created else now))
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        return rows
+
+    def read(self, cache_key: str, max_bytes: Optional[int] = None) -> Optional[bytes]:
+        """Read an entry; with max_bytes, only its first bytes (not checksummed)."""
+        with self._thread_lock:
+            row = self._db.execute(
+                "SELECT segment, offset, length FROM entries WHERE key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            data = self._read_record(*row, max_bytes)
+            if data is None and row[0] in self._readers:
+                # The cached descriptor may point at a segment another process
+                # has since removed and recreated: reopen and retry once.
+                os.close(self._readers.pop(row[0]))
+                data = self._read_record(*row, max_bytes)
+            return data
+
+    def _read_record(self, segment: int, offset: int, length: int, max_bytes: Optional[int]) -> Optional[bytes]:
+        partial = max_bytes is not None and max_bytes < length
+        try:
+            record = os.pread(self._reader(segment), self._HEADER.size + (max_bytes if partial else length), offset)
+            magic, size, crc = self._HEADER.unpack_from(record)
+        except (OSError, struct.error):
+            return None
+        data = record[self._HEADER.size:]
+        if magic != self._MAGIC or size != length:
+            return None
+        if partial:
+            return data
+        if len(data) != length or zlib.crc32(data) != crc:
+            return None
+        return data
+
+    def write(self, cache_key: str, data: bytes) -> None:
+        with self._locked():
+            rows = self._append([(cache_key, data)])
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.execute("DELETE FROM entries WHERE key = ?", (cache_key,))
+                self._db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+
+    def delete(self, cache_key: str) -> None:
+        with self._thread_lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (cache_key,))
+
+    def clear(self) -> None:
+        with self._locked():
+            self._close_readers()
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.execute("DELETE FROM entries")
+                self._db.execute("UPDATE totals SET entries = 0, bytes = 0, dead_bytes = 0")
+            for segment in self._segments():
+                self._segment_path(segment).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._thread_lock:
+            entries, live, dead = self._db.execute(
+                "SELECT entries, bytes, dead_bytes FROM totals WHERE id = 0"
+            ).fetchone()
+        return {"entries": entries, "bytes": live, "dead_bytes": dead}
+
+    def entries_by_age(self) -> List[Tuple[str, int, float]]:
+        """(key, size, written_at) for every entry, oldest first."""
+        with self._thread_lock:
+            return self._db.execute("SELECT key, length, created FROM entries ORDER BY created").fetchall()
+
+    def delete_many(self, cache_keys: List[str]) -> None:
+        with self._locked():
+            with self._db:
+                self._db.execute("BEGIN IMMEDIATE")
+                self._db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in cache_keys])
+            totals = self.stats()
+            if totals["dead_bytes"] > totals["bytes"]:
+                self._compact()
+
+    def _iter_live(self) -> Iterator[Tuple[str, bytes, float]]:
+        rows = self._db.execute("SELECT key, created FROM entries ORDER BY segment, offset").fetchall()
+        for cache_key, created in rows:
+            data = self.read(cache_key)
+            if data is not None:
+                yield cache_key, data, created
+
+    def compact(self) -> None:
+        """Rewrite live entries into fresh segments and drop the old ones."""
+        with self._locked():
+            self._compact()
+
+    def _compact(self) -> None:
+        old_segments = self._segments()
+        if not old_segments:
+            return
+        rows = self._append(list(self._iter_live()), segment=old_segments[-1] + 1)
+        with self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM entries")
+            self._db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+            self._db.execute("UPDATE totals SET dead_bytes = 0")
+        self._close_readers()
+        for segment in old_segments:
+            self._segment_path(segment).unlink(missing_ok=True)
+
+
+_BACKENDS = {backend.name: backend for backend in (_FileBackend, _SegmentBackend)}
 
 
 class GeometryCache:
     """Global geometry cache with in-memory and on-disk layers."""
     
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        backend: Optional[str] = None,
+        compression: Optional[str] = None,
+        shared: Optional[bool] = None,
+    ):
         """Initialize the geometry cache.
         
         Args:
             cache_dir: Directory for on-disk cache. If None, uses ~/.xatra/cache/
+            backend: On-disk layout, "files" or "segments". If None, uses the
+                XATRA_CACHE_BACKEND setting (default "files").
+            compression: Codec for new disk entries: "none", "zlib", "zstd" or
+                "lz4". If None, uses XATRA_CACHE_COMPRESSION (default "none").
+                Falls back to "none" when the codec's module is not installed.
+            shared: Share the disk cache between concurrently running
+                processes (e.g. web workers): computations of the same key are
+                serialized across processes by file locks and the default
+                backend becomes "segments", whose segment files are read
+                through the OS page cache shared by all processes. If None,
+                uses XATRA_CACHE_SHARED (default off).
+                
+        Raises:
+            ValueError: If backend is not a known backend name
         """
         if cache_dir is None:
             cache_dir = Path.home() / ".xatra" / "cache"
         
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.shared = CACHE_SHARED if shared is None else bool(shared)
+        backend = backend or ("segments" if self.shared and CACHE_BACKEND == "files" else CACHE_BACKEND)
+        self._lock_dir = self.cache_dir / "locks"
+        self.set_shared(self.shared)
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown geometry cache backend: {backend!r} (expected one of {sorted(_BACKENDS)})")
+        self._backend = _BACKENDS[backend](self.cache_dir)
+        self._codec = _available_codec(compression or CACHE_COMPRESSION)
         
-        # In-memory cache: hash -> geometry
-        self._memory_cache: Dict[str, BaseGeometry] = {}
+        # In-memory cache: hash -> geometry, LRU-evicted by estimated size
+        self._memory_cache = _MemoryLRU(GEOMETRY_CACHE_MAX_MB * 1024 * 1024 if GEOMETRY_CACHE_MAX_MB else None)
         
         # Cache statistics
         self._hits = 0
         self._misses = 0
         self._disk_hits = 0
         self._disk_misses = 0
+        self._gc_removed_entries = 0
+        self._gc_removed_bytes = 0
+        self._shared_hits = 0
+        self._coalesced_waits = 0
+        # Guards the statistics and the in-flight computations below.
+        self._lock = threading.Lock()
+        # cache key -> Future of the computation running in another thread
+        self._inflight: Dict[str, "Future[Optional[BaseGeometry]]"] = {}
+        # Keys whose computation the current thread leads (see compute_and_put)
+        self._leading = threading.local()
+
+        # Apply configured disk limits once per cache instance.
+        if CACHING_ENABLED and (DISK_CACHE_MAX_MB or DISK_CACHE_MAX_AGE_DAYS):
+            try:
+                self.gc_disk()
+            except (OSError, sqlite3.Error):
+                pass
     
     def _compute_hash(self, strrepr: str) -> str:
         """Compute a hash for the territory string representation.
@@ -60,17 +688,6 @@ class GeometryCache:
         """
         return hashlib.sha256(strrepr.encode('utf-8')).hexdigest()[:16]
     
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get the file path for a cache key.
-        
-        Args:
-            cache_key: Cache key
-            
-        Returns:
-            Path to cache file
-        """
-        return self.cache_dir / f"{cache_key}.pkl"
-    
     @time_debug("Get geometry from cache")
     def get(self, strrepr: str) -> Optional[BaseGeometry]:
         """Get geometry from cache.
@@ -86,33 +703,142 @@ class GeometryCache:
         cache_key = self._compute_hash(strrepr)
 
         # Check in-memory cache first
-        if cache_key in self._memory_cache:
-            self._hits += 1
-            return self._memory_cache[cache_key]
+        geometry = self._memory_cache.get(cache_key)
+        if geometry is not None:
+            self._count("_hits")
+            return geometry
 
         # When caching is disabled, bypass disk cache only.
         if not CACHING_ENABLED:
-            self._misses += 1
+            self._count("_misses")
             return None
         
         # Check on-disk cache
-        cache_path = self._get_cache_path(cache_key)
-        if cache_path.exists():
+        geometry = self._get_from_disk(cache_key)
+        if geometry is not None:
+            self._count("_hits")
+            return geometry
+        
+        self._count("_misses")
+        return None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def aget(self, strrepr: str) -> Optional[BaseGeometry]:
+        """Awaitable get(): disk reads and decoding run off the event loop.
+        
+        Concurrent calls for the same key share one lookup.
+        """
+        return await _run_coalesced(("get", id(self), self._compute_hash(strrepr)), self.get, strrepr)
+
+    async def aput(self, strrepr: str, geometry: BaseGeometry) -> None:
+        """Awaitable put(): encoding and disk writes run off the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_async_executor, self.put, strrepr, geometry)
+
+    def _get_from_disk(self, cache_key: str) -> Optional[BaseGeometry]:
+        data = self._backend.read(cache_key)
+        if data is not None:
             try:
-                with open(cache_path, 'rb') as f:
-                    geometry = pickle.load(f)
+                geometry = _decode_entry(data)
                 # Store in memory cache for future access
                 self._memory_cache[cache_key] = geometry
-                self._disk_hits += 1
-                self._hits += 1
+                self._count("_disk_hits")
                 return geometry
-            except (pickle.PickleError, EOFError, FileNotFoundError):
-                # Cache file is corrupted, remove it
-                cache_path.unlink(missing_ok=True)
-        
-        self._misses += 1
-        self._disk_misses += 1
+            except _CacheEntryError:
+                # Cache entry is corrupted or in an unsupported format, remove it
+                self._backend.delete(cache_key)
+        self._count("_disk_misses")
         return None
+
+    def compute_and_put(self, strrepr: str, compute: Callable[[], Optional[BaseGeometry]]) -> Optional[BaseGeometry]:
+        """Compute and store a geometry after get() missed.
+        
+        Single-flight: if another thread is already computing the same key,
+        this waits for that result (or exception) instead of computing it
+        again. A thread asking again for a key it is itself computing (e.g.
+        A | A, whose key is A's) computes it inline instead. In shared mode, the computation also runs under a cross-process
+        lock file for the key (nested operand keys take their own lock files)
+        and the disk cache is checked again once the lock is held, so when
+        several processes miss on the same key only one of them computes it
+        and the others read its result.
+        
+        Args:
+            strrepr: Territory string representation
+            compute: Computes the geometry; a None result is returned but not cached
+            
+        Returns:
+            Computed (or concurrently computed) geometry
+        """
+        cache_key = self._compute_hash(strrepr)
+        leading = getattr(self._leading, "keys", None)
+        if leading is None:
+            leading = self._leading.keys = set()
+        if cache_key in leading:
+            # Waiting on our own flight would never return.
+            return self._compute_and_put(strrepr, cache_key, compute)
+
+        with self._lock:
+            flight = self._inflight.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[cache_key] = Future()
+            else:
+                self._coalesced_waits += 1
+        if not leader:
+            return flight.result()
+
+        leading.add(cache_key)
+        try:
+            geometry = self._compute_and_put(strrepr, cache_key, compute)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(geometry)
+            return geometry
+        finally:
+            leading.discard(cache_key)
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+
+    def _compute_and_put(
+        self, strrepr: str, cache_key: str, compute: Callable[[], Optional[BaseGeometry]]
+    ) -> Optional[BaseGeometry]:
+        if not (self.shared and CACHING_ENABLED):
+            geometry = compute()
+            if geometry is not None:
+                self.put(strrepr, geometry)
+            return geometry
+
+        # Held across compute(), which may compute operands under their own
+        # keys. Operands are always locked after the expressions containing
+        # them, and an operand sharing its enclosing key (A | A) is already
+        # held by this thread and not locked again (see _key_lock), so nested
+        # locks cannot deadlock within or across processes.
+        with _key_lock(self._lock_path(cache_key)):
+            geometry = self._get_from_disk(cache_key)
+            if geometry is not None:
+                self._count("_shared_hits")
+                return geometry
+            geometry = compute()
+            if geometry is not None:
+                self.put(strrepr, geometry)
+        return geometry
+
+    def set_shared(self, enabled: bool) -> None:
+        """Turn shared (cross-process locked) computation on or off for this cache."""
+        self.shared = bool(enabled)
+        if self.shared:
+            self._lock_dir.mkdir(exist_ok=True)
+
+    def _lock_path(self, cache_key: str) -> Path:
+        # One lock file per key (removed on release): a shared stripe lock
+        # would self-deadlock when a nested operand hashes to an enclosing
+        # expression's stripe, since flock is not reentrant across opens.
+        return self._lock_dir / f"{cache_key}.lock"
     
     @time_debug("Store geometry in cache")
     def put(self, strrepr: str, geometry: BaseGeometry) -> None:
@@ -134,13 +860,49 @@ class GeometryCache:
             return
 
         # Store in disk cache
-        cache_path = self._get_cache_path(cache_key)
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(geometry, f, protocol=pickle.HIGHEST_PROTOCOL)
-        except (OSError, pickle.PickleError):
+            self._backend.write(cache_key, _encode_entry(geometry, self._codec))
+        except (OSError, sqlite3.Error, shapely.errors.GEOSException):
             # If disk write fails, continue with memory-only caching
             pass
+
+    def get_entry_info(self, strrepr: str) -> Optional[Dict[str, Any]]:
+        """Get an entry's metadata without loading its geometry from disk.
+        
+        Args:
+            strrepr: Territory string representation
+            
+        Returns:
+            Dictionary with "bounds" (minx, miny, maxx, maxy; NaN for empty
+            geometries) and "vertex_count" (plus "version" and "codec" for
+            disk entries), or None if the entry is not cached
+        """
+        cache_key = self._compute_hash(strrepr)
+        geometry = self._memory_cache.get(cache_key)
+        if geometry is not None:
+            bounds = (float("nan"),) * 4 if geometry.is_empty else tuple(geometry.bounds)
+            return {"bounds": bounds, "vertex_count": int(shapely.get_num_coordinates(geometry))}
+        if not CACHING_ENABLED:
+            return None
+        data = self._backend.read(cache_key, max_bytes=_ENTRY_HEADER.size)
+        if data is None:
+            return None
+        try:
+            return _decode_entry_header(data)
+        except _CacheEntryError:
+            return None
+
+    def get_bounds(self, strrepr: str) -> Optional[Tuple[float, float, float, float]]:
+        """Get the bounding box of a cached geometry, reading only the entry header.
+        
+        Args:
+            strrepr: Territory string representation
+            
+        Returns:
+            (minx, miny, maxx, maxy), or None if the entry is not cached
+        """
+        info = self.get_entry_info(strrepr)
+        return info["bounds"] if info is not None else None
     
     def clear_memory_cache(self) -> None:
         """Clear the in-memory cache."""
@@ -148,8 +910,64 @@ class GeometryCache:
     
     def clear_disk_cache(self) -> None:
         """Clear the on-disk cache."""
-        for cache_file in self.cache_dir.glob("*.pkl"):
-            cache_file.unlink(missing_ok=True)
+        self._backend.clear()
+
+    def set_memory_budget(self, max_bytes: Optional[int]) -> None:
+        """Set the in-memory cache budget in (estimated) bytes; None or 0 for no limit.
+        
+        Least recently used geometries are evicted immediately if the cache
+        is over the new budget.
+        """
+        self._memory_cache.set_max_bytes(max_bytes)
+
+    @time_debug("Garbage-collect disk geometry cache")
+    def gc_disk(self, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None) -> Dict[str, int]:
+        """Remove on-disk entries that are too old or exceed the size limit.
+        
+        Entries written more than max_age_seconds ago are removed first; then
+        the oldest remaining entries are removed until the total is within
+        max_bytes.
+        
+        Args:
+            max_bytes: Size limit for the disk cache. If None, uses
+                XATRA_DISK_CACHE_MB (0 means no limit).
+            max_age_seconds: Age limit for entries. If None, uses
+                XATRA_DISK_CACHE_MAX_AGE_DAYS (0 means no limit).
+                
+        Returns:
+            Dictionary with "removed_entries" and "removed_bytes"
+        """
+        if max_bytes is None:
+            max_bytes = DISK_CACHE_MAX_MB * 1024 * 1024
+        if max_age_seconds is None:
+            max_age_seconds = DISK_CACHE_MAX_AGE_DAYS * 86400
+        entries = self._backend.entries_by_age()
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_age_seconds if max_age_seconds else None
+
+        removed: List[str] = []
+        removed_bytes = 0
+        for cache_key, size, written_at in entries:
+            too_old = cutoff is not None and written_at < cutoff
+            too_big = bool(max_bytes) and total > max_bytes
+            if not (too_old or too_big):
+                break
+            removed.append(cache_key)
+            removed_bytes += size
+            total -= size
+        if removed:
+            self._backend.delete_many(removed)
+        self._gc_removed_entries += len(removed)
+        self._gc_removed_bytes += removed_bytes
+        return {"removed_entries": len(removed), "removed_bytes": removed_bytes}
+
+    def compact(self) -> None:
+        """Reclaim space held by overwritten or deleted on-disk entries.
+        
+        Only the "segments" backend accumulates dead space; for "files" this
+        is a no-op.
+        """
+        self._backend.compact()
     
     def clear_all_cache(self) -> None:
         """Clear both in-memory and on-disk cache."""
@@ -165,8 +983,7 @@ class GeometryCache:
         total_requests = self._hits + self._misses
         memory_size = len(self._memory_cache)
         
-        # Count disk cache files
-        disk_size = len(list(self.cache_dir.glob("*.pkl")))
+        disk_stats = self._backend.stats()
         
         stats = {
             "caching_enabled": CACHING_ENABLED,
@@ -176,7 +993,19 @@ class GeometryCache:
             "disk_hits": self._disk_hits,
             "disk_misses": self._disk_misses,
             "memory_cache_size": memory_size,
-            "disk_cache_size": disk_size,
+            "disk_cache_size": disk_stats["entries"],
+            "disk_cache_bytes": disk_stats["bytes"],
+            "disk_dead_bytes": disk_stats.get("dead_bytes", 0),
+            "disk_backend": self._backend.name,
+            "shared": self.shared,
+            "shared_hits": self._shared_hits,
+            "coalesced_waits": self._coalesced_waits,
+            "memory_cache_bytes": self._memory_cache.current_bytes,
+            "memory_cache_max_bytes": self._memory_cache.max_bytes,
+            "memory_evictions": self._memory_cache.evictions,
+            "memory_evicted_bytes": self._memory_cache.evicted_bytes,
+            "disk_gc_removed_entries": self._gc_removed_entries,
+            "disk_gc_removed_bytes": self._gc_removed_bytes,
             "hit_rate": self._hits / total_requests if total_requests > 0 else 0.0,
             "cache_dir": str(self.cache_dir)
         }
@@ -10,14 +10,19 @@ for accessing geographical data in the xatra system.
 
 from __future__ import annotations
 
+import contextlib
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from urllib import error as urllib_error
 from urllib import parse as urllib_parse
 from urllib import request as urllib_request
 
 from .debug_utils import time_debug
+from .settings import FILE_CACHE_MAX_MB
 
 # Get data directory from data_installer
 try:
@@ -32,6 +37,10 @@ GADM_SIMPLIFIED_DIR = os.path.join(DATA_DIR, "gadm_simplified")
 DISPUTED_DIR = os.path.join(DATA_DIR, "disputed_territories")
 DISPUTED_MAPPING_JSON = os.path.join(DISPUTED_DIR, "disputed_mapping.json")
 NE_RIVERS_FILE = os.path.join(DATA_DIR, "ne_10m_rivers.geojson")
+# Persisted ne_id -> feature byte range index, written next to the data file
+NE_INDEX_SUFFIX = ".idx.json"
+NE_INDEX_FORMAT = "xatra-ne-index"
+NE_INDEX_VERSION = 1
 OVERPASS_DIR = os.path.join(DATA_DIR, "rivers_overpass_india")
 OVERPASS_API_URLS = [
     "https://overpass-api.de/api/interpreter",
@@ -39,11 +48,137 @@ OVERPASS_API_URLS = [
     "https://overpass.openstreetmap.ru/api/interpreter",
 ]
 
+# Rough in-memory size of parsed JSON (nested dicts/lists/floats) per byte on disk.
+_PARSED_BYTES_PER_FILE_BYTE = 5
+
+
+def _estimate_parsed_size(path: str, data: Any) -> int:
+    """Estimate the in-memory size of a parsed data file in bytes."""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    try:
+        return os.path.getsize(path) * _PARSED_BYTES_PER_FILE_BYTE
+    except OSError:
+        pass
+    try:
+        import orjson
+        return len(orjson.dumps(data)) * _PARSED_BYTES_PER_FILE_BYTE
+    except Exception:
+        return len(json.dumps(data, default=str)) * _PARSED_BYTES_PER_FILE_BYTE
+
+
+# Sentinel returned by _FileCache.lookup() for absent entries
+_MISSING = object()
+
+
+class _FileCache:
+    """Byte-budgeted LRU of parsed data files, keyed by path.
+
+    Supports the dict operations the loaders use (``in``, ``[]``, ``pop``,
+    ``clear``). When the estimated total size exceeds ``max_bytes``, least
+    recently used files are evicted; the most recently stored file is always
+    kept, even if it alone exceeds the budget. All operations are thread-safe.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getitem__(self, path: str) -> Any:
+        with self._lock:
+            value, _ = self._entries[path]
+            self._entries.move_to_end(path)
+            return value
+
+    def lookup(self, path: str) -> Any:
+        """Get an entry and count the hit or miss; _MISSING if absent."""
+        with self._lock:
+            if path not in self._entries:
+                self.misses += 1
+                return _MISSING
+            self.hits += 1
+            return self[path]
+
+    def __setitem__(self, path: str, value: Any) -> None:
+        size = _estimate_parsed_size(path, value)
+        with self._lock:
+            self.pop(path, None)
+            self._entries[path] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def pop(self, path: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def set_max_bytes(self, max_bytes: Optional[int]) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self) -> None:
+        if not self.max_bytes:
+            return
+        while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+            path, (value, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            _drop_derived_file_state(path, value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "files": len(self._entries),
+            "estimated_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "evicted_bytes": self.evicted_bytes,
+        }
+
+
 # Global file cache to avoid repeated disk reads
-_file_cache: Dict[str, Any] = {}
+_file_cache = _FileCache(FILE_CACHE_MAX_MB * 1024 * 1024 if FILE_CACHE_MAX_MB else None)
 _disputed_mapping_cache: Optional[Dict[str, Any]] = None
 _active_simplify_tolerance: Optional[float] = None
+# Per-thread override of _active_simplify_tolerance (see simplification_tolerance)
+_thread_tolerance = threading.local()
 _overpass_feature_collection_cache: Optional[Tuple[Tuple[str, ...], List[Dict[str, Any]]]] = None
+# (path, "GID_<level>") -> (FeatureCollection or GadmStore the index was built from, index)
+_gid_index_cache: Dict[Tuple[str, str], Tuple[Any, "_GidIndex"]] = {}
+# GADM json path -> opened columnar store, or None when there is no fresh store
+_gadm_store_cache: Dict[str, Any] = {}
+# (key, find_in_gadm, simplify_tolerance, active tolerance) -> source fingerprint
+_source_fingerprint_cache: Dict[Tuple[Any, ...], str] = {}
+# (gid_root, level) -> file countries, precomputed from the disputed mapping
+_disputed_countries_cache: Optional[Dict[Tuple[str, int], List[str]]] = None
+# (key, find_in_gadm, resolved tolerance) -> (path, level, prefix), or the
+# FileNotFoundError message for keys found in no file
+_gadm_location_cache: Dict[Tuple[Any, ...], Any] = {}
+# Natural Earth file path -> ((size, mtime_ns), {ne_id: (start, end)})
+_ne_index_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Tuple[int, int]]]] = {}
 
 OVERPASS_MERGED_FILE = os.path.join(OVERPASS_DIR, "_merged_features.json")
 OVERPASS_MERGED_MANIFEST = os.path.join(OVERPASS_DIR, "_merged_features_manifest.json")
@@ -76,15 +211,45 @@ def set_active_simplification_tolerance(simplify_tolerance: Optional[float]) ->
 
 
 def get_active_simplification_tolerance() -> Optional[float]:
-    """Get currently active GADM simplification tolerance."""
-    return _active_simplify_tolerance
+    """Get currently active GADM simplification tolerance.
+
+    This is the calling thread's override while a simplification_tolerance()
+    block is active on it, and the process-wide setting otherwise.
+    """
+    overrides = getattr(_thread_tolerance, "stack", None)
+    return overrides[-1] if overrides else _active_simplify_tolerance
+
+
+@contextlib.contextmanager
+def simplification_tolerance(simplify_tolerance: Optional[float]) -> Iterator[None]:
+    """Use a simplification tolerance on the calling thread only, for the block.
+
+    Unlike set_active_simplification_tolerance(), this leaves the process-wide
+    setting (and so other threads) untouched, which makes it safe for worker
+    threads evaluating territories on behalf of a caller.
+
+    Args:
+        simplify_tolerance: Tolerance to apply (None = unsimplified)
+
+    Raises:
+        ValueError: If the tolerance is not None and not positive
+    """
+    tol = _normalize_simplify_tolerance(simplify_tolerance)
+    overrides = getattr(_thread_tolerance, "stack", None)
+    if overrides is None:
+        overrides = _thread_tolerance.stack = []
+    overrides.append(tol)
+    try:
+        yield
+    finally:
+        overrides.pop()
 
 
 def _resolve_simplify_tolerance(simplify_tolerance: Optional[float]) -> Optional[float]:
     """Resolve explicit tolerance or fall back to active map/session tolerance."""
     if simplify_tolerance is not None:
         return _normalize_simplify_tolerance(simplify_tolerance)
-    return _active_simplify_tolerance
+    return get_active_simplification_tolerance()
 
 
 def _get_gadm_file_path(
@@ -104,6 +269,21 @@ def _get_gadm_file_path(
         f"gadm41_{iso3}_{level}.json",
     )
 
+async def aread_json(path: str):
+    """Awaitable _read_json: reading and parsing run off the event loop.
+
+    Concurrent calls for the same path share one read.
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    from .geometry_cache import _run_coalesced
+    return await _run_coalesced(("read_json", path), _read_json, path)
+
+
 @time_debug("Read JSON file")
 def _read_json(path: str):
     """Read JSON file from disk with caching and optional orjson/pickle speedup.
@@ -117,10 +297,11 @@ def _read_json(path: str):
     Raises:
         FileNotFoundError: If file doesn't exist
     """
-    if path in _file_cache:
+    cached = _file_cache.lookup(path)
+    if cached is not _MISSING:
         if DEBUG_FILE_CACHE:
             print(f"DEBUG: Using memory-cached file: {path}")
-        return _file_cache[path]
+        return cached
 
     if not os.path.exists(path):
         raise FileNotFoundError(f"Missing data file: {path}")
@@ -166,6 +347,27 @@ def _read_json(path: str):
 
     return data
 
+def _drop_derived_file_state(path: str, data: Any) -> None:
+    """Forget indexes built from a parsed file that left the file cache."""
+    for cache_key in [k for k, entry in _gid_index_cache.items() if k[0] == path and entry[0] is data]:
+        del _gid_index_cache[cache_key]
+
+
+def set_file_cache_budget(max_bytes: Optional[int]) -> None:
+    """Set the memory budget of the parsed data file cache.
+
+    Args:
+        max_bytes: Budget in bytes for the estimated size of cached files;
+            None or 0 disables the limit. Defaults to XATRA_FILE_CACHE_MB (2048 MB).
+    """
+    _file_cache.set_max_bytes(max_bytes or None)
+
+
+def get_file_cache_stats() -> Dict[str, Any]:
+    """Get statistics (size, hits, evictions) for the parsed data file cache."""
+    return _file_cache.stats()
+
+
 @time_debug("Clear file cache")
 def clear_file_cache():
     """Clear the file cache to free memory.
@@ -175,10 +377,154 @@ def clear_file_cache():
     """
     global _file_cache
     _file_cache.clear()
-    global _disputed_mapping_cache
+    global _disputed_mapping_cache, _disputed_countries_cache
     _disputed_mapping_cache = None
+    _disputed_countries_cache = None
     global _overpass_feature_collection_cache
     _overpass_feature_collection_cache = None
+    _gid_index_cache.clear()
+    _gadm_store_cache.clear()
+    _source_fingerprint_cache.clear()
+    _gadm_location_cache.clear()
+    _ne_index_cache.clear()
+
+
+class _GidIndex:
+    """Sorted ``GID_<level>`` keys of one GADM file for O(log n + k) prefix lookups.
+
+    A prefix matches with a boundary check ('IND.1' matches 'IND.1.2' but not
+    'IND.10'), so its features occupy at most three contiguous runs of the
+    sorted keys: the prefix itself, ``prefix.*`` and ``prefix_*``.
+    """
+
+    def __init__(self, features: List[Dict[str, Any]], gid_key: str):
+        pairs = sorted(
+            (str((feat.get("properties", {}) or {}).get(gid_key, "")), i)
+            for i, feat in enumerate(features)
+        )
+        self.keys: List[str] = [k for k, _ in pairs]
+        self.positions: List[int] = [i for _, i in pairs]
+
+    @classmethod
+    def from_sorted(cls, keys: List[str], positions: List[int]) -> "_GidIndex":
+        """Wrap an already sorted key/position table (e.g. read from a GADM store)."""
+        index = cls.__new__(cls)
+        index.keys = keys
+        index.positions = positions
+        return index
+
+    def lookup(self, prefix: str) -> List[int]:
+        """Return positions (in file order) of features whose GID matches prefix."""
+        keys = self.keys
+        ranges = [(bisect_left(keys, prefix), bisect_right(keys, prefix))]
+        for sep in ('.', '_'):
+            # Keys starting with prefix+sep sort before prefix+chr(ord(sep)+1).
+            ranges.append((
+                bisect_left(keys, prefix + sep),
+                bisect_left(keys, prefix + chr(ord(sep) + 1)),
+            ))
+        positions: List[int] = []
+        for lo, hi in ranges:
+            positions.extend(self.positions[lo:hi])
+        positions.sort()
+        return positions
+
+
+def _get_gid_index(path: str, source: Any, gid_key: str) -> _GidIndex:
+    """Get (building once per loaded file) the GID index of a GADM FeatureCollection or store."""
+    cache_key = (path, gid_key)
+    entry = _gid_index_cache.get(cache_key)
+    if entry is not None and entry[0] is source:
+        return entry[1]
+    if isinstance(source, dict):
+        index = _GidIndex(source.get("features", []), gid_key)
+    else:
+        stored = source.gid_index(gid_key)
+        if stored is not None:
+            index = _GidIndex.from_sorted(*stored)
+        else:
+            index = _GidIndex([{"properties": props} for props in source.properties], gid_key)
+    _gid_index_cache[cache_key] = (source, index)
+    return index
+
+
+def _get_gadm_store(path: str):
+    """Return the fresh columnar store for a GADM file (see gadm_store), or None."""
+    if path not in _gadm_store_cache:
+        from .gadm_store import open_store
+        _gadm_store_cache[path] = open_store(path)
+    return _gadm_store_cache[path]
+
+
+def _gadm_source_exists(path: str) -> bool:
+    """Whether a GADM file is available either as GeoJSON or as a columnar store."""
+    return os.path.exists(path) or _get_gadm_store(path) is not None
+
+
+def _gadm_positions(path: str, level: int, prefix: Optional[str] = None) -> Tuple[Any, List[int]]:
+    """Return (source, positions) of the features of a GADM file matching prefix (all if None).
+
+    The source is the columnar store when one exists (so only the requested
+    features are ever materialized), otherwise the parsed GeoJSON FeatureCollection.
+
+    Raises:
+        ValueError: If the GeoJSON file is not a FeatureCollection
+    """
+    store = _get_gadm_store(path)
+    if store is not None:
+        if prefix is None:
+            return store, list(range(len(store)))
+        return store, _get_gid_index(path, store, f"GID_{level}").lookup(prefix)
+
+    fc = _read_json(path)
+    if fc.get("type") != "FeatureCollection":
+        raise ValueError(f"Expected FeatureCollection in {path}")
+    if prefix is None:
+        return fc, list(range(len(fc.get("features", []))))
+    return fc, _get_gid_index(path, fc, f"GID_{level}").lookup(prefix)
+
+
+def _load_gadm_features(path: str, level: int, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load the features of a GADM file whose ``GID_<level>`` matches prefix (all if None).
+
+    Raises:
+        ValueError: If the GeoJSON file is not a FeatureCollection
+    """
+    source, positions = _gadm_positions(path, level, prefix)
+    if not isinstance(source, dict):
+        return source.features(positions)
+    features = source.get("features", [])
+    if prefix is None:
+        return features
+    return [features[i] for i in positions]
+
+
+def _load_gadm_geometry(path: str, level: int, prefix: Optional[str] = None):
+    """Load the union of the matching features of a GADM file as a Shapely geometry.
+
+    Results are kept as WKB in the file cache (so they share its memory budget
+    and ``clear_file_cache``) and rebuilt with ``shapely.from_wkb`` on reuse.
+    With a columnar store, geometries are built straight from the mapped
+    coordinate arrays; no GeoJSON dicts or coordinate lists are created.
+    """
+    import shapely
+    from shapely.geometry import shape
+
+    cache_key = f"gadm-wkb:{path}#{prefix or '*'}"
+    wkb = _file_cache.lookup(cache_key)
+    if wkb is not _MISSING:
+        return shapely.from_wkb(wkb) if wkb else None
+
+    source, positions = _gadm_positions(path, level, prefix)
+    if isinstance(source, dict):
+        features = source.get("features", [])
+        geoms = [shape(features[i]["geometry"]) for i in positions if features[i].get("geometry")]
+    else:
+        geoms = [g for g in source.geometries(positions) if g is not None]
+
+    geometry = shapely.union_all(geoms) if geoms else None
+    _file_cache[cache_key] = shapely.to_wkb(geometry) if geometry is not None else b""
+    return geometry
 
 
 @time_debug("Load disputed mapping")
@@ -196,33 +542,36 @@ def _load_disputed_mapping() -> Optional[Dict[str, Any]]:
     return _disputed_mapping_cache
 
 
+def _disputed_countries() -> Dict[Tuple[str, int], List[str]]:
+    """(gid_root, level) -> countries whose files hold it, built once from the disputed mapping."""
+    global _disputed_countries_cache
+    if _disputed_countries_cache is not None:
+        return _disputed_countries_cache
+    table: Dict[Tuple[str, int], List[str]] = {}
+    for gid_root, entries in (_load_disputed_mapping() or {}).items():
+        for e in entries or []:
+            try:
+                level = int(e.get("level", -1))
+                c = str(e.get("file_country"))
+            except Exception:
+                continue
+            countries = table.setdefault((gid_root, level), [])
+            if c and c not in countries:
+                countries.append(c)
+    _disputed_countries_cache = table
+    return table
+
+
 def _compute_find_in_gadm_default(key: str) -> Optional[List[str]]:
     """Compute default find_in_gadm list from disputed mapping for a given GADM key.
 
     Selects countries that contain the gid_root at the exact level implied by the key.
     """
     parts = key.split('.')
-    gid_root = parts[0]
     # Expected level equals number of dots in key
     desired_level = 0 if len(parts) == 1 else len(parts) - 1
-
-    mapping = _load_disputed_mapping()
-    if not mapping:
-        return None
-    entries = mapping.get(gid_root)
-    if not entries:
-        return None
-    # Filter by level match
-    countries: List[str] = []
-    for e in entries:
-        try:
-            if int(e.get("level", -1)) == desired_level:
-                c = str(e.get("file_country"))
-                if c and c not in countries:
-                    countries.append(c)
-        except Exception:
-            continue
-    return countries or None
+    countries = _disputed_countries().get((parts[0], desired_level))
+    return list(countries) if countries else None
 
 
 @time_debug("Load GADM data")
@@ -289,11 +638,144 @@ def polygon(coords: List[List[float]], holes: Optional[List[List[List[float]]]]
     return Territory.from_polygon(coords, holes)
 
 
+def _scan_ne_feature_offsets(path: str) -> Dict[str, Tuple[int, int]]:
+    """Byte range of every feature of a GeoJSON FeatureCollection, by ne_id.
+
+    The file is decoded as latin-1 so that string offsets are byte offsets;
+    JSON syntax is ASCII and UTF-8 continuation bytes never look like it, so
+    feature boundaries are found correctly. The first feature wins for
+    duplicate ids.
+
+    Raises:
+        ValueError: If the file is not a FeatureCollection
+    """
+    import re
+
+    with open(path, "rb") as f:
+        text = f.read().decode("latin-1")
+    match = re.search(r'"features"\s*:\s*\[', text)
+    if match is None:
+        raise ValueError("Expected FeatureCollection in Natural Earth rivers file")
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r"[\s,]*")
+    offsets: Dict[str, Tuple[int, int]] = {}
+    pos = whitespace.match(text, match.end()).end()
+    while pos < len(text) and text[pos] != "]":
+        feature, end = decoder.raw_decode(text, pos)
+        ne_id = (feature.get("properties") or {}).get("ne_id")
+        offsets.setdefault(str(ne_id), (pos, end))
+        pos = whitespace.match(text, end).end()
+    # The collection's "type" member may come before or after its features.
+    if '"FeatureCollection"' not in text[:match.start()] and '"FeatureCollection"' not in text[pos:]:
+        raise ValueError("Expected FeatureCollection in Natural Earth rivers file")
+    return offsets
+
+
+def _get_ne_index(path: str) -> Dict[str, Tuple[int, int]]:
+    """ne_id -> feature byte range for a Natural Earth file.
+
+    The index is persisted as ``<file>.idx.json`` and rebuilt whenever the
+    file's size or mtime changes; if it cannot be written (read-only data
+    directory), it is only kept in memory.
+    """
+    st = os.stat(path)
+    signature = (st.st_size, st.st_mtime_ns)
+    cached = _ne_index_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    index_path = path + NE_INDEX_SUFFIX
+    offsets: Optional[Dict[str, Tuple[int, int]]] = None
+    try:
+        with open(index_path, "rb") as f:
+            meta = json.loads(f.read())
+        if (
+            meta.get("format") == NE_INDEX_FORMAT
+            and meta.get("version") == NE_INDEX_VERSION
+            and tuple(meta.get("source", ())) == signature
+        ):
+            offsets = {ne_id: (start, end) for ne_id, (start, end) in meta["offsets"].items()}
+    except (OSError, ValueError, KeyError, TypeError):
+        offsets = None
+
+    if offsets is None:
+        offsets = _scan_ne_feature_offsets(path)
+        meta = {
+            "format": NE_INDEX_FORMAT,
+            "version": NE_INDEX_VERSION,
+            "source": list(signature),
+            "offsets": offsets,
+        }
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, index_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    _ne_index_cache[path] = (signature, offsets)
+    return offsets
+
+
+@time_debug("Load Natural Earth features (bulk)")
+def naturalearth_features(ne_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the GeoJSON Features for many Natural Earth ids in one call.
+
+    Features are located through the persisted ne_id index (see
+    _get_ne_index) and only their own bytes are read and parsed; parsed
+    features are kept in the file cache.
+
+    Args:
+        ne_ids: Natural Earth feature IDs
+
+    Returns:
+        Dictionary of str(ne_id) -> GeoJSON Feature; ids not in the file are omitted
+
+    Raises:
+        FileNotFoundError: If Natural Earth file doesn't exist
+        ValueError: If the file is not a FeatureCollection
+    """
+    if not os.path.exists(NE_RIVERS_FILE):
+        raise FileNotFoundError(f"Missing Natural Earth rivers file: {NE_RIVERS_FILE}")
+    features: Dict[str, Dict[str, Any]] = {}
+    to_read: List[Tuple[str, int, int]] = []
+    index: Optional[Dict[str, Tuple[int, int]]] = None
+    for ne_id in dict.fromkeys(str(i) for i in ne_ids):
+        cached = _file_cache.lookup(f"ne-feature:{NE_RIVERS_FILE}#{ne_id}")
+        if cached is not _MISSING:
+            features[ne_id] = cached
+            continue
+        if index is None:
+            index = _get_ne_index(NE_RIVERS_FILE)
+        if ne_id in index:
+            to_read.append((ne_id, *index[ne_id]))
+    if not to_read:
+        return features
+
+    try:
+        import orjson
+        loads = orjson.loads
+    except ImportError:
+        loads = json.loads
+    with open(NE_RIVERS_FILE, "rb") as f:
+        for ne_id, start, end in sorted(to_read, key=lambda item: item[1]):
+            f.seek(start)
+            feature = loads(f.read(end - start))
+            _file_cache[f"ne-feature:{NE_RIVERS_FILE}#{ne_id}"] = feature
+            features[ne_id] = feature
+    return features
+
+
 @time_debug("Load Natural Earth feature")
 def naturalearth(ne_id: str) -> Dict[str, Any]:
     """Return GeoJSON Feature for a Natural Earth feature id from a monolithic file.
 
-    For this prototype, we support rivers from data/ne_10m_rivers.geojson by ne_id.
+    For this prototype, we support rivers from data/ne_10m_rivers.geojson by
+    ne_id. Lookups use an ne_id index persisted next to the file, so only the
+    requested feature is read; use naturalearth_features() for many ids.
     
     Args:
         ne_id: Natural Earth feature ID
@@ -305,16 +787,10 @@ def naturalearth(ne_id: str) -> Dict[str, Any]:
         FileNotFoundError: If Natural Earth file doesn't exist
         KeyError: If ne_id not found in the file
     """
-    if not os.path.exists(NE_RIVERS_FILE):
-        raise FileNotFoundError(f"Missing Natural Earth rivers file: {NE_RIVERS_FILE}")
-    obj = _read_json(NE_RIVERS_FILE)
-    if obj.get("type") != "FeatureCollection":
-        raise ValueError("Expected FeatureCollection in Natural Earth rivers file")
-    for feat in obj.get("features", []):
-        props = feat.get("properties", {}) or {}
-        if str(props.get("ne_id")) == str(ne_id):
-            return feat
-    raise KeyError(f"ne_id {ne_id} not found in {NE_RIVERS_FILE}")
+    feature = naturalearth_features([ne_id]).get(str(ne_id))
+    if feature is None:
+        raise KeyError(f"ne_id {ne_id} not found in {NE_RIVERS_FILE}")
+    return feature
 
 
 @time_debug("Load Overpass data")
@@ -768,82 +1244,78 @@ def _overpass_elements_to_feature(
     return {"type": "Feature", "properties": cleaned_properties, "geometry": geometry}
 
 
-@time_debug("Load GADM-like data")
-def load_gadm_like(
+def _locate_gadm(
     key: str,
     find_in_gadm: Optional[List[str]] = None,
     simplify_tolerance: Optional[float] = None,
-) -> Dict[str, Any]:
-    """Load GADM geometry by key like 'IND' or 'IND.31' or deeper.
+) -> Tuple[str, int, Optional[str]]:
+    """Find the GADM file holding a key.
+
+    Tries the key's own file first, then the provided or computed find_in_gadm
+    countries (for which at least one feature must match). Both the file found
+    and a failure to find any are remembered until clear_file_cache(), so
+    repeated lookups of disputed or missing keys do not rescan the fallbacks.
 
-    - If key has no dot: open gadm41_<ISO>_0.json and return its FeatureCollection
-      as a single unified geometry FeatureCollection (caller will union).
-    - If key has dots: level = number of dots, open gadm41_<ISO>_<level>.json and
-      filter features whose GID_<level> startswith the prefix (without any trailing underscore).
-    Returns a FeatureCollection containing matching features.
-    
-    Args:
-        key: GADM key (e.g., "IND", "IND.31", "IND.31.1")
-        find_in_gadm: Optional list of country codes to search in if key is not found in its own file
-        simplify_tolerance: Optional simplification tolerance; if None, uses active map/session setting
-        
     Returns:
-        GeoJSON FeatureCollection
-        
+        Tuple of (file path, level, prefix), prefix being None for level 0 keys
+
     Raises:
         ValueError: If key format is invalid
-        FileNotFoundError: If GADM file doesn't exist
+        FileNotFoundError: If no GADM file holds the key
     """
     if not key or len(key) < 3:
         raise ValueError("Invalid GADM key")
+    cache_key = (
+        key,
+        tuple(find_in_gadm) if find_in_gadm is not None else None,
+        _resolve_simplify_tolerance(simplify_tolerance),
+    )
+    location = _gadm_location_cache.get(cache_key)
+    if isinstance(location, str):
+        raise FileNotFoundError(location)
+    if location is None:
+        try:
+            location = _find_gadm(key, find_in_gadm, simplify_tolerance)
+        except FileNotFoundError as e:
+            _gadm_location_cache[cache_key] = str(e)
+            raise
+        _gadm_location_cache[cache_key] = location
+    return location
+
+
+def _find_gadm(
+    key: str,
+    find_in_gadm: Optional[List[str]],
+    simplify_tolerance: Optional[float],
+) -> Tuple[str, int, Optional[str]]:
+    """Uncached _locate_gadm."""
     parts = key.split('.')
     iso3 = parts[0]
     level = 0 if len(parts) == 1 else len(parts) - 1
-    
-    # Try to load from the key's own file first
+    prefix = None if level == 0 else '.'.join(parts[:level+1])
+
+    # Try the key's own file first
     path = _get_gadm_file_path(iso3, level, simplify_tolerance=simplify_tolerance)
-    if os.path.exists(path):
-        fc = _read_json(path)
-        if fc.get("type") != "FeatureCollection":
-            raise ValueError(f"Expected FeatureCollection in {path}")
-        if level == 0:
-            return fc
-        prefix = '.'.join(parts[:level+1])
-        gid_key = f"GID_{level}"
-        features = []
-        for feat in fc.get("features", []):
-            props = feat.get("properties", {}) or {}
-            gid = str(props.get(gid_key, ""))
-            # Use exact prefix matching with boundary check
-            if gid.startswith(prefix) and (len(gid) == len(prefix) or gid[len(prefix)] in ['.', '_']):
-                features.append(feat)
-        return {"type": "FeatureCollection", "features": features}
-    
+    if _gadm_source_exists(path):
+        # Surface malformed files (ValueError) for the key's own file
+        _gadm_positions(path, level, prefix)
+        return path, level, prefix
+
     # If not found, search in provided or computed find_in_gadm
     if find_in_gadm is None:
         find_in_gadm = _compute_find_in_gadm_default(key)
     if find_in_gadm:
         for country_code in find_in_gadm:
             search_path = _get_gadm_file_path(country_code, level, simplify_tolerance=simplify_tolerance)
-            if os.path.exists(search_path):
-                fc = _read_json(search_path)
-                if fc.get("type") != "FeatureCollection":
+            if _gadm_source_exists(search_path):
+                try:
+                    _, positions = _gadm_positions(search_path, level, prefix)
+                except ValueError:
                     continue
-                if level == 0:
-                    # For level 0, return all features from the country file
-                    return fc
-                prefix = '.'.join(parts[:level+1])
-                gid_key = f"GID_{level}"
-                features = []
-                for feat in fc.get("features", []):
-                    props = feat.get("properties", {}) or {}
-                    gid = str(props.get(gid_key, ""))
-                    # Use exact prefix matching with boundary check
-                    if gid.startswith(prefix) and (len(gid) == len(prefix) or gid[len(prefix)] in ['.', '_']):
-                        features.append(feat)
-                if features:  # If we found features, return them
-                    return {"type": "FeatureCollection", "features": features}
-    
+                # For level 0, use all features from the country file
+                if level == 0 or positions:
+                    return search_path, level, prefix
+
     # If still not found, raise the original error
     resolved_tol = _resolve_simplify_tolerance(simplify_tolerance)
     if resolved_tol is not None:
@@ -855,11 +1327,197 @@ def load_gadm_like(
     raise FileNotFoundError(f"GADM file not found: {path}")
 
 
+def _file_fingerprint(path: str) -> str:
+    """Cheap version token for a data file: size and mtime, or "-" if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "-"
+    return f"{st.st_size:x}.{st.st_mtime_ns:x}"
+
+
+def _gadm_file_fingerprint(path: str) -> str:
+    """Version token for a GADM file: its GeoJSON, or its columnar store when only that is installed."""
+    if os.path.exists(path):
+        return _file_fingerprint(path)
+    from .gadm_store import get_store_path
+    # meta.json is rewritten whenever the store is rebuilt.
+    return "store:" + _file_fingerprint(os.path.join(get_store_path(path), "meta.json"))
+
+
+def gadm_source_fingerprint(
+    key: str,
+    find_in_gadm: Optional[List[str]] = None,
+    simplify_tolerance: Optional[float] = None,
+) -> str:
+    """Version token for the GADM files a key is loaded from.
+
+    Built from the size and mtime of the key's own file under the resolved
+    simplification tolerance and, when that file is missing, of each fallback
+    country file. A file installed only as a columnar store (see gadm_store)
+    counts as present and is versioned by its store, as when loading. Rewriting those files (xatra-install-data,
+    xatra-simplify-data) changes the token, while updates to unrelated files
+    leave it alone. Tokens are memoized until clear_file_cache().
+
+    Args:
+        key: GADM key (e.g. "IND.31")
+        find_in_gadm: Optional fallback country codes, as for load_gadm_like
+        simplify_tolerance: Optional simplification tolerance
+
+    Returns:
+        Fingerprint string
+    """
+    cache_key = (
+        key,
+        tuple(find_in_gadm) if find_in_gadm is not None else None,
+        simplify_tolerance,
+        get_active_simplification_tolerance(),
+    )
+    fingerprint = _source_fingerprint_cache.get(cache_key)
+    if fingerprint is not None:
+        return fingerprint
+    parts = key.split('.')
+    level = 0 if len(parts) == 1 else len(parts) - 1
+    path = _get_gadm_file_path(parts[0], level, simplify_tolerance=simplify_tolerance)
+    paths = [path]
+    if not _gadm_source_exists(path):
+        countries = find_in_gadm if find_in_gadm is not None else (_compute_find_in_gadm_default(key) or [])
+        paths.extend(_get_gadm_file_path(c, level, simplify_tolerance=simplify_tolerance) for c in countries)
+    fingerprint = ";".join(_gadm_file_fingerprint(p) for p in paths)
+    _source_fingerprint_cache[cache_key] = fingerprint
+    return fingerprint
+
+
+def naturalearth_source_fingerprint() -> str:
+    """Version token for the Natural Earth rivers file (see gadm_source_fingerprint)."""
+    return _file_fingerprint(NE_RIVERS_FILE)
+
+
+@time_debug("Load GADM-like data")
+def load_gadm_like(
+    key: str,
+    find_in_gadm: Optional[List[str]] = None,
+    simplify_tolerance: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Load GADM geometry by key like 'IND' or 'IND.31' or deeper.
+
+    - If key has no dot: open gadm41_<ISO>_0.json and return its FeatureCollection
+      as a single unified geometry FeatureCollection (caller will union).
+    - If key has dots: level = number of dots, open gadm41_<ISO>_<level>.json and
+      filter features whose GID_<level> startswith the prefix (without any trailing underscore).
+    Returns a FeatureCollection containing matching features.
+    
+    Args:
+        key: GADM key (e.g., "IND", "IND.31", "IND.31.1")
+        find_in_gadm: Optional list of country codes to search in if key is not found in its own file
+        simplify_tolerance: Optional simplification tolerance; if None, uses active map/session setting
+        
+    Returns:
+        GeoJSON FeatureCollection
+        
+    Raises:
+        ValueError: If key format is invalid
+        FileNotFoundError: If GADM file doesn't exist
+    """
+    path, level, prefix = _locate_gadm(key, find_in_gadm, simplify_tolerance)
+    return {"type": "FeatureCollection", "features": _load_gadm_features(path, level, prefix)}
+
+
+@time_debug("Load GADM geometry")
+def load_gadm_geometry(
+    key: str,
+    find_in_gadm: Optional[List[str]] = None,
+    simplify_tolerance: Optional[float] = None,
+):
+    """Load GADM geometry by key as a single (unioned) Shapely geometry.
+
+    Same lookup rules as load_gadm_like, but skips the GeoJSON dict round-trip:
+    leaf geometries are cached as WKB per file (i.e. per country, level and
+    tolerance) and key.
+
+    Args:
+        key: GADM key (e.g., "IND", "IND.31", "IND.31.1")
+        find_in_gadm: Optional list of country codes to search in if key is not found in its own file
+        simplify_tolerance: Optional simplification tolerance; if None, uses active map/session setting
+
+    Returns:
+        Shapely geometry, or None if no matching feature has a geometry
+
+    Raises:
+        ValueError: If key format is invalid
+        FileNotFoundError: If GADM file doesn't exist
+    """
+    path, level, prefix = _locate_gadm(key, find_in_gadm, simplify_tolerance)
+    return _load_gadm_geometry(path, level, prefix)
+
+
+@time_debug("Load GADM geometries (bulk)")
+def load_gadm_geometries(
+    requests: List[Tuple[str, Optional[List[str]], Optional[float]]],
+) -> Dict[int, Any]:
+    """Bulk version of load_gadm_geometry.
+
+    Requests are grouped by source file; each file is loaded once and all
+    features needed by its requests are materialized in a single pass
+    (one vectorized ragged-array read with a columnar store).
+
+    Args:
+        requests: List of (key, find_in_gadm, simplify_tolerance) tuples
+
+    Returns:
+        Mapping from request index to Shapely geometry (or None when no
+        matching feature has a geometry). Requests that cannot be resolved
+        (invalid key, missing file) are left out so callers can surface the
+        error through the regular single-key path.
+    """
+    import shapely
+    from shapely.geometry import shape
+
+    results: Dict[int, Any] = {}
+    by_path: Dict[Tuple[str, int], List[Tuple[int, Optional[str]]]] = {}
+    for i, (key, find_in_gadm, simplify_tolerance) in enumerate(requests):
+        try:
+            path, level, prefix = _locate_gadm(key, find_in_gadm, simplify_tolerance)
+        except (ValueError, FileNotFoundError):
+            continue
+        cache_key = f"gadm-wkb:{path}#{prefix or '*'}"
+        wkb = _file_cache.lookup(cache_key)
+        if wkb is not _MISSING:
+            results[i] = shapely.from_wkb(wkb) if wkb else None
+            continue
+        by_path.setdefault((path, level), []).append((i, prefix))
+
+    for (path, level), items in by_path.items():
+        source = None
+        selections: Dict[Optional[str], List[int]] = {}
+        for _, prefix in items:
+            if prefix not in selections:
+                source, selections[prefix] = _gadm_positions(path, level, prefix)
+        needed = sorted({pos for positions in selections.values() for pos in positions})
+        if isinstance(source, dict):
+            features = source.get("features", [])
+            built = [shape(features[pos]["geometry"]) if features[pos].get("geometry") else None for pos in needed]
+        else:
+            built = list(source.geometries(needed))
+        by_position = dict(zip(needed, built))
+
+        unions: Dict[Optional[str], Any] = {}
+        for prefix, positions in selections.items():
+            geoms = [by_position[pos] for pos in positions if by_position[pos] is not None]
+            geometry = shapely.union_all(geoms) if geoms else None
+            _file_cache[f"gadm-wkb:{path}#{prefix or '*'}"] = shapely.to_wkb(geometry) if geometry is not None else b""
+            unions[prefix] = geometry
+        for i, prefix in items:
+            results[i] = unions[prefix]
+    return results
+
+
 @time_debug("Load Natural Earth-like data")
 def load_naturalearth_like(ne_id: str) -> Dict[str, Any]:
     """Load Natural Earth feature as GeoJSON Feature.
     
-    For compatibility with Territory.from_naturalearth, return Feature.
+    For compatibility with Territory.from_naturalearth, return Feature. The
+    feature is found through the persisted ne_id index (see naturalearth).
     
     Args:
         ne_id: Natural Earth feature ID
@@ -13,14 +13,47 @@ creates stable periods where the territory remains constant.
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from shapely.geometry import shape, mapping, Polygon, MultiPolygon, GeometryCollection
 from shapely.ops import unary_union
 
 from .debug_utils import time_debug
+from .geometry_cache import get_global_cache
+from .loaders import get_active_simplification_tolerance, simplification_tolerance
+from .settings import PAXMAX_THREADS
 from .territory import Territory
 
+# Worker threads labels are aggregated on (see set_paxmax_threads)
+_paxmax_threads = PAXMAX_THREADS
+
+
+def set_paxmax_threads(threads: int) -> None:
+    """Set the number of threads paxmax_aggregate spreads flag labels over.
+
+    Labels are aggregated independently (their unions, centroids and
+    metadata), so they can run concurrently; GEOS releases the GIL while it
+    works. Results are merged in label order, so the output does not depend
+    on the thread count. This overrides the XATRA_PAXMAX_THREADS environment
+    variable.
+
+    Args:
+        threads: Worker thread count; 0 or 1 aggregates serially
+
+    Raises:
+        ValueError: If threads is negative
+    """
+    global _paxmax_threads
+    if threads < 0:
+        raise ValueError("threads must be non-negative")
+    _paxmax_threads = int(threads)
+
+
+def get_paxmax_threads() -> int:
+    """Get the number of threads paxmax_aggregate spreads flag labels over."""
+    return _paxmax_threads
+
 
 @time_debug("Shapely shape conversion")
 def _shape_wrapper(geojson_geometry):
@@ -181,8 +214,550 @@ def _polygonal_only(geom):
     return MultiPolygon(parts)
 
 
+def geometry_id(geom_dict: Dict[str, Any]) -> str:
+    """Content-derived id of a GeoJSON geometry: the md5 of its canonical JSON.
+    
+    Shared by the paxmax geometry library and Map._export_json's
+    register_geometry, so a shape produced several times (by different
+    active sets, or by a flag and another object) is stored once under one id.
+    
+    Args:
+        geom_dict: GeoJSON geometry dictionary
+        
+    Returns:
+        Hex digest string
+    """
+    import hashlib
+    try:
+        import orjson
+        # orjson is MUCH faster than standard json for hashing
+        geom_str = orjson.dumps(geom_dict, option=orjson.OPT_SORT_KEYS)
+    except ImportError:
+        import json
+        geom_str = json.dumps(geom_dict, sort_keys=True).encode('utf-8')
+    return hashlib.md5(geom_str).hexdigest()
+
+
+def _register_geometry(geometry_library: Dict[str, Any], geom_dict: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Add a geometry to the library under its content id; None for empty geometries."""
+    if not geom_dict:
+        return None
+    geom_id = geometry_id(geom_dict)
+    geometry_library.setdefault(geom_id, geom_dict)
+    return geom_id
+
+
+def _union_pair(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a.union(b)
+
+
+class _UnionTree:
+    """Incrementally maintained union of a label's active items.
+
+    A segment tree over the label's items in declaration order, each internal
+    node holding the union of the active items below it. Toggling an item
+    only marks its ancestors dirty; total() then recomputes just the dirty
+    nodes, i.e. O(log n) unions per changed item instead of one union over
+    the whole active set. While items are only added, the total is the
+    previous total unioned with the new pieces and the tree is left dirty
+    until a removal needs it.
+    """
+
+    def __init__(self, size: int, piece: Callable[[int], Any]):
+        self._piece = piece
+        self._pieces: Dict[int, Any] = {}
+        self._size = 2
+        while self._size < size:
+            self._size *= 2
+        self._active = [False] * self._size
+        self._nodes: List[Any] = [None] * self._size
+        self._dirty: set = set()
+        self._total: Any = None
+        self._total_valid = True
+        self._added: List[int] = []
+
+    def _leaf(self, index: int) -> Any:
+        if not self._active[index]:
+            return None
+        if index not in self._pieces:
+            self._pieces[index] = self._piece(index)
+        return self._pieces[index]
+
+    def set_active(self, index: int, active: bool) -> None:
+        self._active[index] = active
+        node = (self._size + index) // 2
+        while node and node not in self._dirty:
+            self._dirty.add(node)
+            node //= 2
+        if active and self._total_valid:
+            self._added.append(index)
+        else:
+            self._total_valid = False
+            self._added.clear()
+
+    def set_total(self, geometry: Any) -> None:
+        """Record the union of the current active set, obtained elsewhere."""
+        self._total = geometry
+        self._total_valid = True
+        self._added.clear()
+
+    def load_pieces(self) -> None:
+        """Fetch the item geometries the next total() needs, so it only unions."""
+        if self._total_valid:
+            indices = self._added
+        else:
+            # Leaves whose parent is dirty; clean subtrees keep their unions.
+            indices = [
+                child - self._size
+                for node in self._dirty
+                for child in (2 * node, 2 * node + 1)
+                if child >= self._size
+            ]
+        for index in indices:
+            self._leaf(index)
+
+    def total(self) -> Any:
+        """Union of the active items (None if none has a geometry)."""
+        if self._total_valid:
+            if self._added:
+                pieces = [g for g in (self._leaf(i) for i in self._added) if g is not None]
+                if pieces:
+                    self._total = unary_union([self._total, *pieces] if self._total is not None else pieces)
+                self._added.clear()
+            return self._total
+
+        def value(node: int) -> Any:
+            return self._leaf(node - self._size) if node >= self._size else self._nodes[node]
+
+        # Children have larger indices than their parents.
+        for node in sorted(self._dirty, reverse=True):
+            self._nodes[node] = _union_pair(value(2 * node), value(2 * node + 1))
+        self._dirty.clear()
+        self.set_total(self._nodes[1])
+        return self._total
+
+
+def _label_union_tree(items: List[Dict[str, Any]]) -> Optional[_UnionTree]:
+    """Union tree over a label's items, or None for labels mixing territories and geometries."""
+    if all(isinstance(it.get("territory"), Territory) for it in items):
+        return _UnionTree(len(items), lambda i: items[i]["territory"].to_geometry())
+    if all(not isinstance(it.get("territory"), Territory) and it.get("geometry") is not None for it in items):
+        return _UnionTree(len(items), lambda i: _to_shape(items[i]["geometry"]))
+    return None
+
+
+def _union_from_tree(union_territory: Territory, tree: _UnionTree) -> None:
+    """Evaluate a union territory from its label's union tree, unless already cached."""
+    cache = get_global_cache()
+    cache_strrepr = union_territory._cache_strrepr()
+    geometry = cache.get(cache_strrepr)
+    if geometry is None:
+        # Item geometries come from their own cache entries; fetch them before
+        # holding this key's computation slot (and, in shared mode, its lock).
+        tree.load_pieces()
+        geometry = cache.compute_and_put(cache_strrepr, tree.total)
+    else:
+        tree.set_total(geometry)
+    union_territory._set_memo(geometry)
+
+
+@time_debug("Dynamic flag payload")
+def _dynamic_flag_payload(
+    label: str,
+    active: List[Dict[str, Any]],
+    geometry_library: Dict[str, Any],
+    union_tree: Optional[_UnionTree] = None,
+) -> Dict[str, Any]:
+    """Build the snapshot entry of a label for a set of active items.
+    
+    Args:
+        label: Flag label
+        active: Active items of the label, in declaration order
+        geometry_library: Geometry registry of the aggregation; the union
+            geometry is added to it
+        union_tree: Optional union tree of the label whose active items are
+            ``active``, used to compute the union incrementally
+        
+    Returns:
+        Flag payload dictionary
+    """
+    notes = [it.get("note") for it in active if it.get("note")]
+
+    # Check if we have territories or geometries
+    territories = [a.get("territory") for a in active if isinstance(a.get("territory"), Territory)]
+    geometries = [a.get("geometry") for a in active if a.get("geometry") is not None]
+    
+    if territories:
+        # Use territory union (more efficient with caching)
+        union_territory = Territory.union_territories(territories)
+        if union_tree is not None and len(territories) > 1 and not union_territory._memoized_ready:
+            _union_from_tree(union_territory, union_tree)
+        geom_dict = union_territory.to_geojson_dict()
+        centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
+    elif geometries:
+        # Fallback to geometry union (legacy support)
+        if union_tree is not None:
+            geom = union_tree.total()
+        else:
+            geoms = [_to_shape(geom) for geom in geometries]
+            geom = _unary_union_wrapper([g for g in geoms if g is not None]) if geoms else None
+        geom = _polygonal_only(geom)
+        geom_dict = mapping(geom) if geom is not None else None
+        centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
+    else:
+        geom_dict = None
+        centroid = None
+
+    geom_id = _register_geometry(geometry_library, geom_dict)
+
+    # Collect all unique classes from active items
+    all_classes = []
+    for it in active:
+        classes = it.get("classes")
+        if isinstance(classes, str) and classes:
+            all_classes.extend(classes.split())
+    unique_classes = " ".join(sorted(set(all_classes))) if all_classes else None
+    
+    # Preserve color and hierarchy metadata from the first active item.
+    # Display label intentionally uses last declared active item for this label.
+    return {
+        "label": label,
+        "display_label": active[-1].get("display_label") or label,
+        "geom_id": geom_id,
+        "centroid": centroid,
+        "note": "; ".join(notes) or None,
+        "color": active[0].get("color"),
+        "classes": unique_classes,
+        "parent": active[0].get("parent"),
+        "type": active[0].get("type"),
+        "root_parent": active[0].get("root_parent"),
+        "root_parent_color": active[0].get("root_parent_color"),
+        "vassal_depth": active[0].get("vassal_depth", 0),
+    }
+
+
+# Flag payload fields that are stored per state rather than per label
+_STATE_FIELDS = ("geom_id", "centroid")
+
+
+class _SnapshotEncoder:
+    """Delta-encodes the per-breakpoint flag lists of a dynamic map.
+
+    Produces ``flag_labels`` (one metadata dict per label, in declaration
+    order, taken from its first state), ``flag_states`` (each distinct label
+    payload once: its ``label_index``, geom_id, centroid and any field that
+    differs from the label's metadata) and ``snapshots``, where each snapshot
+    lists only the states ``set`` and the label indices ``unset`` since the
+    previous one (empty lists omitted). See expand_snapshots() for decoding.
+    """
+
+    def __init__(self, labels: List[str]):
+        self._label_index = {label: i for i, label in enumerate(labels)}
+        self.flag_labels: List[Dict[str, Any]] = [{"label": label} for label in labels]
+        self._has_meta = [False] * len(labels)
+        self.flag_states: List[Dict[str, Any]] = []
+        # id(payload) -> state index; payloads are kept alive in _payloads
+        self._state_ids: Dict[int, int] = {}
+        self._payloads: List[Dict[str, Any]] = []
+        self._current: Dict[int, int] = {}
+        self.snapshots: List[Dict[str, Any]] = []
+
+    def _state(self, label_index: int, payload: Dict[str, Any]) -> int:
+        state_id = self._state_ids.get(id(payload))
+        if state_id is not None:
+            return state_id
+        meta = self.flag_labels[label_index]
+        if not self._has_meta[label_index]:
+            meta.update((k, v) for k, v in payload.items() if k not in _STATE_FIELDS)
+            self._has_meta[label_index] = True
+        state = {"label_index": label_index}
+        state.update((k, payload.get(k)) for k in _STATE_FIELDS)
+        state.update(
+            (k, v) for k, v in payload.items()
+            if k not in _STATE_FIELDS and (k not in meta or meta[k] != v)
+        )
+        state_id = len(self.flag_states)
+        self.flag_states.append(state)
+        self._state_ids[id(payload)] = state_id
+        self._payloads.append(payload)
+        return state_id
+
+    def add(self, year: int, changes: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """Record a snapshot given the new payload (None = inactive) of each changed label."""
+        set_states: List[int] = []
+        unset: List[int] = []
+        for label, payload in changes.items():
+            label_index = self._label_index[label]
+            if payload is None:
+                if self._current.pop(label_index, None) is not None:
+                    unset.append(label_index)
+                continue
+            state_id = self._state(label_index, payload)
+            if self._current.get(label_index) != state_id:
+                self._current[label_index] = state_id
+                set_states.append(state_id)
+        snapshot: Dict[str, Any] = {"year": year}
+        if set_states:
+            snapshot["set"] = set_states
+        if unset:
+            snapshot["unset"] = unset
+        self.snapshots.append(snapshot)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "flag_labels": self.flag_labels,
+            "flag_states": self.flag_states,
+            "snapshots": self.snapshots,
+        }
+
+
+def delta_encode_snapshots(
+    snapshots: List[Dict[str, Any]],
+    labels: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Delta-encode full dynamic snapshots.
+    
+    Args:
+        snapshots: List of {"year", "flags"} dicts, each listing every active
+            label's flag payload
+        labels: Label order used when decoding (defaults to order of first
+            appearance)
+        
+    Returns:
+        Dictionary with "flag_labels", "flag_states" and "snapshots" in the
+        dynamic payload format of paxmax_aggregate
+    """
+    if labels is None:
+        labels = list(dict.fromkeys(f["label"] for s in snapshots for f in s.get("flags", [])))
+    encoder = _SnapshotEncoder(labels)
+    previous: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        flags = {f["label"]: f for f in snapshot.get("flags", [])}
+        changes: Dict[str, Optional[Dict[str, Any]]] = {label: None for label in previous if label not in flags}
+        changes.update(flags)
+        encoder.add(snapshot["year"], changes)
+        previous = flags
+    return encoder.result()
+
+
+def expand_snapshots(pax: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Decode the delta-encoded snapshots of a dynamic paxmax payload.
+    
+    Args:
+        pax: Dynamic payload with "flag_labels", "flag_states" and "snapshots"
+        
+    Returns:
+        List of {"year", "flags"} dicts, each listing the full flag payload of
+        every active label in label declaration order
+    """
+    labels = pax.get("flag_labels", [])
+    flags = []
+    for state in pax.get("flag_states", []):
+        flag = dict(labels[state["label_index"]])
+        flag.update((k, v) for k, v in state.items() if k != "label_index")
+        flags.append(flag)
+    current: Dict[int, int] = {}
+    expanded = []
+    for snapshot in pax.get("snapshots", []):
+        for label_index in snapshot.get("unset", []):
+            current.pop(label_index, None)
+        for state_id in snapshot.get("set", []):
+            current[pax["flag_states"][state_id]["label_index"]] = state_id
+        expanded.append({"year": snapshot["year"], "flags": [flags[current[i]] for i in sorted(current)]})
+    return expanded
+
+
+@time_debug("Static flag payload")
+def _static_flag_payload(label: str, items: List[Dict[str, Any]], geometry_library: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the static-map entry of a label: the union of all its items.
+    
+    Args:
+        label: Flag label
+        items: Items of the label, in declaration order
+        geometry_library: Geometry registry the union geometry is added to
+        
+    Returns:
+        Flag payload dictionary
+    """
+    # Check if we have territories or geometries
+    territories = [it.get("territory") for it in items if isinstance(it.get("territory"), Territory)]
+    geometries = [it.get("geometry") for it in items if it.get("geometry") is not None]
+
+    if territories:
+        # Use territory union (more efficient with caching)
+        union_territory = Territory.union_territories(territories)
+        geom = union_territory.to_geometry()
+        geom = _polygonal_only(geom)
+        geom_dict = mapping(geom) if geom is not None else None
+        centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
+    elif geometries:
+        # Fallback to geometry union (legacy support)
+        geoms = [_to_shape(geom) for geom in geometries]
+        geom = _unary_union_wrapper([g for g in geoms if g is not None]) if geoms else None
+        geom = _polygonal_only(geom)
+        geom_dict = _mapping_wrapper(geom) if geom is not None else None
+        centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
+    else:
+        geom_dict = None
+        centroid = None
+
+    geom_id = _register_geometry(geometry_library, geom_dict)
+
+    # Preserve color from the first item (they should all have the same color for the same label)
+    color = items[0].get("color") if items else None
+    # Collect all unique classes from items with the same label
+    all_classes = []
+    for it in items:
+        classes = it.get("classes")
+        if isinstance(classes, str) and classes:
+            all_classes.extend(classes.split())
+    unique_classes = " ".join(sorted(set(all_classes))) if all_classes else None
+
+    # Preserve hierarchy metadata from the first item.
+    # Display label intentionally uses last declared item for this label.
+    parent = items[0].get("parent") if items else None
+    type_ = items[0].get("type") if items else None
+    root_parent = items[0].get("root_parent") if items else None
+    root_parent_color = items[0].get("root_parent_color") if items else None
+    display_label = (items[-1].get("display_label") or label) if items else label
+    vassal_depth = items[0].get("vassal_depth", 0) if items else 0
+
+    return {
+        "label": label,
+        "display_label": display_label,
+        "geom_id": geom_id,
+        "centroid": centroid,
+        "note": "; ".join([str(it.get("note")) for it in items if it.get("note")]) or None,
+        "color": color,
+        "classes": unique_classes,
+        "parent": parent,
+        "type": type_,
+        "root_parent": root_parent,
+        "root_parent_color": root_parent_color,
+        "vassal_depth": vassal_depth,
+    }
+
+
+def _sweep_label(
+    label: str,
+    items: List[Dict[str, Any]],
+    breakpoints: List[int],
+    position: Dict[int, int],
+    restarts: List[int],
+    geometry_library: Dict[str, Any],
+) -> List[Tuple[int, Optional[Dict[str, Any]]]]:
+    """Sweep one label's item periods over the breakpoints.
+    
+    The label's start/end events are sorted once and its active item set is
+    maintained incrementally; it is only visited at the first breakpoint, at
+    restarts (breakpoints going backwards) and at the years of its own events.
+    
+    Args:
+        label: Flag label
+        items: Items of the label, in declaration order
+        breakpoints: Breakpoint years of the map
+        position: Index of each breakpoint year in breakpoints
+        restarts: Indices where breakpoints go backwards
+        geometry_library: Geometry registry union geometries are added to
+        
+    Returns:
+        (breakpoint index, payload) for each breakpoint at which the label's
+        flag may have changed; payload is None while no item is active
+    """
+    # (year, kind, item index); starts (kind 0) sort before ends (kind 1) of
+    # the same year, as an item is active at its start year but not at its
+    # end year.
+    events: List[Tuple[int, int, int]] = []
+    always_active: List[int] = []
+    for idx, it in enumerate(items):
+        per = it.get("period")
+        if per is None:
+            always_active.append(idx)
+            continue
+        start, end = int(per[0]), int(per[1])
+        if start < end:
+            events.append((start, 0, idx))
+            events.append((end, 1, idx))
+    events.sort()
+
+    # Local cache to avoid redundant processing of the same active set, e.g.
+    # when the label returns to an earlier one.
+    processed_cache: Dict[Tuple[int, ...], Dict[str, Any]] = {}
+    changes: List[Tuple[int, Optional[Dict[str, Any]]]] = []
+    active: set = set()
+    tree: Optional[_UnionTree] = None
+    next_event = 0
+    previous_year: Optional[int] = None
+    for i in sorted({0, *restarts, *(position[event[0]] for event in events)}):
+        year = breakpoints[i]
+        changed = previous_year is None or year < previous_year
+        if changed:
+            # (Re)start the sweep; only needed again if breakpoints go backwards.
+            active = set(always_active)
+            tree = _label_union_tree(items)
+            if tree is not None:
+                for idx in always_active:
+                    tree.set_active(idx, True)
+            next_event = 0
+        previous_year = year
+
+        while next_event < len(events) and events[next_event][0] <= year:
+            _, kind, idx = events[next_event]
+            if kind == 0:
+                active.add(idx)
+            else:
+                active.discard(idx)
+            if tree is not None:
+                tree.set_active(idx, kind == 0)
+            changed = True
+            next_event += 1
+        if not changed:
+            continue
+
+        active_indices = tuple(sorted(active))
+        payload = None
+        if active_indices:
+            payload = processed_cache.get(active_indices)
+            if payload is None:
+                payload = _dynamic_flag_payload(
+                    label, [items[j] for j in active_indices], geometry_library, tree
+                )
+                processed_cache[active_indices] = payload
+        changes.append((i, payload))
+    return changes
+
+
+def _map_labels(fn: Callable[..., Any], labels: List[str], workers: int) -> List[Any]:
+    """fn(label, geometry_library) for each label, on up to `workers` threads.
+    
+    Returns:
+        List of (result, geometry_library) pairs in label order
+    """
+    # Pool threads use this thread's simplification tolerance, which may be
+    # a thread-local override.
+    tolerance = get_active_simplification_tolerance()
+
+    def run(label: str) -> Tuple[Any, Dict[str, Any]]:
+        library: Dict[str, Any] = {}
+        with simplification_tolerance(tolerance):
+            return fn(label, library), library
+
+    if workers <= 1 or len(labels) <= 1:
+        return [run(label) for label in labels]
+    with ThreadPoolExecutor(max_workers=min(workers, len(labels)), thread_name_prefix="xatra-paxmax") as pool:
+        return list(pool.map(run, labels))
+
+
 @time_debug("Paxmax aggregation")
-def paxmax_aggregate(flags_serialized: List[Dict[str, Any]], earliest_start: Optional[int] = None) -> Dict[str, Any]:
+def paxmax_aggregate(
+    flags_serialized: List[Dict[str, Any]],
+    earliest_start: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
     """Aggregate flags using the pax-max method for dynamic maps.
     
     The pax-max method groups flags with the same label over time and creates
@@ -196,89 +771,58 @@ def paxmax_aggregate(flags_serialized: List[Dict[str, Any]], earliest_start: Opt
     and end years of every flag with a particular label), and create unions for the 
     flags active at each breakpoint year (a flag is considered active at its start year 
     but not its end year)
+
+    Dynamic snapshots are delta-encoded (see _SnapshotEncoder): per-label
+    metadata and each distinct label state are stored once, and each
+    breakpoint lists only the states set and labels unset since the previous
+    one. expand_snapshots() decodes them into full per-year flag lists.
+
+    Labels are independent, so they can be aggregated on several threads;
+    their results are merged in label order and geometry ids are content
+    hashes, so the output is the same for any thread count.
     
     Args:
         flags_serialized: List of flag dictionaries with territory or geometry and period info
         earliest_start: Optional earliest start year to ensure initial snapshot
+        workers: Threads to aggregate labels on; defaults to set_paxmax_threads()
+            (XATRA_PAXMAX_THREADS), 0 or 1 is serial
         
     Returns:
-        Dictionary with mode ("static" or "dynamic"), flags, and snapshots
+        Dictionary with mode ("static" or "dynamic"), flags (static) or
+        breakpoints, flag_labels, flag_states and snapshots (dynamic), and
+        the geometry library
     """
+    if workers is None:
+        workers = _paxmax_threads
+
     # Group by label
     by_label: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
     for f in flags_serialized:
         by_label[f["label"]].append(f)
+    labels = list(by_label)
 
     # Determine if dynamic
     dynamic = any(f.get("period") is not None for f in flags_serialized)
 
+    # Load all GADM leaves up front, one pass per source file.
+    Territory.materialize_many(
+        f.get("territory") for f in flags_serialized if isinstance(f.get("territory"), Territory)
+    )
+
+    # Global geometry registry for this aggregation
+    geometry_library: Dict[str, Any] = {}
+
     if not dynamic:
         # Simple union per label.
         # Keep static mode geometry externalized too, so render payloads stay compact.
         out = []
-        geometry_library: Dict[str, Any] = {}
-        for label, items in by_label.items():
-            # Check if we have territories or geometries
-            territories = [it.get("territory") for it in items if isinstance(it.get("territory"), Territory)]
-            geometries = [it.get("geometry") for it in items if it.get("geometry") is not None]
-
-            if territories:
-                # Use territory union (more efficient with caching)
-                union_territory = Territory.union_territories(territories)
-                geom = union_territory.to_geometry()
-                geom = _polygonal_only(geom)
-                geom_dict = mapping(geom) if geom is not None else None
-                centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
-            elif geometries:
-                # Fallback to geometry union (legacy support)
-                geoms = [_to_shape(geom) for geom in geometries]
-                geom = _unary_union_wrapper([g for g in geoms if g is not None]) if geoms else None
-                geom = _polygonal_only(geom)
-                geom_dict = _mapping_wrapper(geom) if geom is not None else None
-                centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
-            else:
-                geom_dict = None
-                centroid = None
-
-            if geom_dict:
-                geom_id = f"g{len(geometry_library)}"
-                geometry_library[geom_id] = geom_dict
-            else:
-                geom_id = None
-
-            # Preserve color from the first item (they should all have the same color for the same label)
-            color = items[0].get("color") if items else None
-            # Collect all unique classes from items with the same label
-            all_classes = []
-            for it in items:
-                classes = it.get("classes")
-                if isinstance(classes, str) and classes:
-                    all_classes.extend(classes.split())
-            unique_classes = " ".join(sorted(set(all_classes))) if all_classes else None
-
-            # Preserve hierarchy metadata from the first item.
-            # Display label intentionally uses last declared item for this label.
-            parent = items[0].get("parent") if items else None
-            type_ = items[0].get("type") if items else None
-            root_parent = items[0].get("root_parent") if items else None
-            root_parent_color = items[0].get("root_parent_color") if items else None
-            display_label = (items[-1].get("display_label") or label) if items else label
-            vassal_depth = items[0].get("vassal_depth", 0) if items else 0
-
-            out.append({
-                "label": label,
-                "display_label": display_label,
-                "geom_id": geom_id,
-                "centroid": centroid,
-                "note": "; ".join([str(it.get("note")) for it in items if it.get("note")]) or None,
-                "color": color,
-                "classes": unique_classes,
-                "parent": parent,
-                "type": type_,
-                "root_parent": root_parent,
-                "root_parent_color": root_parent_color,
-                "vassal_depth": vassal_depth,
-            })
+        results = _map_labels(
+            lambda label, library: _static_flag_payload(label, by_label[label], library), labels, workers
+        )
+        for payload, library in results:
+            for geom_id, geom_dict in library.items():
+                geometry_library.setdefault(geom_id, geom_dict)
+            out.append(payload)
         return {"mode": "static", "flags": out, "geometry_library": geometry_library}
 
     # Dynamic: compute breakpoints and stable periods
@@ -294,127 +838,32 @@ def paxmax_aggregate(flags_serialized: List[Dict[str, Any]], earliest_start: Opt
     if earliest_start is not None and earliest_start not in breakpoints:
         breakpoints.insert(0, earliest_start)
 
-    # For each label and each breakpoint year, compute union of active geometries
-    snapshots: List[Dict[str, Any]] = []
-    
-    # Global geometry registry for this aggregation
-    geometry_library: Dict[str, Any] = {}
-    
-    # Local cache to avoid redundant processing of the same label/active-set
-    # within the same aggregation run.
-    processed_cache: Dict[tuple, Dict[str, Any]] = {}
-    
-    # Cache for geometry to dict mapping (for non-Territory items)
-    mapping_cache: Dict[int, Dict[str, Any]] = {}
-
-    for year in breakpoints:
-        snapshot_flags = []
-        for label, items in by_label.items():
-            active = []
-            active_indices: List[int] = []
-            notes = []
-            for idx, it in enumerate(items):
-                per = it.get("period")
-                if per is None:
-                    active.append(it)
-                    active_indices.append(idx)
-                    if it.get("note"):
-                        notes.append(it.get("note"))
-                else:
-                    start, end = int(per[0]), int(per[1])
-                    if year >= start and year < end:
-                        active.append(it)
-                        active_indices.append(idx)
-                        if it.get("note"):
-                            notes.append(it.get("note"))
-            if not active:
-                continue
-
-            # Cache by (label, active item indices). This avoids repeated string
-            # sorting/hashing for static labels across many breakpoint years.
-            cache_key = (label, tuple(active_indices))
-            cached_flag = processed_cache.get(cache_key)
-            if cached_flag is not None:
-                snapshot_flags.append(dict(cached_flag))
-                continue
-            else:
-                # Check if we have territories or geometries
-                territories = [a.get("territory") for a in active if isinstance(a.get("territory"), Territory)]
-                geometries = [a.get("geometry") for a in active if a.get("geometry") is not None]
-                
-                if territories:
-                    # Use territory union (more efficient with caching)
-                    union_territory = Territory.union_territories(territories)
-                    geom_dict = union_territory.to_geojson_dict()
-                    centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
-                elif geometries:
-                    # Fallback to geometry union (legacy support)
-                    geoms = [_to_shape(geom) for geom in geometries]
-                    geom = _unary_union_wrapper([g for g in geoms if g is not None]) if geoms else None
-                    geom = _polygonal_only(geom)
-                    
-                    # Cache the mapping conversion
-                    if geom is not None:
-                        gid = id(geom)
-                        if gid not in mapping_cache:
-                            mapping_cache[gid] = mapping(geom)
-                        geom_dict = mapping_cache[gid]
-                    else:
-                        geom_dict = None
-                        
-                    centroid = _compute_centroid_for_geometry(geom_dict) if geom_dict else None
-                else:
-                    geom_dict = None
-                    centroid = None
-
-                if geom_dict:
-                    # Geometry ids only need to be unique within this export payload.
-                    geom_id = f"g{len(geometry_library)}"
-                    geometry_library[geom_id] = geom_dict
-                else:
-                    geom_id = None
-
-            # Preserve color from the first active item
-            color = active[0].get("color") if active else None
-            # Collect all unique classes from active items
-            all_classes = []
-            for it in active:
-                classes = it.get("classes")
-                if isinstance(classes, str) and classes:
-                    all_classes.extend(classes.split())
-            unique_classes = " ".join(sorted(set(all_classes))) if all_classes else None
-            
-            # Preserve hierarchy metadata from the first active item.
-            # Display label intentionally uses last declared active item for this label.
-            parent = active[0].get("parent") if active else None
-            type_ = active[0].get("type") if active else None
-            root_parent = active[0].get("root_parent") if active else None
-            root_parent_color = active[0].get("root_parent_color") if active else None
-            display_label = (active[-1].get("display_label") or label) if active else label
-            vassal_depth = active[0].get("vassal_depth", 0) if active else 0
-            
-            flag_payload = {
-                "label": label,
-                "display_label": display_label,
-                "geom_id": geom_id,
-                "centroid": centroid,
-                "note": "; ".join(notes) or None,
-                "color": color,
-                "classes": unique_classes,
-                "parent": parent,
-                "type": type_,
-                "root_parent": root_parent,
-                "root_parent_color": root_parent_color,
-                "vassal_depth": vassal_depth,
-            }
-            processed_cache[cache_key] = flag_payload
-            snapshot_flags.append(dict(flag_payload))
-        snapshots.append({"year": year, "flags": snapshot_flags})
+    # Each label sweeps its own events over the breakpoints (see
+    # _sweep_label); the per-label changes are then merged, in label order,
+    # into the delta-encoded snapshots.
+    position = {year: i for i, year in enumerate(breakpoints)}
+    restarts = [i for i in range(1, len(breakpoints)) if breakpoints[i] < breakpoints[i - 1]]
+    results = _map_labels(
+        lambda label, library: _sweep_label(label, by_label[label], breakpoints, position, restarts, library),
+        labels,
+        workers,
+    )
+
+    changes_at: List[Dict[str, Optional[Dict[str, Any]]]] = [{} for _ in breakpoints]
+    for label, (changes, library) in zip(labels, results):
+        for geom_id, geom_dict in library.items():
+            geometry_library.setdefault(geom_id, geom_dict)
+        for i, payload in changes:
+            changes_at[i][label] = payload
+
+    encoder = _SnapshotEncoder(labels)
+    for year, changes in zip(breakpoints, changes_at):
+        encoder.add(year, changes)
 
     return {
         "mode": "dynamic",
         "breakpoints": breakpoints,
-        "snapshots": snapshots,
+        **encoder.result(),
         "geometry_library": geometry_library
     }
 
@@ -242,6 +242,48 @@ HTML_TEMPLATE = Template(
       const layerVisibility = new Map(); // Maps layer objects to their visibility state
       let allLayersCreated = false;
 
+      // Dynamic flags are delta-encoded: flag_labels holds per-label metadata,
+      // flag_states each distinct label state once, and each snapshot only the
+      // states it sets and the label indices it unsets. flagTimeline tracks the
+      // label index -> state index map as of snapshot flagTimeline.index.
+      const flagTimeline = { index: -1, current: new Map(), flags: null };
+
+      function flagStates() {
+        if (!flagTimeline.flags) {
+          const labels = payload.flags.flag_labels || [];
+          flagTimeline.flags = (payload.flags.flag_states || []).map(state => {
+            const flag = Object.assign({}, labels[state.label_index], state);
+            delete flag.label_index;
+            return flag;
+          });
+        }
+        return flagTimeline.flags;
+      }
+
+      function seekFlagTimeline(snapshotIndex) {
+        const snapshots = payload.flags.snapshots || [];
+        if (snapshotIndex < flagTimeline.index) {
+          flagTimeline.index = -1;
+          flagTimeline.current = new Map();
+        }
+        for (let k = flagTimeline.index + 1; k <= snapshotIndex && k < snapshots.length; k++) {
+          const s = snapshots[k];
+          for (const labelIndex of s.unset || []) flagTimeline.current.delete(labelIndex);
+          for (const stateIndex of s.set || []) {
+            flagTimeline.current.set(payload.flags.flag_states[stateIndex].label_index, stateIndex);
+          }
+        }
+        flagTimeline.index = snapshotIndex;
+      }
+
+      function snapshotFlags(snapshotIndex) {
+        seekFlagTimeline(snapshotIndex);
+        const flags = flagStates();
+        return Array.from(flagTimeline.current.entries())
+          .sort((a, b) => a[0] - b[0])
+          .map(entry => flags[entry[1]]);
+      }
+
       // Legacy function - no longer used, kept for compatibility
       function addGeoJSON(geojson, options, tooltip) {
         const layer = L.geoJSON(geojson, options);
@@ -1202,124 +1244,124 @@ HTML_TEMPLATE = Template(
         
         console.log("Creating all layers for dynamic map...");
         
-        // Create all flag layers from all snapshots
-        const snapshots = payload.flags.snapshots;
-        for (const snapshot of snapshots) {
-          for (const f of snapshot.flags) {
-            const geometry = resolveGeometry(f);
-            if (!geometry) continue;
-            
-            let className = (f.type === 'province') ? 'province' : 'flag';
-            if (f.type === 'vassal') className += ' vassal';
-            if (f.classes) className += ' ' + f.classes;
-            const flagStyle = { className: className };
-            if (f.type === 'province') {
-              const provinceBorderColor = darkenedLabelColor(f.root_parent_color || f.color || '#333', 0.12, 0.9);
-              flagStyle.style = {
-                fill: false,
-                stroke: true,
-                color: provinceBorderColor,
-                opacity: 0.8,
-                weight: 1.2,
-                lineJoin: 'round'
-              };
+        // Create one flag layer per distinct flag state
+        const states = flagStates();
+        for (let stateIndex = 0; stateIndex < states.length; stateIndex++) {
+          const f = states[stateIndex];
+          const labelIndex = payload.flags.flag_states[stateIndex].label_index;
+          const geometry = resolveGeometry(f);
+          if (!geometry) continue;
+          
+          let className = (f.type === 'province') ? 'province' : 'flag';
+          if (f.type === 'vassal') className += ' vassal';
+          if (f.classes) className += ' ' + f.classes;
+          const flagStyle = { className: className };
+          if (f.type === 'province') {
+            const provinceBorderColor = darkenedLabelColor(f.root_parent_color || f.color || '#333', 0.12, 0.9);
+            flagStyle.style = {
+              fill: false,
+              stroke: true,
+              color: provinceBorderColor,
+              opacity: 0.8,
+              weight: 1.2,
+              lineJoin: 'round'
+            };
+          } else if (f.color) {
+            flagStyle.style = {
+              fillColor: f.color,
+              fillOpacity: 0.4,
+              color: f.color,
+              weight: 1
+            };
+          }
+          
+          // Build tooltip with optional parent/vassal info
+          let flagTooltip = f.display_label || f.label;
+          if (f.parent) {
+            const relation = f.type || 'vassal';
+            const parentLabel = f.parent.includes('/') ? f.parent.split('/').slice(-1)[0] : f.parent;
+            flagTooltip += ` (${relation} of ${parentLabel})`;
+          }
+          if (f.note) {
+            flagTooltip += ' — ' + f.note;
+          }
+          
+          const layer = L.geoJSON(geometry, {
+            ...flagStyle,
+            onEachFeature: function(feature, subLayer) {
+              // Register with multi-tooltip system
+              registerLayerTooltip(subLayer, 'Flag', flagTooltip);
+              subLayer.on('click', function() {
+                if (!window.parent) return;
+                window.parent.postMessage({
+                  type: 'mapFeaturePick',
+                  featureType: 'territory',
+                  name: f.label || ''
+                }, '*');
+              });
+            }
+          });
+          
+          if (f.type === 'province') {
+            const provinceBorderColor = darkenedLabelColor(f.root_parent_color || f.color || '#333', 0.12, 0.9);
+            layer.setStyle({
+              fill: false,
+              stroke: true,
+              color: provinceBorderColor,
+              opacity: 0.8,
+              weight: 1.2,
+              lineJoin: 'round'
+            });
+          } else if (f.color) {
+            layer.setStyle({
+              fillColor: f.color,
+              fillOpacity: 0.4,
+              color: f.color,
+              weight: 1
+            });
+          }
+          
+          layer._flagData = { label: f.label, state: stateIndex, labelIndex: labelIndex };
+
+          // Add label at centroid
+          const centroid = f.centroid || getCentroid(geometry);
+
+          if (centroid && (centroid[0] !== 0 || centroid[1] !== 0)) {
+            let labelStyle = '';
+            if ((f.type === 'vassal' || f.type === 'province') && (f.root_parent_color || f.color)) {
+              const baseColor = f.root_parent_color || f.color;
+              labelStyle = `color: ${darkenedLabelColor(baseColor, 0.12, 0.9)};`;
             } else if (f.color) {
-              flagStyle.style = {
-                fillColor: f.color,
-                fillOpacity: 0.4,
-                color: f.color,
-                weight: 1
-              };
+              labelStyle = `color: ${darkenedLabelColor(f.color, 0.2, 0.9)};`;
             }
+            const depth = f.vassal_depth || 0;
+            const fontScale = Math.pow(0.85, depth);
+            labelStyle += ` font-size: ${14 * fontScale}px;`;
             
-            // Build tooltip with optional parent/vassal info
-            let flagTooltip = f.display_label || f.label;
-            if (f.parent) {
-              const relation = f.type || 'vassal';
-              const parentLabel = f.parent.includes('/') ? f.parent.split('/').slice(-1)[0] : f.parent;
-              flagTooltip += ` (${relation} of ${parentLabel})`;
-            }
-            if (f.note) {
-              flagTooltip += ' — ' + f.note;
+            let labelClassName = 'flag-label';
+            if (f.type === 'vassal') labelClassName += ' vassal';
+            if (f.type === 'province') labelClassName += ' province';
+            if (f.classes) labelClassName += ' ' + f.classes;
+            
+            // Calculate rotation based on distant points in geometry
+            let rotationAngle = 0;
+            const distantPoints = findDistantPoints(geometry);
+            if (distantPoints) {
+              rotationAngle = distantPoints.angle;
             }
             
-            const layer = L.geoJSON(geometry, {
-              ...flagStyle,
-              onEachFeature: function(feature, subLayer) {
-                // Register with multi-tooltip system
-                registerLayerTooltip(subLayer, 'Flag', flagTooltip);
-                subLayer.on('click', function() {
-                  if (!window.parent) return;
-                  window.parent.postMessage({
-                    type: 'mapFeaturePick',
-                    featureType: 'territory',
-                    name: f.label || ''
-                  }, '*');
-                });
-              }
+            const labelDiv = L.divIcon({
+              html: `<div style="transform: rotate(${rotationAngle}deg);"><div class="${labelClassName}" style="${labelStyle}">${f.display_label || f.label}</div></div>`,
+              className: 'flag-label-container',
+              iconSize: [1, 1],
+              iconAnchor: [0, 0]
             });
+            const labelLayer = L.marker(centroid, { icon: labelDiv });
             
-            if (f.type === 'province') {
-              const provinceBorderColor = darkenedLabelColor(f.root_parent_color || f.color || '#333', 0.12, 0.9);
-              layer.setStyle({
-                fill: false,
-                stroke: true,
-                color: provinceBorderColor,
-                opacity: 0.8,
-                weight: 1.2,
-                lineJoin: 'round'
-              });
-            } else if (f.color) {
-              layer.setStyle({
-                fillColor: f.color,
-                fillOpacity: 0.4,
-                color: f.color,
-                weight: 1
-              });
-            }
+            // Store metadata for visibility management
+            labelLayer._flagData = { label: f.label, state: stateIndex, labelIndex: labelIndex };
             
-            layer._flagData = { label: f.label, snapshot: snapshot.year };
-
-            // Add label at centroid
-            const centroid = f.centroid || getCentroid(geometry);
-
-            if (centroid && (centroid[0] !== 0 || centroid[1] !== 0)) {
-              let labelStyle = '';
-              if ((f.type === 'vassal' || f.type === 'province') && (f.root_parent_color || f.color)) {
-                const baseColor = f.root_parent_color || f.color;
-                labelStyle = `color: ${darkenedLabelColor(baseColor, 0.12, 0.9)};`;
-              } else if (f.color) {
-                labelStyle = `color: ${darkenedLabelColor(f.color, 0.2, 0.9)};`;
-              }
-              const depth = f.vassal_depth || 0;
-              const fontScale = Math.pow(0.85, depth);
-              labelStyle += ` font-size: ${14 * fontScale}px;`;
-              
-              let labelClassName = 'flag-label';
-              if (f.type === 'vassal') labelClassName += ' vassal';
-              if (f.type === 'province') labelClassName += ' province';
-              if (f.classes) labelClassName += ' ' + f.classes;
-              
-              // Calculate rotation based on distant points in geometry
-              let rotationAngle = 0;
-              const distantPoints = findDistantPoints(geometry);
-              if (distantPoints) {
-                rotationAngle = distantPoints.angle;
-              }
-              
-              const labelDiv = L.divIcon({
-                html: `<div style="transform: rotate(${rotationAngle}deg);"><div class="${labelClassName}" style="${labelStyle}">${f.display_label || f.label}</div></div>`,
-                className: 'flag-label-container',
-                iconSize: [1, 1],
-                iconAnchor: [0, 0]
-              });
-              const labelLayer = L.marker(centroid, { icon: labelDiv });
-              
-              // Store metadata for visibility management
-              labelLayer._flagData = { label: f.label, snapshot: snapshot.year };
-              
-              layers.flags.push(layer, labelLayer);
-            }
+            layers.flags.push(layer, labelLayer);
           }
         }
         
@@ -2781,17 +2823,19 @@ HTML_TEMPLATE = Template(
         // Create all layers on first call
         createAllLayers();
         
-        // Find closest snapshot at or before year
+        // Find closest snapshot at or before year and apply the diffs up to it
         const snapshots = payload.flags.snapshots;
-        let current = snapshots[0];
-        for (const s of snapshots) {
-          if (s.year <= year) current = s;
+        let currentIndex = 0;
+        for (let k = 0; k < snapshots.length; k++) {
+          if (snapshots[k].year <= year) currentIndex = k;
         }
+        seekFlagTimeline(currentIndex);
         
         // Update flag visibility based on current snapshot
         for (const layer of layers.flags) {
           if (layer._flagData) {
-            const shouldShow = layer._flagData.snapshot === current.year;
+            const data = layer._flagData;
+            const shouldShow = flagTimeline.current.get(data.labelIndex) === data.state;
             setLayerVisibility(layer, shouldShow);
           }
         }
@@ -3079,7 +3123,7 @@ HTML_TEMPLATE = Template(
             if (cen) add(r.label, cen[0], cen[1], 'River', r.note);
           }
         }
-        const flags = payload.flags && payload.flags.flags ? payload.flags.flags : (payload.flags && payload.flags.snapshots && payload.flags.snapshots[0] ? payload.flags.snapshots[0].flags : []);
+        const flags = payload.flags && payload.flags.flags ? payload.flags.flags : (payload.flags && payload.flags.snapshots && payload.flags.snapshots[0] ? snapshotFlags(0) : []);
         for (const f of flags || []) {
           const geometry = resolveGeometry(f);
           if (geometry) {
@@ -28,3 +28,166 @@ def _parse_caching_env() -> bool:
 
 
 CACHING_ENABLED = _parse_caching_env()
+
+
+def _parse_non_negative_int_env(name: str, default: int, meaning: str) -> int:
+    """Parse a non-negative integer environment variable, warning on bad values."""
+    raw = os.environ.get(name, "")
+    value = raw.strip()
+    if value == "":
+        return default
+    try:
+        number = int(value)
+        if number >= 0:
+            return number
+    except ValueError:
+        pass
+    warnings.warn(
+        f"Invalid {name} environment variable value: '{raw}'. "
+        f"Expected a non-negative integer. Defaulting to {default} ({meaning}).",
+        UserWarning,
+        stacklevel=4,
+    )
+    return default
+
+
+def _parse_file_cache_mb_env() -> int:
+    """Parse XATRA_FILE_CACHE_MB environment variable.
+
+    Memory budget (in MB) for parsed data files kept by the loaders.
+    0 disables the limit. Defaults to 2048 when empty/unset.
+    """
+    return _parse_non_negative_int_env("XATRA_FILE_CACHE_MB", 2048, "MB")
+
+
+FILE_CACHE_MAX_MB = _parse_file_cache_mb_env()
+
+
+def _parse_territory_threads_env() -> int:
+    """Parse XATRA_TERRITORY_THREADS environment variable.
+
+    Number of worker threads used to evaluate independent branches of a
+    Territory expression. 0 or 1 (the default) evaluates serially.
+    """
+    return _parse_non_negative_int_env("XATRA_TERRITORY_THREADS", 0, "serial")
+
+
+TERRITORY_THREADS = _parse_territory_threads_env()
+
+
+def _parse_paxmax_threads_env() -> int:
+    """Parse XATRA_PAXMAX_THREADS environment variable.
+
+    Number of worker threads paxmax aggregation spreads flag labels over.
+    0 or 1 (the default) aggregates serially.
+    """
+    return _parse_non_negative_int_env("XATRA_PAXMAX_THREADS", 0, "serial")
+
+
+PAXMAX_THREADS = _parse_paxmax_threads_env()
+
+
+def _parse_cache_backend_env() -> str:
+    """Parse XATRA_CACHE_BACKEND environment variable.
+
+    On-disk geometry cache layout: "files" (one pickle per entry, the
+    default) or "segments" (append-only segment files with a SQLite index).
+    """
+    raw = os.environ.get("XATRA_CACHE_BACKEND", "")
+    value = raw.strip().lower()
+    if value == "":
+        return "files"
+    if value in ("files", "segments"):
+        return value
+    warnings.warn(
+        f"Invalid XATRA_CACHE_BACKEND environment variable value: '{raw}'. "
+        "Expected one of: files, segments. Defaulting to files.",
+        UserWarning,
+        stacklevel=3,
+    )
+    return "files"
+
+
+CACHE_BACKEND = _parse_cache_backend_env()
+
+
+def _parse_geometry_cache_mb_env() -> int:
+    """Parse XATRA_GEOMETRY_CACHE_MB environment variable.
+
+    Memory budget (in MB) for the in-memory geometry cache, estimated from
+    vertex counts. 0 disables the limit. Defaults to 1024 when empty/unset.
+    """
+    return _parse_non_negative_int_env("XATRA_GEOMETRY_CACHE_MB", 1024, "MB")
+
+
+def _parse_disk_cache_mb_env() -> int:
+    """Parse XATRA_DISK_CACHE_MB environment variable.
+
+    Size limit (in MB) for the on-disk geometry cache, enforced by
+    GeometryCache.gc_disk(). 0 (the default) disables the limit.
+    """
+    return _parse_non_negative_int_env("XATRA_DISK_CACHE_MB", 0, "no limit")
+
+
+def _parse_disk_cache_max_age_days_env() -> int:
+    """Parse XATRA_DISK_CACHE_MAX_AGE_DAYS environment variable.
+
+    On-disk geometry cache entries written longer ago than this are removed
+    by GeometryCache.gc_disk(). 0 (the default) disables the limit.
+    """
+    return _parse_non_negative_int_env("XATRA_DISK_CACHE_MAX_AGE_DAYS", 0, "no limit")
+
+
+GEOMETRY_CACHE_MAX_MB = _parse_geometry_cache_mb_env()
+DISK_CACHE_MAX_MB = _parse_disk_cache_mb_env()
+DISK_CACHE_MAX_AGE_DAYS = _parse_disk_cache_max_age_days_env()
+
+
+def _parse_cache_compression_env() -> str:
+    """Parse XATRA_CACHE_COMPRESSION environment variable.
+
+    Compression for on-disk geometry cache entries: "none" (the default),
+    "zlib", "zstd" (needs zstandard) or "lz4" (needs lz4). Entries written
+    with any codec stay readable when the setting changes.
+    """
+    raw = os.environ.get("XATRA_CACHE_COMPRESSION", "")
+    value = raw.strip().lower()
+    if value == "":
+        return "none"
+    if value in ("none", "zlib", "zstd", "lz4"):
+        return value
+    warnings.warn(
+        f"Invalid XATRA_CACHE_COMPRESSION environment variable value: '{raw}'. "
+        "Expected one of: none, zlib, zstd, lz4. Defaulting to none.",
+        UserWarning,
+        stacklevel=3,
+    )
+    return "none"
+
+
+CACHE_COMPRESSION = _parse_cache_compression_env()
+
+
+def _parse_cache_shared_env() -> bool:
+    """Parse XATRA_CACHE_SHARED environment variable.
+
+    Enables the cross-process shared geometry cache mode.
+    Accepted true values: 1, true, yes, on
+    Accepted false values: 0, false, no, off, empty/unset
+    """
+    raw = os.environ.get("XATRA_CACHE_SHARED", "")
+    value = raw.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("", "0", "false", "no", "off"):
+        return False
+    warnings.warn(
+        f"Invalid XATRA_CACHE_SHARED environment variable value: '{raw}'. "
+        "Expected one of: 1, 0, true, false, yes, no, on, off. Defaulting to False.",
+        UserWarning,
+        stacklevel=3,
+    )
+    return False
+
+
+CACHE_SHARED = _parse_cache_shared_env()
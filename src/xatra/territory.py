@@ -11,9 +11,14 @@ base datasets using Shapely geometry operations.
 
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
+import shapely
 from shapely.geometry import shape, Polygon, mapping
 # Use the timed wrapper from paxmax if possible, else fallback to raw
 try:
@@ -21,10 +26,97 @@ try:
 except ImportError:
     from shapely.ops import unary_union
 
-from .loaders import load_gadm_like, load_naturalearth_like
+from .loaders import (
+    gadm_source_fingerprint,
+    get_active_simplification_tolerance,
+    simplification_tolerance,
+    load_gadm_geometries,
+    load_gadm_geometry,
+    load_naturalearth_like,
+    naturalearth_source_fingerprint,
+    naturalearth_features,
+)
 from typing import List, Tuple
 from .debug_utils import time_debug
-from .geometry_cache import get_global_cache
+from .geometry_cache import _run_coalesced, get_global_cache
+from .settings import TERRITORY_THREADS
+
+
+_UNION = "|"
+_DIFFERENCE = "-"
+_INTERSECTION = "&"
+
+# Worker threads for evaluating Territory expressions (<= 1 means serial).
+_territory_threads = TERRITORY_THREADS
+# Set while a thread is running part of a parallel evaluation, so nested
+# to_geometry() calls do not start another one.
+_parallel_state = threading.local()
+# Prepared private copies of recently tested geometries, id -> (geometry,
+# prepared copy). Geometries shared through the caches are never prepared in
+# place; holding the original keeps its id from being reused while cached.
+# The lock also serializes queries, since prepared geometries build their
+# indexes lazily.
+_prepared: "OrderedDict[int, Tuple[Any, Any]]" = OrderedDict()
+_PREPARED_MAX = 64
+_prepare_lock = threading.Lock()
+
+
+def set_territory_threads(threads: int) -> None:
+    """Set the number of threads used to evaluate Territory expressions.
+
+    Independent branches of an expression (e.g. the operands of a large
+    union) are then computed concurrently; GEOS releases the GIL while it
+    works. This overrides the XATRA_TERRITORY_THREADS environment variable.
+
+    Args:
+        threads: Worker thread count; 0 or 1 evaluates serially
+
+    Raises:
+        ValueError: If threads is negative
+    """
+    global _territory_threads
+    if threads < 0:
+        raise ValueError("threads must be non-negative")
+    _territory_threads = int(threads)
+
+
+def get_territory_threads() -> int:
+    """Get the number of threads used to evaluate Territory expressions."""
+    return _territory_threads
+
+
+def _structural_hash(op: str, keys: List[str]) -> str:
+    """Hash an operator and its (already canonical) operand keys."""
+    digest = hashlib.sha256("\x1f".join([op] + keys).encode("utf-8")).hexdigest()[:32]
+    return f"<{op}:{digest}>"
+
+
+def _boxes_intersect(a: Optional[Tuple[float, ...]], b: Optional[Tuple[float, ...]]) -> bool:
+    """Whether two (minx, miny, maxx, maxy) boxes overlap; None (empty) never does."""
+    if a is None or b is None:
+        return False
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def _box_contains(outer: Optional[Tuple[float, ...]], inner: Optional[Tuple[float, ...]]) -> bool:
+    if outer is None or inner is None:
+        return False
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def _covers(outer, inner) -> bool:
+    """Covers test against a prepared copy of `outer`, kept for reuse."""
+    with _prepare_lock:
+        entry = _prepared.get(id(outer))
+        if entry is None or entry[0] is not outer:
+            prepared = shapely.from_wkb(shapely.to_wkb(outer))
+            shapely.prepare(prepared)
+            entry = _prepared[id(outer)] = (outer, prepared)
+            if len(_prepared) > _PREPARED_MAX:
+                _prepared.popitem(last=False)
+        else:
+            _prepared.move_to_end(id(outer))
+        return bool(shapely.covers(entry[1], inner))
 
 
 @time_debug("Convert GeoJSON to geometry")
@@ -68,6 +160,20 @@ class Territory:
     _memoized_geometry: Any = field(default=None, init=False, repr=False)
     _memoized_ready: bool = field(default=False, init=False, repr=False)
     _geojson_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    # Set algebra operator (_UNION, _DIFFERENCE, _INTERSECTION) and its operands
+    _op: Optional[str] = field(default=None, repr=False)
+    _operands: Tuple["Territory", ...] = field(default=(), repr=False)
+    # (key, find_in_gadm, simplify_tolerance) for GADM leaves, used for bulk loading
+    _gadm_source: Optional[Tuple[str, Optional[List[str]], Optional[float]]] = field(default=None, repr=False)
+    # ne_id of Natural Earth leaves, used for bulk loading
+    _naturalearth_id: Optional[str] = field(default=None, repr=False)
+    # Returns a version token of the data files a leaf is loaded from
+    _source_fingerprint: Optional[Callable[[], str]] = field(default=None, repr=False)
+    # (active simplification tolerance, key) of the last canonical_key() call
+    _canonical_key: Optional[Tuple[Optional[float], str]] = field(default=None, init=False, repr=False)
+    # (minx, miny, maxx, maxy) of the evaluated geometry, None if null/empty
+    _bounds: Optional[Tuple[float, float, float, float]] = field(default=None, init=False, repr=False)
+    _bounds_ready: bool = field(default=False, init=False, repr=False)
 
     @staticmethod
     def from_geojson(geojson_obj: Dict[str, Any]) -> "Territory":
@@ -79,7 +185,6 @@ class Territory:
         Returns:
             Territory instance
         """
-        import hashlib
         import json
         try:
             import orjson
@@ -110,13 +215,17 @@ class Territory:
             Territory instance
         """
         def provider():
-            obj = load_gadm_like(key, find_in_gadm, simplify_tolerance=simplify_tolerance)
-            return _geojson_to_geometry(obj)
+            return load_gadm_geometry(key, find_in_gadm, simplify_tolerance=simplify_tolerance)
         if simplify_tolerance is None:
             repr_str = f'gadm("{key}")'
         else:
             repr_str = f'gadm("{key}", simplify_tolerance={float(simplify_tolerance):.12g})'
-        return Territory(_geometry_provider=provider, strrepr=repr_str)
+        return Territory(
+            _geometry_provider=provider,
+            strrepr=repr_str,
+            _gadm_source=(key, find_in_gadm, simplify_tolerance),
+            _source_fingerprint=lambda: gadm_source_fingerprint(key, find_in_gadm, simplify_tolerance),
+        )
 
     @staticmethod
     def from_naturalearth(ne_id: str) -> "Territory":
@@ -131,7 +240,12 @@ class Territory:
         def provider():
             obj = load_naturalearth_like(ne_id)
             return _geojson_to_geometry(obj)
-        return Territory(_geometry_provider=provider, strrepr=f'naturalearth("{ne_id}")')
+        return Territory(
+            _geometry_provider=provider,
+            strrepr=f'naturalearth("{ne_id}")',
+            _naturalearth_id=str(ne_id),
+            _source_fingerprint=naturalearth_source_fingerprint,
+        )
 
     @staticmethod
     def from_polygon(coords: List[List[float]], holes: Optional[List[List[List[float]]]] = None) -> "Territory":
@@ -195,11 +309,95 @@ class Territory:
         
         return Territory(_geometry_provider=provider, strrepr=strrepr)
 
+    def canonical_key(self) -> str:
+        """Order-insensitive structural key for this territory expression.
+
+        Leaves are keyed by their strrepr plus, for file-backed leaves (GADM,
+        Natural Earth), a fingerprint of the source files, so rewritten data
+        files invalidate exactly the expressions built on them. Unions and
+        intersections are flattened, deduplicated and sorted, and (A - B) - C
+        is keyed like A - (B | C), so expressions that differ only in operand
+        order or parenthesization share a key. Combined nodes are keyed by a
+        hash of their operands' keys, which keeps keys short for large
+        expressions.
+
+        Returns:
+            Canonical key string
+        """
+        # Source files depend on the active simplification tolerance.
+        active_tol = get_active_simplification_tolerance()
+        if self._canonical_key is not None and self._canonical_key[0] == active_tol:
+            return self._canonical_key[1]
+        if self._op in (_UNION, _INTERSECTION):
+            keys = sorted({t.canonical_key() for t in self._flatten(self._op)})
+            key = keys[0] if len(keys) == 1 else _structural_hash(self._op, keys)
+        elif self._op == _DIFFERENCE:
+            node = self
+            subtrahends: List[Territory] = []
+            while node._op == _DIFFERENCE:
+                base, other = node._operands
+                subtrahends.extend(other._flatten(_UNION))
+                node = base
+            keys = sorted({t.canonical_key() for t in subtrahends})
+            key = _structural_hash(_DIFFERENCE, [node.canonical_key()] + keys)
+        elif self._source_fingerprint is not None:
+            key = f"{self.strrepr}#{self._source_fingerprint()}"
+        else:
+            key = self.strrepr
+        self._canonical_key = (active_tol, key)
+        return key
+
+    def _envelope(self) -> Optional[Tuple[float, float, float, float]]:
+        """Bounding box of this territory's geometry, recorded on first use."""
+        if not self._bounds_ready:
+            geometry = self.to_geometry()
+            self._bounds = None if geometry is None or geometry.is_empty else tuple(geometry.bounds)
+            self._bounds_ready = True
+        return self._bounds
+
+    def _collapsed_operand(self) -> Optional["Territory"]:
+        """The operand a deduplicated union or intersection is keyed as (A | A is keyed A), or None."""
+        if self._op not in (_UNION, _INTERSECTION):
+            return None
+        key = self.canonical_key()
+        for term in self._flatten(self._op):
+            if term.canonical_key() == key:
+                return term
+        return None
+
+    def _flatten(self, op: str) -> List["Territory"]:
+        """Operands of nested `op` nodes rooted here (self alone if it is not an `op` node)."""
+        terms: List[Territory] = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._op == op:
+                stack.extend(reversed(node._operands))
+            else:
+                terms.append(node)
+        return terms
+
+    def _set_memo(self, geometry: Any) -> None:
+        # Publish the geometry before the flag: to_geometry() reads the flag
+        # without a lock, possibly from another thread.
+        self._memoized_geometry = geometry
+        self._memoized_ready = True
+
+    def _cache_strrepr(self) -> str:
+        """String used as the global geometry cache key for this territory."""
+        active_tol = get_active_simplification_tolerance()
+        if active_tol is not None and "simplify_tolerance=" not in self.strrepr:
+            # Keep cache entries disjoint across simplification settings.
+            return f"{self.canonical_key()}@@simplify={active_tol:.12g}"
+        return self.canonical_key()
+
     @time_debug("Convert territory to geometry")
     def to_geometry(self):
         """Get the Shapely geometry for this territory.
         
-        Uses global caching system for performance optimization.
+        Uses global caching system for performance optimization. Safe to call
+        from several threads: concurrent misses on the same expression wait
+        for a single computation (see GeometryCache.compute_and_put).
         
         Returns:
             Shapely geometry object or None if invalid
@@ -209,40 +407,134 @@ class Territory:
         if self._memoized_ready:
             return self._memoized_geometry
 
+        operand = self._collapsed_operand()
+        if operand is not None:
+            # Keyed (and cached) as its only distinct operand, whose geometry it is.
+            geometry = operand.to_geometry()
+            self._set_memo(geometry)
+            return geometry
+
         # Use global cache for all territories
         cache = get_global_cache()
-        cache_strrepr = self.strrepr
-        try:
-            from .loaders import get_active_simplification_tolerance
-            active_tol = get_active_simplification_tolerance()
-        except Exception:
-            active_tol = None
-        if active_tol is not None and "simplify_tolerance=" not in self.strrepr:
-            # Keep cache entries disjoint across simplification settings.
-            cache_strrepr = f"{self.strrepr}@@simplify={active_tol:.12g}"
+        cache_strrepr = self._cache_strrepr()
         
         # Try to get from cache first
         cached_geometry = cache.get(cache_strrepr)
         if cached_geometry is not None:
             # print(f"RETRIEVING CACHED GEOMETRY FOR '{self.strrepr}'")
-            self._memoized_ready = True
-            self._memoized_geometry = cached_geometry
+            self._set_memo(cached_geometry)
             return cached_geometry
         
+        if (
+            self._op is not None
+            and _territory_threads > 1
+            and not getattr(_parallel_state, "active", False)
+        ):
+            self._evaluate_parallel(_territory_threads)
+            if self._memoized_ready:
+                return self._memoized_geometry
+
         # Not in cache, compute and store
         if self._geometry_provider is None:
-            self._memoized_ready = True
-            self._memoized_geometry = None
+            self._set_memo(None)
             return None
         
         # print(f"CALCULATING GEOMETRY FOR '{self.strrepr}'")
-        geometry = self._geometry_provider()
-        if geometry is not None:
-            cache.put(cache_strrepr, geometry)
-        self._memoized_ready = True
-        self._memoized_geometry = geometry
+        geometry = cache.compute_and_put(cache_strrepr, self._geometry_provider)
+        self._set_memo(geometry)
         return geometry
 
+    async def ato_geometry(self):
+        """Awaitable to_geometry().
+        
+        Cache lookups, file loading and GEOS work run on a background thread,
+        so the event loop is never blocked. Concurrent awaits of the same
+        territory expression (under the same simplification tolerance) share
+        one evaluation, even across distinct Territory instances.
+        
+        Returns:
+            Shapely geometry object or None if invalid
+        """
+        if self._memoized_ready:
+            return self._memoized_geometry
+        tolerance = get_active_simplification_tolerance()
+
+        def evaluate():
+            # Evaluate under the caller's tolerance, which may have changed by
+            # the time this runs, without touching the process-wide setting.
+            with simplification_tolerance(tolerance):
+                return self.to_geometry()
+
+        geometry = await _run_coalesced(("territory", self.strrepr, tolerance), evaluate)
+        if not self._memoized_ready:
+            self._set_memo(geometry)
+        return geometry
+
+    @staticmethod
+    @time_debug("Materialize territories (bulk)")
+    def materialize_many(territories: Iterable[Optional["Territory"]]) -> None:
+        """Load the GADM and Natural Earth leaves of many territories in one pass.
+
+        Walks the given territories down to their leaves, skips anything
+        already memoized or in the global cache, loads each remaining GADM
+        source file once (see loaders.load_gadm_geometries) and all Natural
+        Earth features in one indexed read (see loaders.naturalearth_features),
+        and fills the per-instance memo and the global cache. Later
+        to_geometry() calls on the territories then only perform the set algebra.
+
+        Args:
+            territories: Territory objects (None entries are ignored)
+        """
+        leaves: Dict[str, List["Territory"]] = {}
+        seen = set()
+        stack = [t for t in territories if t is not None]
+        while stack:
+            territory = stack.pop()
+            if id(territory) in seen or territory._memoized_ready:
+                continue
+            seen.add(id(territory))
+            if territory._gadm_source is not None or territory._naturalearth_id is not None:
+                leaves.setdefault(territory._cache_strrepr(), []).append(territory)
+            stack.extend(territory._operands)
+
+        cache = get_global_cache()
+        pending: List[Tuple[str, List["Territory"]]] = []
+        for cache_strrepr, instances in leaves.items():
+            cached_geometry = cache.get(cache_strrepr)
+            if cached_geometry is not None:
+                for territory in instances:
+                    territory._set_memo(cached_geometry)
+            else:
+                pending.append((cache_strrepr, instances))
+        if not pending:
+            return
+
+        loaded: Dict[int, Any] = {}
+        gadm = [i for i, (_, instances) in enumerate(pending) if instances[0]._gadm_source is not None]
+        if gadm:
+            results = load_gadm_geometries([pending[i][1][0]._gadm_source for i in gadm])
+            loaded.update((gadm[j], geometry) for j, geometry in results.items())
+        ne_ids = {i: instances[0]._naturalearth_id for i, (_, instances) in enumerate(pending)
+                  if instances[0]._naturalearth_id is not None}
+        if ne_ids:
+            try:
+                features = naturalearth_features(list(ne_ids.values()))
+            except (OSError, ValueError):
+                features = {}
+            for i, ne_id in ne_ids.items():
+                if ne_id in features:
+                    loaded[i] = _geojson_to_geometry(features[ne_id])
+
+        for i, (cache_strrepr, instances) in enumerate(pending):
+            if i not in loaded:
+                # Unresolvable key: leave it to to_geometry() to raise as usual.
+                continue
+            geometry = loaded[i]
+            if geometry is not None:
+                cache.put(cache_strrepr, geometry)
+            for territory in instances:
+                territory._set_memo(geometry)
+
     @time_debug("Convert territory to GeoJSON dict")
     def to_geojson_dict(self) -> Optional[Dict[str, Any]]:
         """Convert the territory to a GeoJSON-compatible dictionary.
@@ -264,6 +556,176 @@ class Territory:
         return self._geojson_cache
 
     # Set algebra
+    #
+    # Combined territories keep their operands and operator (_op) so the
+    # expression can be rewritten before evaluation: chains of unions are
+    # flattened into one n-ary unary_union, (A - B) - C becomes A - (B | C),
+    # and repeated operands (same canonical key) are only evaluated once.
+    @staticmethod
+    def _combine(op: str, operands: Tuple["Territory", ...], strrepr: str) -> "Territory":
+        territory = Territory(strrepr=strrepr, _op=op, _operands=operands)
+        territory._geometry_provider = territory._evaluate_expression
+        return territory
+
+    def _is_pending(self, op: str) -> bool:
+        """Whether this node is an unevaluated `op` node that can be flattened into its parent."""
+        return self._op == op and not self._memoized_ready
+
+    def _union_terms(self) -> List["Territory"]:
+        """Operands of this union with nested pending unions flattened, deduplicated by strrepr."""
+        terms: Dict[str, Territory] = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._is_pending(_UNION):
+                stack.extend(reversed(node._operands))
+            else:
+                terms.setdefault(node.canonical_key(), node)
+        return list(terms.values())
+
+    def _difference_terms(self) -> Tuple["Territory", List["Territory"]]:
+        """Split nested differences (A - B) - C into base A and subtrahends [B, C]."""
+        node = self
+        subtrahends: List[Territory] = []
+        while node._is_pending(_DIFFERENCE):
+            base, other = node._operands
+            subtrahends.extend(other._union_terms() if other._is_pending(_UNION) else [other])
+            node = base
+        unique: Dict[str, Territory] = {}
+        for t in subtrahends:
+            unique.setdefault(t.canonical_key(), t)
+        return node, list(unique.values())
+
+    def _evaluation_inputs(self) -> List["Territory"]:
+        """Territories whose geometries _evaluate_expression() reads."""
+        if self._op == _UNION:
+            return self._union_terms()
+        if self._op == _DIFFERENCE:
+            base, subtrahends = self._difference_terms()
+            return [base] + subtrahends
+        return list(self._operands)
+
+    @time_debug("Evaluate territory expression (parallel)")
+    def _evaluate_parallel(self, max_workers: int) -> None:
+        """Evaluate this expression's DAG on a thread pool.
+
+        Nodes are grouped by cache key, so each distinct subexpression is
+        computed once even when several instances (or several parents) need
+        it. Leaves are loaded on the calling thread (GADM leaves in one bulk
+        pass); combined nodes are submitted once all their inputs are ready.
+        Every evaluated instance ends up memoized, including this one.
+        """
+        Territory.materialize_many([self])
+
+        nodes: Dict[str, List[Territory]] = defaultdict(list)
+        inputs: Dict[str, set] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        seen = set()
+        stack: List[Territory] = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen or node._memoized_ready:
+                continue
+            seen.add(id(node))
+            key = node._cache_strrepr()
+            nodes[key].append(node)
+            if key in inputs:
+                continue
+            children = [c for c in node._evaluation_inputs() if not c._memoized_ready] if node._op else []
+            # A collapsed composite (A | A) shares its operand's key; it must
+            # not wait on itself.
+            inputs[key] = {c._cache_strrepr() for c in children} - {key}
+            for child_key in inputs[key]:
+                dependents[child_key].append(key)
+            stack.extend(children)
+
+        # Pool threads evaluate under this thread's tolerance, which may be a
+        # thread-local override (see loaders.simplification_tolerance).
+        tolerance = get_active_simplification_tolerance()
+
+        def evaluate(key: str) -> None:
+            _parallel_state.active = True
+            try:
+                with simplification_tolerance(tolerance):
+                    geometry = nodes[key][0].to_geometry()
+            finally:
+                _parallel_state.active = False
+            for node in nodes[key][1:]:
+                node._set_memo(geometry)
+
+        ready: List[str] = []
+
+        def finished(key: str) -> None:
+            for parent in dependents[key]:
+                inputs[parent].discard(key)
+                if not inputs[parent]:
+                    ready.append(parent)
+
+        # Leaves (file loads, polygon construction) stay on this thread.
+        for key in [k for k, deps in inputs.items() if not deps]:
+            if any(node._op is None for node in nodes[key]):
+                evaluate(key)
+                finished(key)
+            else:
+                ready.append(key)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="xatra-territory") as pool:
+            running = {}
+            while ready or running:
+                while ready:
+                    key = ready.pop()
+                    running[pool.submit(evaluate, key)] = key
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = running.pop(future)
+                    future.result()
+                    finished(key)
+
+    @time_debug("Evaluate territory expression")
+    def _evaluate_expression(self):
+        if self._op == _UNION:
+            geoms = [g for g in (t.to_geometry() for t in self._union_terms()) if g is not None]
+            if not geoms:
+                return None
+            return geoms[0] if len(geoms) == 1 else unary_union(geoms)
+        if self._op == _DIFFERENCE:
+            base, subtrahends = self._difference_terms()
+            a = base.to_geometry()
+            if a is None:
+                return None
+            box_a = base._envelope()
+            if box_a is None:
+                return a
+            # Subtrahends whose boxes miss `a` cannot change it.
+            overlapping = [
+                t for t in subtrahends
+                if t.to_geometry() is not None and _boxes_intersect(box_a, t._envelope())
+            ]
+            if not overlapping:
+                return a
+            for t in overlapping:
+                if _box_contains(t._envelope(), box_a) and _covers(t.to_geometry(), a):
+                    return Polygon()
+            geoms = [t.to_geometry() for t in overlapping]
+            return a.difference(geoms[0] if len(geoms) == 1 else unary_union(geoms))
+        if self._op == _INTERSECTION:
+            left, right = self._operands
+            a = left.to_geometry()
+            b = right.to_geometry() if right.canonical_key() != left.canonical_key() else a
+            if a is None or b is None:
+                return None
+            if b is a:
+                return a
+            box_a, box_b = left._envelope(), right._envelope()
+            if not _boxes_intersect(box_a, box_b):
+                return Polygon()
+            if _box_contains(box_a, box_b) and _covers(a, b):
+                return b
+            if _box_contains(box_b, box_a) and _covers(b, a):
+                return a
+            return a.intersection(b)
+        raise ValueError(f"Unknown territory operator: {self._op!r}")
+
     def __or__(self, other: "Territory") -> "Territory":
         """Union of two territories.
         
@@ -273,15 +735,7 @@ class Territory:
         Returns:
             New Territory representing the union
         """
-        def provider():
-            a = self.to_geometry()
-            b = other.to_geometry()
-            if a is None:
-                return b
-            if b is None:
-                return a
-            return unary_union([a, b])
-        return Territory(_geometry_provider=provider,strrepr=f'({self.strrepr} | {other.strrepr})')
+        return Territory._combine(_UNION, (self, other), f'({self.strrepr} | {other.strrepr})')
 
     def __sub__(self, other: "Territory") -> "Territory":
         """Difference of two territories (self - other).
@@ -292,15 +746,7 @@ class Territory:
         Returns:
             New Territory representing the difference
         """
-        def provider():
-            a = self.to_geometry()
-            b = other.to_geometry()
-            if a is None:
-                return None
-            if b is None:
-                return a
-            return a.difference(b)
-        return Territory(_geometry_provider=provider, strrepr=f'({self.strrepr} - {other.strrepr})')
+        return Territory._combine(_DIFFERENCE, (self, other), f'({self.strrepr} - {other.strrepr})')
 
     def __and__(self, other: "Territory") -> "Territory":
         """Intersection of two territories.
@@ -311,13 +757,7 @@ class Territory:
         Returns:
             New Territory representing the intersection
         """
-        def provider():
-            a = self.to_geometry()
-            b = other.to_geometry()
-            if a is None or b is None:
-                return None
-            return a.intersection(b)
-        return Territory(_geometry_provider=provider, strrepr=f'({self.strrepr} & {other.strrepr})')
+        return Territory._combine(_INTERSECTION, (self, other), f'({self.strrepr} & {other.strrepr})')
 
     @staticmethod
     def union_territories(territories: List["Territory"]) -> "Territory":
@@ -342,19 +782,4 @@ class Territory:
         # Create a string representation for caching
         strreprs = [t.strrepr for t in territories]
         union_strrepr = f"({' | '.join(strreprs)})"
-        
-        def provider():
-            geoms = []
-            for territory in territories:
-                geom = territory.to_geometry()
-                if geom is not None:
-                    geoms.append(geom)
-            
-            if not geoms:
-                return None
-            if len(geoms) == 1:
-                return geoms[0]
-            
-            return unary_union(geoms)
-        
-        return Territory(_geometry_provider=provider, strrepr=union_strrepr)
+        return Territory._combine(_UNION, tuple(territories), union_strrepr)
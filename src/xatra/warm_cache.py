@@ -0,0 +1,208 @@
+"""
+Prebake the on-disk geometry cache for a library of territories.
+
+Evaluates every public Territory of a module (territory_library by default)
+for the requested simplification tolerances and stores the results in the
+disk cache, so later processes start warm. Regions are evaluated in forked
+worker processes that share the cache in shared mode, so composites common to
+several regions are computed once. Per-region timings are reported to spot
+the most expensive composites.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import shapely
+
+from .geometry_cache import get_global_cache
+from .loaders import get_active_simplification_tolerance, set_active_simplification_tolerance
+from .settings import CACHING_ENABLED
+from .territory import Territory
+
+DEFAULT_MODULE = "xatra.territory_library"
+
+# Regions of the current warm_cache() call, inherited by forked workers.
+_regions: Dict[str, Territory] = {}
+
+
+def find_territories(module_name: str = DEFAULT_MODULE) -> Dict[str, Territory]:
+    """Public module-level Territory objects of a module, by name.
+
+    Args:
+        module_name: Importable module name
+
+    Returns:
+        Dictionary of attribute name to Territory, in definition order
+    """
+    module = importlib.import_module(module_name)
+    return {
+        name: value for name, value in vars(module).items()
+        if not name.startswith("_") and isinstance(value, Territory)
+    }
+
+
+def _forget(territories: Iterable[Territory]) -> None:
+    """Drop per-instance results so territories re-evaluate under a new tolerance."""
+    seen = set()
+    stack = list(territories)
+    while stack:
+        territory = stack.pop()
+        if id(territory) in seen:
+            continue
+        seen.add(id(territory))
+        territory._memoized_ready = False
+        territory._memoized_geometry = None
+        territory._geojson_cache = None
+        territory._bounds_ready = False
+        territory._bounds = None
+        stack.extend(territory._operands)
+
+
+def _warm_region(name: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"region": name, "vertices": 0, "error": None}
+    try:
+        geometry = _regions[name].to_geometry()
+        if geometry is not None:
+            result["vertices"] = int(shapely.get_num_coordinates(geometry))
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _init_worker() -> None:
+    # Serialize computations of the same key across workers.
+    get_global_cache().set_shared(True)
+
+
+def warm_cache(
+    module_name: str = DEFAULT_MODULE,
+    tolerances: Sequence[Optional[float]] = (None,),
+    workers: Optional[int] = None,
+    regions: Optional[Sequence[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Evaluate a module's territories and store them in the disk geometry cache.
+
+    For each tolerance, the GADM leaves of all regions are bulk-loaded in this
+    process, then the regions are evaluated by a pool of forked workers (or
+    in this process when fork is unavailable or other threads are running).
+
+    Args:
+        module_name: Module whose public Territory attributes are warmed
+        tolerances: Simplification tolerances to warm (None = unsimplified)
+        workers: Worker processes (defaults to the CPU count; 1 runs in-process)
+        regions: Optional subset of region names
+
+    Returns:
+        One dict per (tolerance, region) with "tolerance", "region",
+        "seconds", "vertices" and "error" (None on success)
+
+    Raises:
+        KeyError: If a requested region is not a Territory of the module
+    """
+    global _regions
+    found = find_territories(module_name)
+    if regions:
+        missing = [name for name in regions if name not in found]
+        if missing:
+            raise KeyError(f"Not territories of {module_name}: {', '.join(missing)}")
+        found = {name: found[name] for name in regions}
+
+    workers = min(workers or os.cpu_count() or 1, max(len(found), 1))
+    # Forking while other threads run can leave their locks held in the child.
+    use_fork = (
+        workers > 1
+        and "fork" in multiprocessing.get_all_start_methods()
+        and threading.active_count() == 1
+    )
+    results: List[Dict[str, Any]] = []
+    previous_tolerance = get_active_simplification_tolerance()
+    _regions = found
+    try:
+        for tolerance in tolerances:
+            set_active_simplification_tolerance(tolerance)
+            _forget(found.values())
+            Territory.materialize_many(found.values())
+            if use_fork:
+                ctx = multiprocessing.get_context("fork")
+                with ctx.Pool(processes=workers, initializer=_init_worker) as pool:
+                    batch = pool.map(_warm_region, list(found), chunksize=1)
+            else:
+                batch = [_warm_region(name) for name in found]
+            for result in batch:
+                result["tolerance"] = tolerance
+            results.extend(batch)
+    finally:
+        _regions = {}
+        set_active_simplification_tolerance(previous_tolerance)
+    return results
+
+
+def _print_report(results: List[Dict[str, Any]], top: int) -> None:
+    total = sum(r["seconds"] for r in results)
+    failed = [r for r in results if r["error"]]
+    print(f"[xatra-warm-cache] {len(results) - len(failed)} regions cached, "
+          f"{len(failed)} failed, {total:.1f}s of region time")
+    slowest = sorted(results, key=lambda r: r["seconds"], reverse=True)[:top]
+    if slowest:
+        print(f"  {'seconds':>8}  {'vertices':>9}  {'tolerance':>9}  region")
+        for r in slowest:
+            tol = "-" if r["tolerance"] is None else f"{r['tolerance']:g}"
+            print(f"  {r['seconds']:8.2f}  {r['vertices']:9d}  {tol:>9}  {r['region']}")
+    for r in failed:
+        print(f"  ! {r['region']} (tolerance {r['tolerance']}): {r['error']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Prebake the xatra geometry cache for a territory library.",
+    )
+    parser.add_argument(
+        "--module",
+        default=DEFAULT_MODULE,
+        help=f"Module whose public Territory objects are warmed (default: {DEFAULT_MODULE})",
+    )
+    parser.add_argument(
+        "--tolerance",
+        action="append",
+        type=float,
+        dest="tolerances",
+        help="Simplification tolerance to warm (repeatable); 0 means unsimplified. Default: 0",
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        dest="regions",
+        help="Only warm this region (repeatable), e.g. --region NORTH_INDIA",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=25,
+        help="Number of slowest regions to list (default: 25)",
+    )
+    args = parser.parse_args()
+
+    if not CACHING_ENABLED:
+        parser.error("caching is disabled (CACHING environment variable); nothing would be stored")
+    tolerances = [t if t > 0 else None for t in (args.tolerances or [0.0])]
+    results = warm_cache(args.module, tolerances=tolerances, workers=args.workers, regions=args.regions)
+    _print_report(results, args.top)
+
+
+if __name__ == "__main__":
+    main()
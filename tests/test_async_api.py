@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+
+from shapely.geometry import box
+
+import xatra
+from xatra import loaders
+from xatra import territory as territory_module
+from xatra.geometry_cache import GeometryCache
+from xatra.territory import Territory
+
+
+def _slow_territory(calls):
+    def provider():
+        calls.append(1)
+        time.sleep(0.2)
+        return box(0, 0, 1, 1)
+    return Territory(_geometry_provider=provider, strrepr="slow-square")
+
+
+def test_ato_geometry_coalesces_and_keeps_loop_free(tmp_path, monkeypatch):
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    calls = []
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        tick_task = asyncio.create_task(ticker())
+        a, b = _slow_territory(calls), _slow_territory(calls)
+        geoms = await asyncio.gather(a.ato_geometry(), b.ato_geometry())
+        tick_task.cancel()
+        return geoms, ticks, (a, b)
+
+    (geom_a, geom_b), ticks, (a, b) = asyncio.run(main())
+    assert calls == [1]
+    assert geom_a is geom_b and geom_a.equals(box(0, 0, 1, 1))
+    assert a._memoized_ready and b._memoized_ready
+    assert ticks >= 5
+
+    async def cached():
+        return await cache.aget("slow-square"), await cache.aget("missing")
+
+    hit, miss = asyncio.run(cached())
+    assert hit.equals(box(0, 0, 1, 1)) and miss is None
+
+
+def test_ato_geometry_uses_callers_tolerance_without_changing_it(tmp_path, monkeypatch):
+    import threading
+
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    release = threading.Event()
+    seen = []
+
+    def blocking():
+        release.wait(5)
+        return box(0, 0, 1, 1)
+
+    def recording():
+        seen.append(loaders.get_active_simplification_tolerance())
+        return box(0, 0, 2, 2)
+
+    async def main():
+        # The caller changes its tolerance again before either evaluation ends.
+        first = asyncio.ensure_future(Territory(blocking, strrepr="blocking").ato_geometry())
+        loaders.set_active_simplification_tolerance(0.5)
+        second = asyncio.ensure_future(Territory(recording, strrepr="recording").ato_geometry())
+        await asyncio.sleep(0)
+        loaders.set_active_simplification_tolerance(None)
+        release.set()
+        return await first, await second
+
+    try:
+        _, geometry = asyncio.run(main())
+        assert seen == [0.5] and geometry.area == 4.0
+        assert loaders.get_active_simplification_tolerance() is None
+    finally:
+        loaders.set_active_simplification_tolerance(None)
+
+
+def test_aexport_json_and_aread_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: GeometryCache(tmp_path))
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps({"answer": 42}))
+    m = xatra.Map()
+    m.Flag("Square", xatra.polygon([[0, 0], [0, 1], [1, 1], [1, 0]]))
+
+    async def main():
+        return await asyncio.gather(m.aexport_json(), loaders.aread_json(str(path)), loaders.aread_json(str(path)))
+
+    try:
+        payload, first, second = asyncio.run(main())
+    finally:
+        loaders.clear_file_cache()
+    assert payload["flags"]["mode"] == "static"
+    assert first == {"answer": 42} and first is second
+
+
+def test_aexport_json_sees_changes_made_during_an_export(tmp_path, monkeypatch):
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+
+    def slow():
+        time.sleep(0.3)
+        return box(0, 0, 1, 1)
+
+    m = xatra.Map()
+    m.simplify(0.01)
+    m.Flag("Slow", Territory(slow, strrepr="slow-flag"))
+
+    async def main():
+        first = asyncio.ensure_future(m.aexport_json())
+        await asyncio.sleep(0.05)
+        m.Flag("Added", xatra.polygon([[0, 2], [0, 3], [1, 3], [1, 2]]))
+        return await first, await m.aexport_json()
+
+    before, after = asyncio.run(main())
+    assert "Added" in json.dumps(after["flags"]) and "Slow" in json.dumps(after["flags"])
+    # The map's tolerance applied to the export thread only.
+    assert loaders.get_active_simplification_tolerance() is None
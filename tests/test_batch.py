@@ -0,0 +1,92 @@
+import os
+
+import xatra
+
+
+def _square_map(x: float) -> xatra.Map:
+    m = xatra.Map()
+    m.Flag("Square", xatra.polygon([[0, x], [0, x + 1], [1, x + 1], [1, x]]))
+    return m
+
+
+def test_render_many_writes_maps_and_reports(tmp_path):
+    script = tmp_path / "scripted.py"
+    out_html = tmp_path / "scripted.html"
+    script.write_text(
+        "import xatra\n"
+        "xatra.Flag('S', xatra.polygon([[0, 0], [0, 1], [1, 1]]))\n"
+        f"xatra.show({str(tmp_path / 'scripted.json')!r}, {str(out_html)!r})\n"
+    )
+    broken = tmp_path / "broken.py"
+    broken.write_text("raise RuntimeError('boom')\n")
+
+    reports = xatra.render_many([_square_map(0), _square_map(5), str(script), str(broken)],
+                                workers=2, out_dir=str(tmp_path / "out"))
+
+    assert [r["name"] for r in reports] == ["map_000", "map_001", "scripted", "broken"]
+    for report in reports[:2]:
+        assert report["error"] is None
+        assert os.path.getsize(report["html"]) > 0 and os.path.getsize(report["json"]) > 0
+        assert report["seconds"] >= 0
+        # Only jobs run in a worker process of their own report a peak RSS.
+        assert (report["peak_rss_mb"] is None) == (report["pid"] == os.getpid())
+    assert reports[2]["error"] is None and out_html.exists()
+    assert "boom" in reports[3]["error"]
+
+
+def test_render_many_accepts_named_maps_serially(tmp_path):
+    from xatra import pyplot
+
+    script = tmp_path / "scripted.py"
+    script.write_text(
+        "import xatra\n"
+        "xatra.Flag('S', xatra.polygon([[0, 0], [0, 1], [1, 1]]))\n"
+        f"xatra.show({str(tmp_path / 'scripted.json')!r}, {str(tmp_path / 'scripted.html')!r})\n"
+    )
+    mine = pyplot.new_map()
+    try:
+        reports = xatra.render_many({"solo": _square_map(0), "script": str(script)}, workers=1, out_dir=str(tmp_path))
+        assert pyplot.get_current_map() is mine
+    finally:
+        pyplot.set_current_map(None)
+    assert reports[0]["html"] == str(tmp_path / "solo.html")
+    assert reports[0]["pid"] == os.getpid() and reports[0]["peak_rss_mb"] is None
+    assert reports[1]["error"] is None
+
+
+def test_render_many_renders_serially_while_threads_run(tmp_path, monkeypatch):
+    import threading
+
+    from xatra import batch
+
+    release = threading.Event()
+    thread = threading.Thread(target=release.wait)
+    thread.start()
+    monkeypatch.setattr(batch, "resource", None)
+    try:
+        reports = xatra.render_many([_square_map(0), _square_map(5)], workers=2, out_dir=str(tmp_path))
+    finally:
+        release.set()
+        thread.join()
+
+    assert [r["pid"] for r in reports] == [os.getpid()] * 2
+    assert all(r["error"] is None and r["peak_rss_mb"] is None for r in reports)
+
+
+def test_warm_loads_each_map_under_its_tolerance(monkeypatch):
+    from xatra import batch
+    from xatra.loaders import get_active_simplification_tolerance
+
+    seen = []
+    monkeypatch.setattr(
+        batch.Territory, "materialize_many",
+        staticmethod(lambda territories: seen.append((get_active_simplification_tolerance(), len(list(territories))))),
+    )
+    coarse = _square_map(5)
+    coarse.simplify(0.5)
+
+    ambient = get_active_simplification_tolerance()
+    batch._warm([("a", _square_map(0)), ("b", coarse), ("c", _square_map(9)), ("s", "script.py")])
+
+    assert sorted(seen, key=lambda s: s[0] or 0) == [(None, 2), (0.5, 1)]
+    assert get_active_simplification_tolerance() == ambient
@@ -0,0 +1,57 @@
+import json
+
+import xatra
+from xatra import loaders
+
+
+def _write(tmp_path, name, n_bytes):
+    path = tmp_path / name
+    path.write_text(json.dumps({"pad": "x" * n_bytes}))
+    return str(path)
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path):
+    cache = loaders._FileCache(max_bytes=None)
+    paths = [_write(tmp_path, f"f{i}.json", 1000) for i in range(3)]
+    for path in paths:
+        cache[path] = {"path": path}
+    per_file = cache.stats()["estimated_bytes"] // 3
+
+    _ = cache[paths[0]]  # touch: paths[1] becomes least recently used
+    cache.set_max_bytes(2 * per_file)
+
+    assert paths[1] not in cache
+    assert paths[0] in cache and paths[2] in cache
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["evicted_bytes"] == per_file
+
+
+def test_file_cache_keeps_newest_entry_over_budget(tmp_path):
+    cache = loaders._FileCache(max_bytes=10)
+    path = _write(tmp_path, "big.json", 1000)
+    cache[path] = {}
+    assert path in cache
+    assert cache.stats()["evictions"] == 0
+
+
+def test_read_json_respects_budget_and_clear_file_cache(tmp_path):
+    loaders.clear_file_cache()
+    paths = [_write(tmp_path, f"g{i}.json", 2000) for i in range(3)]
+    try:
+        loaders.set_file_cache_budget(1)
+        for path in paths:
+            assert loaders._read_json(path)["pad"]
+        assert paths[-1] in loaders._file_cache
+        assert paths[0] not in loaders._file_cache
+
+        stats = xatra.cache_stats()["file_cache"]
+        assert stats["evictions"] >= 2
+        assert stats["files"] == 1
+
+        loaders.clear_file_cache()
+        assert loaders.get_file_cache_stats()["files"] == 0
+        assert loaders.get_file_cache_stats()["estimated_bytes"] == 0
+    finally:
+        loaders.set_file_cache_budget(loaders.FILE_CACHE_MAX_MB * 1024 * 1024)
+        loaders.clear_file_cache()
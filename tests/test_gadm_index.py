@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from xatra import loaders
+
+
+def _square_feature(gid_0: str, gid_1: str, gid_2: str, x: float) -> dict:
+    return {
+        "type": "Feature",
+        "properties": {"GID_0": gid_0, "GID_1": gid_1, "GID_2": gid_2},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[x, 0.0], [x + 1.0, 0.0], [x + 1.0, 1.0], [x, 1.0], [x, 0.0]]],
+        },
+    }
+
+
+@pytest.fixture
+def gadm_dir(tmp_path, monkeypatch):
+    gids = ["IND.1.1_1", "IND.10.1_1", "IND.1.2_1", "IND.11.1_1", "IND.2.1_1", "IND.1.10_1"]
+    features = [
+        _square_feature("IND", gid.rsplit(".", 1)[0] + "_1", gid, float(i))
+        for i, gid in enumerate(gids)
+    ]
+    path = tmp_path / "gadm41_IND_2.json"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    monkeypatch.setattr(loaders, "GADM_DIR", str(tmp_path))
+    loaders.clear_file_cache()
+    yield tmp_path
+    loaders.clear_file_cache()
+
+
+def test_gid_index_prefix_lookup_respects_boundaries():
+    features = [{"properties": {"GID_1": gid}} for gid in ["IND.1_1", "IND.10_1", "IND.1", "IND.2_1"]]
+    index = loaders._GidIndex(features, "GID_1")
+
+    assert index.lookup("IND.1") == [0, 2]
+    assert index.lookup("IND.10") == [1]
+    assert index.lookup("IND.3") == []
+
+
+def test_load_gadm_like_uses_index_and_keeps_file_order(gadm_dir):
+    fc = loaders.load_gadm_like("IND.1.1")
+    assert [f["properties"]["GID_2"] for f in fc["features"]] == ["IND.1.1_1"]
+
+    fc = loaders.load_gadm_like("IND.1.10")
+    assert [f["properties"]["GID_2"] for f in fc["features"]] == ["IND.1.10_1"]
+
+    path = loaders._get_gadm_file_path("IND", 2)
+    selected = loaders._load_gadm_features(path, 2, "IND.1")
+    assert [f["properties"]["GID_2"] for f in selected] == ["IND.1.1_1", "IND.1.2_1", "IND.1.10_1"]
+
+
+def test_gid_index_is_built_once_per_file(gadm_dir):
+    loaders.load_gadm_like("IND.1.1")
+    path = loaders._get_gadm_file_path("IND", 2)
+    index = loaders._gid_index_cache[(path, "GID_2")][1]
+
+    loaders.load_gadm_like("IND.2.1")
+    assert loaders._gid_index_cache[(path, "GID_2")][1] is index
+
+    loaders.clear_file_cache()
+    assert not loaders._gid_index_cache
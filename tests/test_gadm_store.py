@@ -0,0 +1,174 @@
+import json
+
+import pytest
+from shapely.geometry import shape
+
+from xatra import loaders
+from xatra.gadm_store import build_store, get_store_path, open_store
+
+
+def _features():
+    square = [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]]]
+    holed = [
+        [[10.0, 0.0], [14.0, 0.0], [14.0, 4.0], [10.0, 4.0], [10.0, 0.0]],
+        [[11.0, 1.0], [12.0, 1.0], [12.0, 2.0], [11.0, 1.0]],
+    ]
+    far = [[[20.0, 0.0], [21.0, 0.0], [21.0, 1.0], [20.0, 0.0]]]
+    return [
+        {"type": "Feature", "properties": {"GID_0": "IND", "GID_1": "IND.1_1", "NAME_1": "A"},
+         "geometry": {"type": "Polygon", "coordinates": square}},
+        {"type": "Feature", "properties": {"GID_0": "IND", "GID_1": "IND.10_1", "NAME_1": "B"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [holed, far]}},
+        {"type": "Feature", "properties": {"GID_0": "IND", "GID_1": "IND.2_1", "NAME_1": "C"},
+         "geometry": None},
+    ]
+
+
+@pytest.fixture
+def gadm_json(tmp_path, monkeypatch):
+    path = tmp_path / "gadm41_IND_1.json"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": _features()}))
+    monkeypatch.setattr(loaders, "GADM_DIR", str(tmp_path))
+    loaders.clear_file_cache()
+    yield path
+    loaders.clear_file_cache()
+
+
+def test_store_round_trips_geometries_and_properties(gadm_json):
+    assert build_store(str(gadm_json)) == get_store_path(str(gadm_json))
+    store = open_store(str(gadm_json))
+
+    features = store.features()
+    for original, restored in zip(_features(), features):
+        assert restored["properties"] == original["properties"]
+        if original["geometry"] is None:
+            assert restored["geometry"] is None
+        else:
+            assert restored["geometry"]["type"] == original["geometry"]["type"]
+            assert shape(restored["geometry"]).equals(shape(original["geometry"]))
+
+    assert [f["properties"]["NAME_1"] for f in store.features([1])] == ["B"]
+
+
+def test_load_gadm_like_reads_from_store(gadm_json):
+    build_store(str(gadm_json))
+    loaders.clear_file_cache()
+
+    fc = loaders.load_gadm_like("IND.1")
+    assert [f["properties"]["NAME_1"] for f in fc["features"]] == ["A"]
+    # The GeoJSON file itself was never parsed.
+    assert str(gadm_json) not in loaders._file_cache
+
+
+def test_stale_store_is_ignored(gadm_json):
+    build_store(str(gadm_json))
+    gadm_json.write_text(json.dumps({"type": "FeatureCollection", "features": _features()[:1]}))
+
+    assert open_store(str(gadm_json)) is None
+    assert build_store(str(gadm_json)) is not None
+    assert len(open_store(str(gadm_json))) == 1
+
+
+def test_load_gadm_geometry_matches_geojson_path_and_caches_wkb(gadm_json):
+    from_json = loaders.load_gadm_geometry("IND.1")
+    build_store(str(gadm_json))
+    loaders.clear_file_cache()
+
+    from_store = loaders.load_gadm_geometry("IND.1")
+    assert from_store.equals(from_json)
+    assert str(gadm_json) not in loaders._file_cache
+
+    path = loaders._get_gadm_file_path("IND", 1)
+    assert isinstance(loaders._file_cache[f"gadm-wkb:{path}#IND.1"], bytes)
+    assert loaders.load_gadm_geometry("IND.1").equals(from_json)
+    assert loaders.load_gadm_geometry("IND.2") is None
+
+
+
+def test_materialize_many_loads_leaves_in_one_pass(gadm_json, tmp_path, monkeypatch):
+    from xatra import territory as territory_module
+    from xatra.geometry_cache import GeometryCache
+    from xatra.territory import Territory
+
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: GeometryCache(tmp_path / "cache"))
+    build_store(str(gadm_json))
+    expected = {gid: loaders.load_gadm_geometry(gid) for gid in ["IND.1", "IND.10"]}
+
+    loaded = loaders.load_gadm_geometries([("IND.1", None, None), ("IND.10", None, None), ("XXX", None, None)])
+    assert set(loaded) == {0, 1}
+    assert loaded[1].equals(expected["IND.10"])
+
+    loaders.clear_file_cache()
+    a, b, c = (Territory.from_gadm(gid) for gid in ["IND.1", "IND.10", "IND.2"])
+    combined = (a | b) - c
+    Territory.materialize_many([combined, None])
+    assert a._memoized_ready and b._memoized_ready and c._memoized_ready
+    assert a._memoized_geometry.equals(expected["IND.1"])
+    assert c._memoized_geometry is None
+    assert combined.to_geometry().equals(expected["IND.1"].union(expected["IND.10"]))
+
+
+def test_leaf_cache_keys_follow_source_file_versions(gadm_json, tmp_path, monkeypatch):
+    import os
+
+    from xatra.territory import Territory
+
+    other = tmp_path / "gadm41_PAK_1.json"
+    other.write_text(json.dumps({"type": "FeatureCollection", "features": []}))
+    expr = Territory.from_gadm("IND.1") | Territory.from_gadm("IND.10")
+    before = (Territory.from_gadm("IND.1").canonical_key(), expr.canonical_key())
+    assert before[0].startswith('gadm("IND.1")#')
+
+    stat = other.stat()
+    os.utime(other, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    loaders.clear_file_cache()
+    assert (Territory.from_gadm("IND.1").canonical_key(), expr.canonical_key()) == before
+
+    stat = gadm_json.stat()
+    os.utime(gadm_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    loaders.clear_file_cache()
+    after = Territory.from_gadm("IND.1") | Territory.from_gadm("IND.10")
+    assert Territory.from_gadm("IND.1").canonical_key() != before[0]
+    assert after.canonical_key() != before[1]
+
+
+def test_store_only_install_is_fingerprinted_by_its_store(gadm_json, tmp_path, monkeypatch):
+    import os
+
+    build_store(str(gadm_json))
+    gadm_json.unlink()
+    loaders.clear_file_cache()
+    # The key's own file is found through its store; no fallback is fingerprinted.
+    monkeypatch.setattr(loaders, "_compute_find_in_gadm_default", lambda key: ["PAK"])
+    before = loaders.gadm_source_fingerprint("IND.1")
+    assert before.startswith("store:") and ";" not in before
+    assert loaders.load_gadm_like("IND.1")["features"]
+
+    meta = os.path.join(get_store_path(str(gadm_json)), "meta.json")
+    stat = os.stat(meta)
+    os.utime(meta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    loaders.clear_file_cache()
+    assert loaders.gadm_source_fingerprint("IND.1") != before
+
+
+def test_disputed_and_missing_key_lookups_are_cached(gadm_json, tmp_path, monkeypatch):
+    feature = {"type": "Feature", "properties": {"GID_0": "Z01", "GID_1": "Z01.1_1"},
+               "geometry": {"type": "Polygon", "coordinates": [[[5, 5], [6, 5], [6, 6], [5, 5]]]}}
+    (tmp_path / "gadm41_PAK_1.json").write_text(json.dumps({"type": "FeatureCollection", "features": [feature]}))
+    mapping = tmp_path / "disputed_mapping.json"
+    mapping.write_text(json.dumps({"Z01": [{"level": 1, "file_country": "PAK"}, {"level": 0, "file_country": "IND"}]}))
+    monkeypatch.setattr(loaders, "DISPUTED_MAPPING_JSON", str(mapping))
+    loaders.clear_file_cache()
+
+    assert loaders._compute_find_in_gadm_default("Z01.1") == ["PAK"]
+    assert loaders.load_gadm_geometry("Z01.1").equals(shape(feature["geometry"]))
+    with pytest.raises(FileNotFoundError):
+        loaders.load_gadm_geometry("Z02.1")
+
+    def fail(path):
+        raise AssertionError(f"unexpected filesystem probe: {path}")
+
+    monkeypatch.setattr(loaders.os.path, "exists", fail)
+    assert loaders.load_gadm_geometry("Z01.1").equals(shape(feature["geometry"]))
+    with pytest.raises(FileNotFoundError, match="gadm41_Z02_1"):
+        loaders.load_gadm_geometry("Z02.1")
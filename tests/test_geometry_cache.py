@@ -0,0 +1,285 @@
+import os
+
+import pytest
+from shapely.geometry import box
+
+from xatra.geometry_cache import GeometryCache
+
+
+@pytest.mark.parametrize("backend", ["files", "segments"])
+def test_disk_backends_round_trip(tmp_path, backend):
+    cache = GeometryCache(tmp_path, backend=backend)
+    cache.put("a", box(0, 0, 1, 1))
+    cache.put("b", box(0, 0, 2, 2))
+
+    reopened = GeometryCache(tmp_path, backend=backend)
+    assert reopened.get("a").equals(box(0, 0, 1, 1))
+    assert reopened.get("missing") is None
+    stats = reopened.get_cache_stats()
+    assert stats["disk_backend"] == backend
+    assert stats["disk_cache_size"] == 2
+
+    reopened.clear_disk_cache()
+    assert reopened.get_cache_stats()["disk_cache_size"] == 0
+    assert GeometryCache(tmp_path, backend=backend).get("b") is None
+
+
+def test_segment_backend_tracks_dead_bytes_and_compacts(tmp_path):
+    cache = GeometryCache(tmp_path, backend="segments")
+    for i in range(5):
+        cache.put("key", box(0, 0, i + 1, 1))
+    cache.put("other", box(5, 5, 6, 6))
+    stats = cache.get_cache_stats()
+    assert stats["disk_cache_size"] == 2
+    assert stats["disk_dead_bytes"] > 0
+
+    cache.compact()
+    stats = cache.get_cache_stats()
+    assert stats["disk_dead_bytes"] == 0
+    assert len(list((tmp_path / "segments").glob("seg-*.bin"))) == 1
+
+    fresh = GeometryCache(tmp_path, backend="segments")
+    assert fresh.get("key").equals(box(0, 0, 5, 1))
+    assert fresh.get("other").equals(box(5, 5, 6, 6))
+
+
+def test_segment_backend_rejects_corrupt_records(tmp_path):
+    cache = GeometryCache(tmp_path, backend="segments")
+    cache.put("a", box(0, 0, 1, 1))
+    segment = next((tmp_path / "segments").glob("seg-*.bin"))
+    data = bytearray(segment.read_bytes())
+    data[-1] ^= 0xFF
+    segment.write_bytes(bytes(data))
+
+    assert GeometryCache(tmp_path, backend="segments").get("a") is None
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        GeometryCache(tmp_path, backend="nope")
+
+
+def test_memory_layer_evicts_least_recently_used_by_vertex_size(tmp_path):
+    cache = GeometryCache(tmp_path)
+    cache.set_memory_budget(2 * 5 * 16)  # two boxes of 5 vertices each
+    cache.put("a", box(0, 0, 1, 1))
+    cache.put("b", box(0, 0, 2, 2))
+    cache.get("a")
+    cache.put("c", box(0, 0, 3, 3))
+
+    stats = cache.get_cache_stats()
+    assert stats["memory_cache_size"] == 2
+    assert stats["memory_cache_bytes"] == 160
+    assert stats["memory_evictions"] == 1
+    assert cache._compute_hash("b") not in cache._memory_cache
+    # Evicted entries are still served from disk.
+    assert cache.get("b").equals(box(0, 0, 2, 2))
+
+
+@pytest.mark.parametrize("backend", ["files", "segments"])
+def test_disk_gc_by_age_and_size(tmp_path, backend, monkeypatch):
+    import xatra.geometry_cache as geometry_cache
+
+    clock = [1000.0]
+    monkeypatch.setattr(geometry_cache.time, "time", lambda: clock[0])
+    cache = GeometryCache(tmp_path, backend=backend)
+    for i in range(4):
+        clock[0] = 1000.0 + i * 100
+        cache.put(f"k{i}", box(0, 0, i + 1, 1))
+        if backend == "files":
+            path = tmp_path / f"{cache._compute_hash(f'k{i}')}.geom"
+            os.utime(path, (clock[0], clock[0]))
+
+    clock[0] = 1350.0
+    assert cache.gc_disk(max_bytes=0, max_age_seconds=200)["removed_entries"] == 2
+    entry_size = cache.get_cache_stats()["disk_cache_bytes"] // 2
+    assert cache.gc_disk(max_bytes=entry_size, max_age_seconds=0)["removed_entries"] == 1
+
+    stats = cache.get_cache_stats()
+    assert stats["disk_cache_size"] == 1
+    assert stats["disk_gc_removed_entries"] == 3
+    cache.clear_memory_cache()
+    assert cache.get("k2") is None
+    assert cache.get("k3").equals(box(0, 0, 4, 1))
+
+
+@pytest.mark.parametrize("backend", ["files", "segments"])
+def test_disk_entries_are_wkb_with_header(tmp_path, backend):
+    shape = box(0, 0, 3, 2).union(box(10, 10, 11, 11))
+    GeometryCache(tmp_path, backend=backend, compression="zlib").put("multi", shape)
+
+    reopened = GeometryCache(tmp_path, backend=backend)
+    info = reopened.get_entry_info("multi")
+    assert info["codec"] == "zlib"
+    assert info["vertex_count"] == 10
+    assert reopened.get_bounds("multi") == (0.0, 0.0, 11.0, 11.0)
+    assert reopened.get_bounds("missing") is None
+    assert reopened.get_cache_stats()["memory_cache_size"] == 0
+    assert reopened.get("multi").equals(shape)
+
+
+def test_legacy_pickle_entries_are_ignored(tmp_path):
+    import pickle
+
+    cache = GeometryCache(tmp_path)
+    cache.put("a", box(0, 0, 1, 1))
+    path = tmp_path / f"{cache._compute_hash('a')}.geom"
+    path.write_bytes(pickle.dumps(box(0, 0, 1, 1)))
+
+    assert GeometryCache(tmp_path).get("a") is None
+    assert not path.exists()
+
+
+def _compute_in_child(cache_dir, marker_dir, results):
+    import time as _time
+
+    cache = GeometryCache(cache_dir, shared=True)
+
+    def compute():
+        (marker_dir / f"computed-{os.getpid()}").touch()
+        _time.sleep(0.3)
+        return box(0, 0, 7, 7)
+
+    geometry = cache.get("shared-key") or cache.compute_and_put("shared-key", compute)
+    results.put(geometry.wkt)
+
+
+def test_shared_mode_computes_each_key_once_across_processes(tmp_path):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    marker_dir = tmp_path / "markers"
+    marker_dir.mkdir()
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_compute_in_child, args=(tmp_path / "cache", marker_dir, results)) for _ in range(3)]
+    for proc in procs:
+        proc.start()
+    wkts = [results.get(timeout=30) for _ in procs]
+    for proc in procs:
+        proc.join(timeout=30)
+
+    assert len(set(wkts)) == 1
+    assert len(list(marker_dir.iterdir())) == 1
+    stats = GeometryCache(tmp_path / "cache", shared=True).get_cache_stats()
+    assert stats["disk_backend"] == "segments"
+    assert stats["disk_cache_size"] == 1
+
+
+def test_concurrent_misses_on_one_key_compute_once(tmp_path, monkeypatch):
+    import threading
+    import time
+
+    from xatra import territory as territory_module
+    from xatra.territory import Territory
+
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    calls = []
+
+    def provider():
+        calls.append(1)
+        time.sleep(0.2)
+        return box(0, 0, 3, 3)
+
+    territories = [Territory(provider, strrepr="slow-leaf") for _ in range(6)]
+    threads = [threading.Thread(target=t.to_geometry) for t in territories]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(t._memoized_ready and t._memoized_geometry.equals(box(0, 0, 3, 3)) for t in territories)
+    assert cache.get_cache_stats()["coalesced_waits"] == 5
+
+
+def test_concurrent_waiters_see_the_computation_error(tmp_path):
+    import threading
+
+    cache = GeometryCache(tmp_path)
+    started = threading.Event()
+    release = threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    def run():
+        try:
+            cache.compute_and_put("bad", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=run)
+    follower.start()
+    while cache.get_cache_stats()["coalesced_waits"] == 0:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert errors == ["boom", "boom"]
+    assert cache.get("bad") is None
+
+
+def test_shared_mode_nested_expression_with_colliding_lock_stripes(tmp_path, monkeypatch):
+    import itertools
+    import threading
+
+    from xatra import territory as territory_module
+    from xatra.territory import Territory
+
+    cache = GeometryCache(tmp_path, shared=True)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+
+    def leaf(name, geometry):
+        return Territory(lambda: geometry, strrepr=name)
+
+    # Find a (A | B) - C whose key shares its first two hex digits (the old
+    # 256-way lock stripe) with the nested union it evaluates.
+    for i in itertools.count():
+        inner = leaf(f"west-{i}", box(0, 0, 2, 2)) | leaf(f"east-{i}", box(2, 0, 4, 2))
+        outer = inner - leaf(f"hole-{i}", box(1, 0, 3, 1))
+        if cache._compute_hash(outer._cache_strrepr())[:2] == cache._compute_hash(inner._cache_strrepr())[:2]:
+            break
+
+    result = []
+    worker = threading.Thread(target=lambda: result.append(outer.to_geometry()), daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+
+    assert not worker.is_alive(), "nested evaluation deadlocked in shared mode"
+    assert result[0].area == 6.0
+    assert cache.get(inner._cache_strrepr()).area == 8.0
+    assert not list((tmp_path / "locks").iterdir())
+
+
+def test_reentrant_computation_of_the_same_key_does_not_wait_on_itself(tmp_path, monkeypatch):
+    import threading
+
+    from xatra import territory as territory_module
+    from xatra.territory import Territory
+
+    # One cache instance for every call, so nested lookups share its in-flight state.
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    base = Territory(lambda: box(0, 0, 2, 2), strrepr="base")
+    doubled = Territory(lambda: box(1, 1, 3, 3), strrepr="doubled")
+    results = []
+
+    def run():
+        results.append((base | base).to_geometry())
+        results.append((doubled & doubled).to_geometry())
+        results.append(cache.compute_and_put("outer", lambda: cache.compute_and_put("outer", lambda: box(0, 0, 1, 1))))
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout=30)
+
+    assert not worker.is_alive(), "re-entrant compute_and_put deadlocked"
+    assert [g.area for g in results] == [4.0, 4.0, 1.0]
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+from shapely.geometry import shape
+
+from xatra import loaders
+
+
+def _river(ne_id, name, x):
+    return {"type": "Feature", "properties": {"ne_id": ne_id, "name": name},
+            "geometry": {"type": "LineString", "coordinates": [[x, 0.0], [x + 1.0, 1.0]]}}
+
+
+@pytest.fixture
+def rivers_file(tmp_path, monkeypatch):
+    path = tmp_path / "ne_10m_rivers.geojson"
+    features = [_river(1159, "Gaṅgā", 0.0), _river(1160, "Sindhu", 5.0), _river(1159, "duplicate", 9.0)]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}, ensure_ascii=False, indent=1),
+                    encoding="utf-8")
+    monkeypatch.setattr(loaders, "NE_RIVERS_FILE", str(path))
+    loaders.clear_file_cache()
+    yield path
+    loaders.clear_file_cache()
+
+
+def test_lookups_use_a_persisted_index(rivers_file, monkeypatch):
+    assert loaders.naturalearth("1159")["properties"]["name"] == "Gaṅgā"
+    assert loaders.naturalearth(1160)["properties"]["name"] == "Sindhu"
+    with pytest.raises(KeyError):
+        loaders.naturalearth("42")
+    assert (rivers_file.parent / (rivers_file.name + loaders.NE_INDEX_SUFFIX)).exists()
+
+    loaders.clear_file_cache()
+    monkeypatch.setattr(loaders, "_scan_ne_feature_offsets", lambda path: pytest.fail("index was rebuilt"))
+    found = loaders.naturalearth_features(["1160", 1159, "42"])
+    assert sorted(found) == ["1159", "1160"]
+    assert found["1159"]["properties"]["name"] == "Gaṅgā"
+
+
+def test_index_is_rebuilt_when_the_file_changes(rivers_file):
+    loaders.naturalearth("1159")
+    rivers_file.write_text(json.dumps({"features": [_river(7, "new", 1.0)], "type": "FeatureCollection"}))
+    loaders.clear_file_cache()
+    assert loaders.naturalearth("7")["properties"]["name"] == "new"
+    with pytest.raises(KeyError):
+        loaders.naturalearth("1159")
+
+
+def test_materialize_many_batches_naturalearth_leaves(rivers_file, tmp_path, monkeypatch):
+    from xatra import territory as territory_module
+    from xatra.geometry_cache import GeometryCache
+    from xatra.territory import Territory
+
+    cache = GeometryCache(tmp_path / "cache")
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    calls = []
+    monkeypatch.setattr(territory_module, "naturalearth_features",
+                        lambda ids: calls.append(list(ids)) or loaders.naturalearth_features(ids))
+
+    a, b = Territory.from_naturalearth("1159"), Territory.from_naturalearth("1160")
+    Territory.materialize_many([a | b])
+    assert len(calls) == 1 and sorted(calls[0]) == ["1159", "1160"]
+    assert a._memoized_ready and b._memoized_ready
+    assert b._memoized_geometry.equals(shape(_river(1160, "Sindhu", 5.0)["geometry"]))
@@ -0,0 +1,171 @@
+import random
+
+import shapely
+from shapely.geometry import box, mapping, shape
+
+from xatra.paxmax import delta_encode_snapshots, expand_snapshots, filter_by_period, paxmax_aggregate
+
+
+def _flags(seed):
+    rng = random.Random(seed)
+    flags = []
+    for i in range(30):
+        x = rng.randint(0, 6)
+        period = None if rng.random() < 0.1 else sorted(rng.sample(range(-20, 20), 2))
+        flags.append({
+            "label": rng.choice("ABCDEF"),
+            "geometry": mapping(box(x, 0, x + 1, 1)),
+            "period": period,
+            "note": f"n{i}" if rng.random() < 0.5 else None,
+        })
+    return flags
+
+
+def test_dynamic_snapshots_match_per_year_filtering():
+    for seed in range(20):
+        flags = _flags(seed)
+        result = paxmax_aggregate(flags, earliest_start=-25)
+        assert result["breakpoints"][0] == -25
+
+        for snapshot in expand_snapshots(result):
+            active = filter_by_period(flags, snapshot["year"])
+            labels = list(dict.fromkeys(f["label"] for f in flags))
+            expected = [label for label in labels if any(f["label"] == label for f in active)]
+            assert [f["label"] for f in snapshot["flags"]] == expected
+
+            for flag in snapshot["flags"]:
+                items = [f for f in active if f["label"] == flag["label"]]
+                geometry = shape(result["geometry_library"][flag["geom_id"]])
+                assert geometry.equals(shapely.union_all([shape(f["geometry"]) for f in items]))
+                assert flag["note"] == ("; ".join(f["note"] for f in items if f["note"]) or None)
+
+
+def test_earliest_start_after_first_breakpoint_is_kept_first():
+    flags = [
+        {"label": "A", "geometry": mapping(box(0, 0, 1, 1)), "period": [0, 10]},
+        {"label": "A", "geometry": mapping(box(1, 0, 2, 1)), "period": [5, 20]},
+    ]
+    result = paxmax_aggregate(flags, earliest_start=7)
+    assert result["breakpoints"] == [7, 0, 5, 10, 20]
+    areas = [sum(shape(result["geometry_library"][f["geom_id"]]).area for f in s["flags"]) for s in expand_snapshots(result)]
+    assert areas == [2.0, 1.0, 2.0, 1.0, 0]
+
+
+def test_union_tree_tracks_toggled_items():
+    from xatra.paxmax import _UnionTree
+
+    pieces = [box(i, 0, i + 1.5, 1) for i in range(11)]
+    fetched = []
+    tree = _UnionTree(len(pieces), lambda i: fetched.append(i) or pieces[i])
+    rng = random.Random(0)
+    active = set()
+    assert tree.total() is None
+    for _ in range(60):
+        i = rng.randrange(len(pieces))
+        active ^= {i}
+        tree.set_active(i, i in active)
+        expected = shapely.union_all([pieces[j] for j in active]) if active else None
+        tree.load_pieces()
+        loaded = len(fetched)
+        total = tree.total()
+        assert len(fetched) == loaded
+        assert (total is None) if expected is None else total.equals(expected)
+    # Each piece is fetched at most once.
+    assert len(fetched) == len(set(fetched))
+
+
+def test_territory_unions_do_not_nest_cache_computations(tmp_path, monkeypatch):
+    from xatra import paxmax
+    from xatra import territory as territory_module
+    from xatra.geometry_cache import GeometryCache
+    from xatra.territory import Territory
+
+    class DepthCache(GeometryCache):
+        depth = max_depth = 0
+
+        def compute_and_put(self, strrepr, compute):
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            try:
+                return super().compute_and_put(strrepr, compute)
+            finally:
+                self.depth -= 1
+
+    cache = DepthCache(tmp_path)
+    monkeypatch.setattr(paxmax, "get_global_cache", lambda: cache)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+
+    def leaf(i):
+        return Territory(lambda: box(i, 0, i + 1, 1), strrepr=f"piece-{i}")
+
+    flags = [{"label": "A", "territory": leaf(i), "period": [i, 10]} for i in range(3)]
+    result = paxmax_aggregate(flags)
+    last = expand_snapshots(result)[2]["flags"][0]
+    assert shape(result["geometry_library"][last["geom_id"]]).area == 3.0
+    assert cache.max_depth == 1
+
+
+def test_dynamic_snapshots_only_list_changes():
+    flags = [
+        {"label": "A", "geometry": mapping(box(0, 0, 1, 1)), "period": [0, 30], "color": "red"},
+        {"label": "A", "geometry": mapping(box(1, 0, 2, 1)), "period": [10, 20], "color": "red", "note": "x"},
+        {"label": "B", "geometry": mapping(box(5, 0, 6, 1)), "period": None, "color": "blue"},
+    ]
+    result = paxmax_aggregate(flags)
+    assert [f["label"] for f in result["flag_labels"]] == ["A", "B"]
+    assert result["flag_labels"][0]["color"] == "red"
+    # A's second state differs from its first only in geometry and note.
+    assert set(result["flag_states"][2]) == {"label_index", "geom_id", "centroid", "note"}
+    assert [{k: v for k, v in s.items() if k != "year"} for s in result["snapshots"]] == [
+        {"set": [0, 1]}, {"set": [2]}, {"set": [0]}, {"unset": [0]},
+    ]
+
+    expanded = expand_snapshots(result)
+    assert [[f["label"] for f in s["flags"]] for s in expanded] == [["A", "B"], ["A", "B"], ["A", "B"], ["B"]]
+    assert expanded[1]["flags"][0]["note"] == "x" and expanded[2]["flags"][0]["note"] is None
+    assert expand_snapshots(delta_encode_snapshots(expanded)) == expanded
+
+
+def test_identical_shapes_share_one_geometry_id():
+    from xatra.paxmax import geometry_id
+
+    shape_dict = mapping(box(0, 0, 1, 1))
+    flags = [
+        {"label": "A", "geometry": shape_dict, "period": [0, 10]},
+        {"label": "A", "geometry": mapping(box(3, 0, 4, 1)), "period": [10, 20]},
+        {"label": "A", "geometry": shape_dict, "period": [20, 30]},
+        {"label": "B", "geometry": shape_dict, "period": [0, 30]},
+    ]
+    result = paxmax_aggregate(flags)
+    ids = [s["flags"][0]["geom_id"] for s in expand_snapshots(result)[:3]]
+    assert ids[0] == ids[2] != ids[1]
+    assert expand_snapshots(result)[0]["flags"][1]["geom_id"] == ids[0]
+    assert len(result["geometry_library"]) == 2
+    assert ids[0] == geometry_id(result["geometry_library"][ids[0]])
+
+
+def test_threaded_aggregation_matches_serial(tmp_path, monkeypatch):
+    from xatra import geometry_cache
+    from xatra import territory as territory_module
+    from xatra.geometry_cache import GeometryCache
+    from xatra.territory import Territory
+
+    def run(workers):
+        cache = GeometryCache(tmp_path / f"cache{workers}")
+        monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+        monkeypatch.setattr(geometry_cache, "_global_cache", cache)
+        rng = random.Random(7)
+        flags = []
+        for i in range(40):
+            x, y = rng.randint(0, 8), rng.random()
+            flags.append({
+                "label": rng.choice("ABCDEFGH"),
+                "territory": Territory.from_polygon([[y, x], [y, x + 1.5], [y + 1, x + 1.5], [y + 1, x]]),
+                "period": sorted(rng.sample(range(0, 50), 2)),
+            })
+        return paxmax_aggregate(flags, workers=workers)
+
+    serial, threaded = run(0), run(4)
+    assert threaded["breakpoints"] == serial["breakpoints"]
+    assert expand_snapshots(threaded) == expand_snapshots(serial)
+    assert list(threaded["geometry_library"]) == list(serial["geometry_library"])
@@ -0,0 +1,140 @@
+from shapely.geometry import box
+
+from xatra import territory as territory_module
+from xatra.geometry_cache import GeometryCache
+from xatra.territory import Territory
+
+
+def _square(x: float, y: float = 0.0, size: float = 1.0) -> Territory:
+    return Territory.from_polygon([[y, x], [y, x + size], [y + size, x + size], [y + size, x]])
+
+
+def _count_unions(monkeypatch):
+    calls = []
+    real = territory_module.unary_union
+
+    def counting(geoms):
+        calls.append(len(geoms))
+        return real(geoms)
+
+    monkeypatch.setattr(territory_module, "unary_union", counting)
+    return calls
+
+
+def test_union_chain_is_flattened_and_deduplicated(tmp_path, monkeypatch):
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: GeometryCache(tmp_path))
+    calls = _count_unions(monkeypatch)
+    squares = [_square(float(i)) for i in range(10)]
+
+    chain = squares[0]
+    for sq in squares[1:] + [_square(0.0)]:
+        chain = chain | sq
+
+    assert chain.strrepr.count(" | ") == 10
+    assert chain.to_geometry().equals(box(0, 0, 10, 1))
+    assert calls == [10]
+
+
+def test_nested_differences_subtract_one_union(tmp_path, monkeypatch):
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: GeometryCache(tmp_path))
+    calls = _count_unions(monkeypatch)
+    base = _square(0.0, size=10.0)
+
+    result = ((base - _square(0.0)) - (_square(2.0) | _square(4.0))) - _square(0.0)
+    assert result.strrepr.startswith("(((polygon(")
+    expected = box(0, 0, 10, 10).difference(box(0, 0, 1, 1)).difference(box(2, 0, 3, 1)).difference(box(4, 0, 5, 1))
+    assert result.to_geometry().equals(expected)
+    assert calls == [3]
+
+    assert (base & base).to_geometry().equals(box(0, 0, 10, 10))
+    assert (base & _square(20.0)).to_geometry().is_empty
+
+
+def test_canonical_key_ignores_operand_order_and_grouping(tmp_path, monkeypatch):
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    a, b, c, d = (_square(float(i)) for i in range(4))
+
+    assert ((a | b) | c).canonical_key() == (c | (b | a)).canonical_key()
+    assert (a | b).canonical_key() == Territory.union_territories([b, a, b]).canonical_key()
+    assert (a & b).canonical_key() == (b & a).canonical_key()
+    assert ((d - a) - b).canonical_key() == (d - (b | a)).canonical_key()
+    assert (d - a).canonical_key() != (a - d).canonical_key()
+    assert (a | a).canonical_key() == a.canonical_key() == a.strrepr
+    assert (a & a).canonical_key() == ((a & a) & a).canonical_key() == a.canonical_key()
+
+    # Collapsed composites evaluate as their operand, with the cache shared by every call.
+    assert (a | a).to_geometry().equals(box(0, 0, 1, 1))
+    assert (b & b).to_geometry().equals(box(1, 0, 2, 1))
+    assert ((d & d) & d).to_geometry() is d.to_geometry()
+
+    (a | b | c).to_geometry()
+    calls = _count_unions(monkeypatch)
+    assert (c | (a | b)).to_geometry().equals(box(0, 0, 3, 1))
+    assert calls == []
+
+
+def test_disjoint_and_covering_operands_skip_overlay(tmp_path, monkeypatch):
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    big, small, far = _square(0.0, size=10.0), _square(2.0), _square(50.0)
+    geoms = {t.strrepr: t.to_geometry() for t in (big, small, far)}
+
+    def no_overlay(*args, **kwargs):
+        raise AssertionError("overlay should have been skipped")
+
+    monkeypatch.setattr(territory_module, "unary_union", no_overlay)
+    for geom in geoms.values():
+        monkeypatch.setattr(type(geom), "difference", no_overlay)
+        monkeypatch.setattr(type(geom), "intersection", no_overlay)
+
+    assert (big - far).to_geometry() is geoms[big.strrepr]
+    assert (small - big).to_geometry().is_empty
+    assert (big & far).to_geometry().is_empty
+    assert (big & small).to_geometry() is geoms[small.strrepr]
+    assert (small & _square(0.0, size=10.0)).to_geometry() is geoms[small.strrepr]
+
+
+def test_parallel_evaluation_matches_serial(tmp_path, monkeypatch):
+    def build():
+        shared = _square(0.0, size=2.0) | _square(2.0)
+        regions = [(shared | _square(float(i), 5.0)) - _square(float(i), 0.5, 0.25) for i in range(6)]
+        return shared, regions, Territory.union_territories(regions) - (_square(3.0, 1.5) | _square(0.0, 1.5))
+
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: GeometryCache(tmp_path / "serial"))
+    expected = build()[2].to_geometry()
+
+    cache = GeometryCache(tmp_path / "parallel")
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    monkeypatch.setattr(territory_module, "_territory_threads", 4)
+    calls = _count_unions(monkeypatch)
+    shared, regions, expr = build()
+
+    assert expr.to_geometry().equals(expected)
+    assert all(r._memoized_ready for r in regions)
+    # shared is flattened into each region's union; then the top union and the subtrahend union.
+    assert not shared._memoized_ready
+    assert len(calls) == len(regions) + 2
+
+
+def test_parallel_evaluation_of_duplicated_operands(tmp_path, monkeypatch):
+    cache = GeometryCache(tmp_path)
+    monkeypatch.setattr(territory_module, "get_global_cache", lambda: cache)
+    region = _square(0.0, size=4.0) - _square(0.0)
+    doubled = region | (_square(0.0, size=4.0) - _square(0.0))
+    expr = doubled - _square(3.0)
+
+    expr._evaluate_parallel(4)
+
+    assert expr._memoized_ready and doubled._memoized_ready
+    assert expr.to_geometry().equals(box(0, 0, 4, 4).difference(box(0, 0, 1, 1)).difference(box(3, 0, 4, 1)))
+
+
+def test_covers_does_not_prepare_shared_geometries():
+    import shapely
+
+    outer, inner = box(0, 0, 4, 4), box(1, 1, 2, 2)
+    assert territory_module._covers(outer, inner)
+    assert not territory_module._covers(outer, box(3, 3, 5, 5))
+    assert not shapely.is_prepared(outer)
+    assert shapely.is_prepared(territory_module._prepared[id(outer)][1])
@@ -0,0 +1,70 @@
+import textwrap
+
+import pytest
+
+from xatra import geometry_cache
+from xatra.geometry_cache import GeometryCache
+from xatra.loaders import get_active_simplification_tolerance, set_active_simplification_tolerance
+from xatra.warm_cache import find_territories, warm_cache
+
+
+@pytest.fixture(autouse=True)
+def _unsimplified():
+    # Cache keys below are computed under the ambient tolerance, which
+    # warm_cache() leaves as it found it.
+    previous = get_active_simplification_tolerance()
+    set_active_simplification_tolerance(None)
+    yield
+    set_active_simplification_tolerance(previous)
+
+
+def test_warm_cache_stores_every_public_region(tmp_path, monkeypatch):
+    (tmp_path / "my_regions.py").write_text(textwrap.dedent("""
+        from xatra.loaders import polygon
+
+        WEST = polygon([[0, 0], [0, 1], [1, 1], [1, 0]])
+        EAST = polygon([[0, 2], [0, 3], [1, 3], [1, 2]])
+        BOTH = WEST | EAST
+        _PRIVATE = WEST - EAST
+        NOT_A_REGION = 42
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache = GeometryCache(tmp_path / "cache")
+    monkeypatch.setattr(geometry_cache, "_global_cache", cache)
+
+    regions = find_territories("my_regions")
+    assert list(regions) == ["WEST", "EAST", "BOTH"]
+
+    results = warm_cache("my_regions", workers=2)
+    assert [r["region"] for r in results] == ["WEST", "EAST", "BOTH"]
+    assert all(r["error"] is None and r["seconds"] >= 0 for r in results)
+    assert results[2]["vertices"] == 10
+
+    # Results were written by the workers to the shared disk cache.
+    fresh = GeometryCache(tmp_path / "cache")
+    assert fresh.get(regions["BOTH"]._cache_strrepr()).area == 2.0
+
+
+def test_warm_cache_computes_nested_composites_and_keeps_tolerance(tmp_path, monkeypatch):
+    (tmp_path / "nested_regions.py").write_text(textwrap.dedent("""
+        from xatra.loaders import polygon
+
+        WEST = polygon([[0, 0], [0, 2], [2, 2], [2, 0]])
+        EAST = polygon([[0, 2], [0, 4], [2, 4], [2, 2]])
+        HOLE = polygon([[0, 1], [0, 3], [1, 3], [1, 1]])
+        CORE = (WEST | EAST) - HOLE
+        RIM = (WEST | EAST) - CORE
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    cache = GeometryCache(tmp_path / "cache")
+    monkeypatch.setattr(geometry_cache, "_global_cache", cache)
+    set_active_simplification_tolerance(0.5)
+    results = warm_cache("nested_regions", tolerances=(None,), workers=2, regions=["CORE", "RIM"])
+    assert get_active_simplification_tolerance() == 0.5
+    set_active_simplification_tolerance(None)
+
+    assert [r["error"] for r in results] == [None, None]
+    regions = find_territories("nested_regions")
+    fresh = GeometryCache(tmp_path / "cache")
+    assert fresh.get(regions["CORE"]._cache_strrepr()).area == 6.0
+    assert fresh.get(regions["RIM"]._cache_strrepr()).area == 2.0